@@ -295,8 +295,14 @@ def shot_duration(s):
     return b - a
 
 
-def validate_recipe(recipe: dict) -> list:
-    """레시피 검증 및 오류 목록 반환"""
+def validate_recipe(recipe: dict, warnings: list | None = None) -> list:
+    """레시피 검증 및 오류 목록 반환 (자산 존재/probe 결과는 자산 매니페스트에서 조회)
+
+    probe 실패는 렌더를 막지 않고 warnings에만 추가한다
+    (ffprobe가 없는 환경 등 자산 문제가 아닐 수 있고, 실제 디코드는 렌더에서 판단)
+    """
+    from services.asset_manifest import asset_info
+
     errs = []
     tl = recipe.get("timeline", [])
     assets = recipe.get("assets", {})
@@ -319,8 +325,15 @@ def validate_recipe(recipe: dict) -> list:
                     errs.append(f"shot#{i} layer#{j} missing ref")
                 elif ref not in assets:
                     errs.append(f"shot#{i} layer#{j} ref '{ref}' not in assets")
-                elif not Path(assets[ref]).exists():
-                    errs.append(f"shot#{i} layer#{j} asset file missing: {assets[ref]}")
+                else:
+                    info = asset_info(assets[ref])
+                    if info is None:
+                        errs.append(f"shot#{i} layer#{j} asset file missing: {assets[ref]}")
+                    elif "probe_error" in (info.get("media") or {}) and warnings is not None:
+                        warnings.append(
+                            f"shot#{i} layer#{j} asset probe failed: {assets[ref]} "
+                            f"({info['media']['probe_error']})"
+                        )
 
     return errs
 
@@ -1916,8 +1929,14 @@ def render_d2():
                     with open(checklist_path, "w", encoding="utf-8") as f:
                         jsonlib.dump(checklist, f, ensure_ascii=False, indent=2)
 
+                    # 자산 매니페스트 인덱싱 (D4 렌더/검증이 이 프로젝트 인덱스를 읽음)
+                    from services.asset_manifest import get_manifest
+
+                    get_manifest(assets_dir, refresh=True)
+
                     st.success(f"✅ 자산이 저장되었습니다: {assets_dir}")
                     st.session_state["assets_saved"] = True
+                    st.session_state["assets_dir"] = assets_dir
 
                 except Exception as e:
                     st.error(f"자산 저장 실패: {str(e)}")
@@ -2619,7 +2638,10 @@ def render_d4():
                 st.success("All assets found")
 
             # 레시피 검증 미리보기
-            errs = validate_recipe(normalized_recipe)
+            warns = []
+            errs = validate_recipe(normalized_recipe, warns)
+            for warn in warns:
+                st.warning(warn)
             if errs:
                 st.error("Recipe validation errors:")
                 for err in errs:
@@ -2675,31 +2697,39 @@ def render_d4():
 
     # 자산 및 타임라인 실시간 검증 패널
     def debug_assets_panel(assets: dict):
-        """자산 상태 디버그 패널"""
+        """자산 상태 디버그 패널 (자산 매니페스트의 크기/probe 메타데이터 표시)"""
+        from services.asset_manifest import asset_info
+
         if not assets:
             st.warning("자산이 설정되지 않았습니다.")
             return
 
         st.subheader("📋 자산 상태")
         rows = []
+        infos = {}
         for key, path in assets.items():
-            exists = path and _os.path.exists(str(path))
+            info = asset_info(path) if path else None
+            infos[key] = info
+            media = (info or {}).get("media") or {}
             file_size = ""
-            if exists:
-                try:
-                    size_bytes = _os.path.getsize(str(path))
-                    if size_bytes > 1024 * 1024:
-                        file_size = f"{size_bytes / (1024 * 1024):.1f}MB"
-                    else:
-                        file_size = f"{size_bytes / 1024:.1f}KB"
-                except:
-                    file_size = "크기 불명"
+            if info is not None:
+                size_bytes = info["size"]
+                if size_bytes > 1024 * 1024:
+                    file_size = f"{size_bytes / (1024 * 1024):.1f}MB"
+                else:
+                    file_size = f"{size_bytes / 1024:.1f}KB"
             rows.append(
                 {
                     "자산": key,
                     "경로": str(path)[:50] + "..." if len(str(path)) > 50 else str(path),
-                    "존재": "✅" if exists else "❌",
+                    "존재": "✅" if info is not None else "❌",
                     "크기": file_size,
+                    "해상도": f"{media['width']}x{media['height']}" if "width" in media else "",
+                    "길이": f"{media['duration']:.1f}s" if media.get("duration") else "",
+                    "FPS": f"{media['fps']:g}" if media.get("fps") else "",
+                    "코덱": media.get("codec") or "",
+                    "알파": "✅" if media.get("has_alpha") else "",
+                    "오류": media.get("probe_error", ""),
                 }
             )
 
@@ -2712,17 +2742,17 @@ def render_d4():
             if i >= 4:  # 최대 4개만 표시
                 break
             with cols[i]:
-                if path and _os.path.exists(str(path)):
-                    file_ext = Path(path).suffix.lower()
-                    if file_ext in [".jpg", ".jpeg", ".png", ".webp"]:
+                info = infos[key]
+                if info is not None:
+                    if info["kind"] == "image":
                         try:
                             st.image(str(path), caption=key, width=140)
                         except Exception:
                             st.caption(f"{key}: 이미지 로드 실패")
-                    elif file_ext in [".mp4", ".mov", ".avi"]:
+                    elif info["kind"] == "video":
                         st.caption(f"{key}: 비디오 파일")
                     else:
-                        st.caption(f"{key}: {file_ext} 파일")
+                        st.caption(f"{key}: {Path(path).suffix.lower()} 파일")
                 else:
                     st.caption(f"{key}: 파일 없음")
 
@@ -2894,10 +2924,52 @@ def render_d4():
                 st.error("레시피를 찾을 수 없습니다.")
 
     with col_debug2:
-        st.caption("빠른 진단으로 첫 샷의 상태를 확인")
+        if st.button("🎞️ 타임라인 필름스트립", use_container_width=True):
+            recipe = find_latest_recipe()
+            if recipe is None:
+                recipe = build_recipe_from_session()
+                if recipe:
+                    save_recipe(recipe)
+
+            asset_map = resolve_assets(st.session_state.get("assets"))
+            if not recipe:
+                st.error("레시피를 찾을 수 없습니다.")
+            elif not asset_map:
+                st.error("자산을 먼저 설정해주세요.")
+            else:
+                # 인코딩 없이 전체 타임라인을 한 번에 평가 (소스는 썸네일 크기로 디코드)
+                with st.spinner("필름스트립 생성 중..."):
+                    from services.frame_eval import timeline_filmstrip
+
+                    try:
+                        strip = timeline_filmstrip(recipe, asset_map, safe_mode=safe_mode)
+                    except Exception as e:
+                        st.error(f"필름스트립 생성 실패: {e}")
+                        strip = None
+
+                if strip:
+                    st.image(
+                        strip["thumbnails"],
+                        caption=[
+                            f"{t:.1f}s · 샷{i}" for t, i in zip(strip["times"], strip["shots"], strict=True)
+                        ],
+                        width=110,
+                    )
+        st.caption("인코딩 없이 첫 샷/전체 타임라인 프레임을 바로 확인")
+
+    # 렌더링 시작: 드래프트(저해상도·저fps·ultrafast, 타이밍 확인용) / 최종 렌더
+    col_draft, col_final = st.columns(2)
+    with col_draft:
+        draft_clicked = st.button(
+            "⚡ 드래프트 미리보기",
+            use_container_width=True,
+            help="같은 레시피를 낮은 해상도/fps로 빠르게 렌더 (디버그 오버레이 없음)",
+        )
+    with col_final:
+        final_clicked = st.button("🚀 최종 렌더", type="primary", use_container_width=True)
+    render_quality = "draft" if draft_clicked else "final"
 
-    # 렌더링 시작
-    if st.button("🚀 렌더링 시작", type="primary", use_container_width=True):
+    if draft_clicked or final_clicked:
         from utils.diagnostics import heartbeat
         
         heartbeat("render_start")
@@ -2990,7 +3062,10 @@ def render_d4():
         )
 
         # 레시피 검증
-        errs = validate_recipe(recipe)
+        warns = []
+        errs = validate_recipe(recipe, warns)
+        if warns:
+            st.warning("레시피 경고:\n- " + "\n- ".join(warns))
         if errs:
             st.error("레시피 오류:\n- " + "\n- ".join(errs))
             st.stop()
@@ -3004,17 +3079,16 @@ def render_d4():
             output_dir.mkdir(parents=True, exist_ok=True)
             import time
 
-            output_path = output_dir / f"out_{int(time.time())}.mp4"
+            prefix = "draft" if render_quality == "draft" else "out"
+            output_path = output_dir / f"{prefix}_{int(time.time())}.mp4"
             LOG.debug("[D4] writing preview -> %s", output_path)
 
             LOG.info(f"[D4] render start → {output_path}")
 
-            # 자산 디렉토리 찾기
-            assets_dir = None
-            for item in Path("assets").glob("project_*"):
-                if item.is_dir():
-                    assets_dir = str(item)
-                    break
+            # 자산 디렉토리 (D2에서 저장한 프로젝트, 없으면 매니페스트가 가장 최근인 프로젝트)
+            from services.asset_manifest import latest_project_dir
+
+            assets_dir = s.get("assets_dir") or latest_project_dir()
 
             if not assets_dir:
                 st.error("자산 디렉토리를 찾을 수 없습니다. D2에서 자산을 저장해주세요.")
@@ -3034,9 +3108,14 @@ def render_d4():
                 status_text.text(f"{message} ({percent}%)")
 
             # 렌더링 실행
-            with st.spinner("렌더링 중..."):
+            with st.spinner("드래프트 렌더링 중..." if render_quality == "draft" else "렌더링 중..."):
                 used_assets = render_video(
-                    str(recipe_path), assets_dir, str(output_path), progress_callback, safe_mode
+                    str(recipe_path),
+                    assets_dir,
+                    str(output_path),
+                    progress_callback,
+                    safe_mode,
+                    quality=render_quality,
                 )
 
             LOG.info(
@@ -3144,11 +3223,12 @@ def render_d4():
         recipe_path = None
         srt_path = None
 
-        for item in Path("assets").glob("project_*"):
-            if item.is_dir():
-                recipe_path = item / "recipe.json"
-                srt_path = Path(rendered_video).parent / "subtitle.srt"
-                break
+        from services.asset_manifest import latest_project_dir
+
+        project_dir = st.session_state.get("assets_dir") or latest_project_dir()
+        if project_dir:
+            recipe_path = Path(project_dir) / "recipe.json"
+            srt_path = Path(rendered_video).parent / "subtitle.srt"
 
         if recipe_path and recipe_path.exists():
             # 비디오 미리보기 (파일 경로 사용)
@@ -0,0 +1,461 @@
+"""
+S4-7. 프로젝트 자산 매니페스트
+자산 디렉토리(images/videos/texts)의 파일별 경로/크기/수정시각/내용 해시와 probe 메타데이터
+(길이, 해상도, fps, 코덱, 알파 여부)를 <자산 디렉토리>/asset_manifest.json에 저장한다.
+크기/수정시각이 바뀐 파일만 다시 해시/probe하고, 렌더 엔진/레시피 검증/D4 디버그 패널이
+같은 인덱스를 읽는다. 매니페스트는 렌더 엔진의 refresh만 쓰고,
+레시피 검증/UI 조회는 읽기 전용 (해시/저장 없음)
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+from fractions import Fraction
+from pathlib import Path
+from typing import Any
+
+from services.segment_cache import ffmpeg_binary
+
+MANIFEST_FILENAME = "asset_manifest.json"
+# 2: ffprobe가 없는 환경에서 저장된 probe_error 항목을 버리고 다시 probe
+MANIFEST_VERSION = 2
+
+# 프로젝트 자산 디렉토리 위치 (save_assets_structure가 <ASSETS_ROOT>/project_<시각>으로 생성)
+ASSETS_ROOT = Path("assets")
+PROJECT_PREFIX = "project_"
+
+# 하위 디렉토리별 인덱싱 대상 확장자 (load_assets_from_directory와 동일)
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+VIDEO_EXTS = (".mp4", ".mov", ".avi")
+TEXT_EXTS = (".txt",)
+SCAN_DIRS = {"images": IMAGE_EXTS, "videos": VIDEO_EXTS, "texts": TEXT_EXTS}
+
+# 알파 채널이 있는 픽셀 포맷 접두/부분 문자열 (yuva420p, rgba, gbrap 등)
+ALPHA_PIX_FMTS = ("yuva", "rgba", "argb", "bgra", "abgr", "gbrap", "ya8", "ya16")
+
+_HASH_CHUNK = 1 << 20
+
+# ffmpeg -i 출력(stderr) 파싱용 (ffprobe가 없을 때)
+_FFMPEG_DURATION_RE = re.compile(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)")
+_FFMPEG_VIDEO_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+)[^,]*, (\w+)")
+_FFMPEG_SIZE_RE = re.compile(r", (\d+)x(\d+)")
+_FFMPEG_FPS_RE = re.compile(r", ([\d.]+) (?:fps|tbr)")
+_FFMPEG_ROTATE_RE = re.compile(r"^\s*rotate\s*:\s*(-?\d+)", re.MULTILINE)
+_FFMPEG_DISPLAYMATRIX_RE = re.compile(r"displaymatrix: rotation of (-?[\d.]+) degrees")
+
+
+class ProbeUnavailableError(RuntimeError):
+    """probe 도구(ffprobe/ffmpeg)를 실행할 수 없음 (자산이 아니라 실행 환경 문제)"""
+
+
+def asset_kind(path: str | Path) -> str | None:
+    """확장자로 자산 종류 판별 (image/video/text)"""
+    ext = Path(path).suffix.lower()
+    if ext in IMAGE_EXTS or ext == ".webp":
+        return "image"
+    if ext in VIDEO_EXTS:
+        return "video"
+    if ext in TEXT_EXTS:
+        return "text"
+    return None
+
+
+def content_hash(path: str | Path) -> str:
+    """파일 내용 sha1 (1MB 단위로 읽음)"""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def ffprobe_binary() -> str | None:
+    """moviepy ffmpeg 바이너리와 같은 위치의 ffprobe, 없으면 PATH의 ffprobe (둘 다 없으면 None)
+
+    imageio-ffmpeg는 ffmpeg만 설치하므로 ffprobe가 없는 환경이 기본이다
+    """
+    ffmpeg = Path(ffmpeg_binary())
+    if ffmpeg.parent != Path("."):
+        candidate = ffmpeg.with_name(ffmpeg.name.replace("ffmpeg", "ffprobe"))
+        if candidate.exists():
+            return str(candidate)
+    return shutil.which("ffprobe")
+
+
+def _run_probe(cmd: list[str]) -> subprocess.CompletedProcess:
+    """probe 명령 실행 (바이너리를 실행할 수 없으면 ProbeUnavailableError)"""
+    try:
+        return subprocess.run(
+            cmd, capture_output=True, text=True, encoding="utf-8", errors="ignore"
+        )
+    except OSError as e:
+        raise ProbeUnavailableError(f"{Path(cmd[0]).name}: {e}") from e
+
+
+def probe_video(path: str | Path) -> dict[str, Any]:
+    """영상 메타데이터 수집 (해상도는 회전 적용 후 화면 기준)
+
+    ffprobe가 없으면 ffmpeg -i 출력을 파싱한다 (probe_video_ffmpeg)
+    """
+    ffprobe = ffprobe_binary()
+    if ffprobe is None:
+        return probe_video_ffmpeg(path)
+    cmd = [
+        ffprobe,
+        "-v",
+        "error",
+        "-select_streams",
+        "v:0",
+        "-show_entries",
+        "stream=width,height,avg_frame_rate,r_frame_rate,codec_name,pix_fmt:stream_tags=rotate"
+        ":stream_side_data=rotation",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "json",
+        str(path),
+    ]
+    p = _run_probe(cmd)
+    if p.returncode != 0:
+        return {"probe_error": p.stderr.strip()[:300] or f"ffprobe rc={p.returncode}"}
+    info = json.loads(p.stdout or "{}")
+    streams = info.get("streams") or []
+    if not streams:
+        return {"probe_error": "no video stream"}
+    st = streams[0]
+
+    rotation = int(float((st.get("tags") or {}).get("rotate", 0) or 0))
+    for side in st.get("side_data_list") or []:
+        if "rotation" in side:
+            # side data는 반시계 방향 각도 (rotate 태그와 부호 반대)
+            rotation = -int(float(side["rotation"]))
+    rotation %= 360
+
+    fps = 0.0
+    for key in ("avg_frame_rate", "r_frame_rate"):
+        try:
+            fps = float(Fraction(st.get(key) or "0/1"))
+        except (ValueError, ZeroDivisionError):
+            fps = 0.0
+        if fps:
+            break
+
+    return _video_media(
+        duration=float((info.get("format") or {}).get("duration") or 0.0),
+        coded_size=(int(st.get("width") or 0), int(st.get("height") or 0)),
+        fps=fps,
+        codec=st.get("codec_name"),
+        pix_fmt=st.get("pix_fmt") or "",
+        rotation=rotation,
+    )
+
+
+def probe_video_ffmpeg(path: str | Path) -> dict[str, Any]:
+    """ffmpeg -i 출력(stderr)으로 영상 메타데이터 수집 (probe_video와 같은 형식)"""
+    p = _run_probe([ffmpeg_binary(), "-hide_banner", "-i", str(path)])
+    # 출력 파일이 없어서 rc는 항상 1이므로 스트림 정보 유무로 판단
+    err = p.stderr
+    video = _FFMPEG_VIDEO_RE.search(err)
+    if video is None:
+        lines = [line for line in err.strip().splitlines() if line.strip()]
+        return {"probe_error": (lines[-1] if lines else "no video stream")[:300]}
+    # 스트림 줄과 그 아래 메타데이터(회전)만 본다
+    stream = err[video.start() :]
+    next_stream = stream.find("Stream #", 1)
+    if next_stream > 0:
+        stream = stream[:next_stream]
+    line = stream.splitlines()[0]
+
+    duration = 0.0
+    m = _FFMPEG_DURATION_RE.search(err)
+    if m:
+        hh, mm, ss = m.groups()
+        duration = int(hh) * 3600 + int(mm) * 60 + float(ss)
+    size = _FFMPEG_SIZE_RE.search(line)
+    fps = _FFMPEG_FPS_RE.search(line)
+
+    rotation = 0
+    m = _FFMPEG_ROTATE_RE.search(stream)
+    if m:
+        rotation = int(m.group(1))
+    m = _FFMPEG_DISPLAYMATRIX_RE.search(stream)
+    if m:
+        # displaymatrix는 반시계 방향 각도 (rotate 태그와 부호 반대)
+        rotation = -int(float(m.group(1)))
+
+    return _video_media(
+        duration=duration,
+        coded_size=(int(size.group(1)), int(size.group(2))) if size else (0, 0),
+        fps=float(fps.group(1)) if fps else 0.0,
+        codec=video.group(1),
+        pix_fmt=video.group(2),
+        rotation=rotation % 360,
+    )
+
+
+def _video_media(
+    duration: float,
+    coded_size: tuple[int, int],
+    fps: float,
+    codec: str | None,
+    pix_fmt: str,
+    rotation: int,
+) -> dict[str, Any]:
+    """영상 probe 결과 항목 (회전이 90/270이면 화면 기준으로 가로/세로를 바꾼다)"""
+    w, h = coded_size
+    if rotation in (90, 270):
+        w, h = h, w
+    return {
+        "duration": duration,
+        "width": w,
+        "height": h,
+        "fps": round(fps, 3),
+        "codec": codec,
+        "pix_fmt": pix_fmt,
+        "has_alpha": any(tag in pix_fmt for tag in ALPHA_PIX_FMTS),
+        "rotation": rotation,
+    }
+
+
+def probe_image(path: str | Path) -> dict[str, Any]:
+    """PIL로 이미지 메타데이터 수집 (픽셀 디코드 없이 헤더만)"""
+    from PIL import Image
+
+    with Image.open(path) as im:
+        return {
+            "width": im.width,
+            "height": im.height,
+            "codec": (im.format or "").lower(),
+            "mode": im.mode,
+            "has_alpha": "A" in im.getbands() or "transparency" in im.info,
+        }
+
+
+def build_entry(path: Path, st: os.stat_result, hash_content: bool = True) -> dict[str, Any]:
+    """파일 1개의 매니페스트 항목 생성 (해시 + probe, hash_content=False면 probe만)"""
+    kind = asset_kind(path)
+    entry: dict[str, Any] = {
+        "path": str(path.resolve()),
+        "kind": kind,
+        "size": st.st_size,
+        "mtime": st.st_mtime_ns,
+    }
+    if hash_content:
+        entry["sha1"] = content_hash(path)
+    try:
+        if kind == "video":
+            entry["media"] = probe_video(path)
+        elif kind == "image":
+            entry["media"] = probe_image(path)
+        elif kind == "text":
+            entry["text"] = path.read_text(encoding="utf-8").strip()
+    except ProbeUnavailableError as e:
+        # 실행 환경 문제라 자산 정보로 저장하지 않는다 (AssetManifest._index 참고)
+        entry["media"] = {"probe_error": str(e)[:300], "probe_unavailable": True}
+    except Exception as e:
+        entry["media"] = {"probe_error": str(e)[:300]}
+    return entry
+
+
+def probe_unavailable(entry: dict[str, Any]) -> bool:
+    """probe 도구를 실행하지 못한 항목인지 (자산 자체는 멀쩡할 수 있음)"""
+    return bool((entry.get("media") or {}).get("probe_unavailable"))
+
+
+class AssetManifest:
+    """자산 디렉토리 1개의 인덱스 (상대경로 → 항목). refresh()는 바뀐 파일만 다시 처리"""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root).resolve()
+        self.path = self.root / MANIFEST_FILENAME
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """임시 파일에 쓰고 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{MANIFEST_FILENAME}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": MANIFEST_VERSION, "entries": self.entries},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(tmp, self.path)
+
+    def _rel(self, path: str | Path) -> str | None:
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+
+    def _index(self, rel: str, path: Path, st: os.stat_result) -> tuple[dict[str, Any], bool]:
+        """stat이 같으면 기존 항목 재사용, 다르면 새로 해시/probe. (항목, 변경 여부) 반환
+
+        probe 도구를 실행하지 못한 항목은 저장하지 않는다 (다음 조회 때 다시 probe)
+        """
+        old = self.entries.get(rel)
+        if old and old.get("size") == st.st_size and old.get("mtime") == st.st_mtime_ns:
+            return old, False
+        entry = build_entry(path, st)
+        if probe_unavailable(entry):
+            return entry, self.entries.pop(rel, None) is not None
+        self.entries[rel] = entry
+        return entry, True
+
+    def refresh(self) -> bool:
+        """images/videos/texts에서 바뀐 파일만 다시 인덱싱, 사라진 파일은 제거 (변경 여부 반환)"""
+        changed = False
+        seen = set()
+        with self._lock:
+            for sub, exts in SCAN_DIRS.items():
+                for path in sorted((self.root / sub).glob("*")):
+                    if path.suffix.lower() not in exts or not path.is_file():
+                        continue
+                    rel = path.relative_to(self.root).as_posix()
+                    seen.add(rel)
+                    _, updated = self._index(rel, path, path.stat())
+                    changed |= updated
+            for rel in list(self.entries):
+                if rel.split("/", 1)[0] in SCAN_DIRS and rel not in seen:
+                    del self.entries[rel]
+                    changed = True
+            if changed or not self.path.exists():
+                self.save()
+        return changed
+
+    def entry(self, path: str | Path, index_missing: bool = True) -> dict[str, Any] | None:
+        """파일 경로의 항목 (stat이 바뀌었으면 갱신). 파일이 없거나 루트 밖이면 None
+
+        index_missing=False면 인덱스에 없는 파일도 None (읽기 전용 조회, 워커 프로세스용)
+        """
+        rel = self._rel(path)
+        if rel is None:
+            return None
+        p = self.root / rel
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        old = self.entries.get(rel)
+        if not index_missing:
+            if old and old.get("size") == st.st_size and old.get("mtime") == st.st_mtime_ns:
+                return old
+            return None
+        with self._lock:
+            entry, updated = self._index(rel, p, st)
+            if updated:
+                self.save()
+        return entry
+
+    def asset_map(self) -> dict[str, str]:
+        """자산 키(파일명 stem) → 경로(텍스트는 내용). load_assets_from_directory와 같은 우선순위"""
+        assets: dict[str, str] = {}
+        for sub in SCAN_DIRS:
+            for rel, entry in sorted(self.entries.items()):
+                if rel.split("/", 1)[0] != sub:
+                    continue
+                key = Path(rel).stem
+                assets[key] = entry.get("text", "") if entry["kind"] == "text" else entry["path"]
+        return assets
+
+
+# 프로세스 전역 매니페스트 (루트 경로별 1개)
+_MANIFESTS: dict[str, AssetManifest] = {}
+_MANIFESTS_LOCK = threading.Lock()
+
+
+def get_manifest(root: str | Path, refresh: bool = False) -> AssetManifest:
+    """루트별 매니페스트 (프로세스 안에서 한 번만 로드). refresh=True면 증분 갱신"""
+    key = str(Path(root).resolve())
+    with _MANIFESTS_LOCK:
+        manifest = _MANIFESTS.get(key)
+        if manifest is None:
+            manifest = _MANIFESTS[key] = AssetManifest(key)
+    if refresh:
+        manifest.refresh()
+    return manifest
+
+
+def project_dirs(assets_root: str | Path = ASSETS_ROOT) -> list[Path]:
+    """매니페스트가 있는 프로젝트 자산 디렉토리 목록 (최근에 인덱싱된 순)"""
+    manifests = Path(assets_root).glob(f"{PROJECT_PREFIX}*/{MANIFEST_FILENAME}")
+    return [m.parent for m in sorted(manifests, key=lambda m: m.stat().st_mtime, reverse=True)]
+
+
+def latest_project_dir(assets_root: str | Path = ASSETS_ROOT) -> Path | None:
+    """가장 최근에 인덱싱된 프로젝트 자산 디렉토리 (없으면 None)"""
+    dirs = project_dirs(assets_root)
+    return dirs[0] if dirs else None
+
+
+def manifest_root_for(path: str | Path) -> Path | None:
+    """파일이 속한 프로젝트 매니페스트 루트 (images/videos/texts 하위 파일만, 그 외에는 None)"""
+    parent = Path(path).resolve().parent
+    return parent.parent if parent.name in SCAN_DIRS else None
+
+
+def indexed_manifest(path: str | Path) -> AssetManifest | None:
+    """파일이 속한 프로젝트의 기존 매니페스트 (인덱싱된 적 없는 루트면 만들지 않고 None)"""
+    root = manifest_root_for(path)
+    if root is None or (str(root) not in _MANIFESTS and not (root / MANIFEST_FILENAME).exists()):
+        return None
+    return get_manifest(root)
+
+
+def asset_info(path: str | Path | None) -> dict[str, Any] | None:
+    """자산 파일 정보 (읽기 전용 조회, 파일이 없으면 None)
+
+    프로젝트 매니페스트에 최신 항목이 있으면 그 항목, 없으면 해시 없이 probe만 한 항목
+    (매니페스트는 쓰지 않는다)
+    """
+    if not path:
+        return None
+    p = Path(path)
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    if not p.is_file():
+        return None
+    manifest = indexed_manifest(p)
+    entry = manifest.entry(p, index_missing=False) if manifest else None
+    return entry or build_entry(p, st, hash_content=False)
+
+
+def reader_infos(path: str | Path) -> dict[str, Any] | None:
+    """매니페스트의 probe 결과를 moviepy ffmpeg_parse_infos 형식으로 (인덱싱 전/변경 후면 None)
+
+    video_size는 moviepy와 같이 회전 전(코딩된) 크기
+    """
+    manifest = indexed_manifest(path)
+    entry = manifest.entry(path, index_missing=False) if manifest else None
+    media = (entry or {}).get("media") or {}
+    if entry is None or entry.get("kind") != "video" or "probe_error" in media:
+        return None
+    w, h = media["width"], media["height"]
+    rotation = media.get("rotation", 0)
+    if rotation in (90, 270):
+        w, h = h, w
+    return {
+        "duration": media["duration"],
+        "video_duration": media["duration"],
+        "video_size": [w, h],
+        "video_fps": media["fps"],
+        "video_rotation": rotation,
+    }
@@ -0,0 +1,136 @@
+"""
+S4-10. uint8 premultiplied-alpha 합성기
+RGBA 오버레이를 불투명 영역 bbox로 잘라 premultiplied RGB + 역알파(255 - a, uint8)로 보관하고,
+프레임마다 미리 할당한 출력/작업 버퍼에
+정수 연산(out = premul + round(base * (255 - a) / 255))으로 블렌딩한다.
+moviepy CompositeVideoClip + float32 전체 프레임 마스크 합성 대체 (프레임당 배열 할당 없음)
+"""
+
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+
+def premultiply(rgba: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """RGBA uint8 → (premultiplied RGB uint8, 역알파 (h, w, 1) uint8)"""
+    alpha = rgba[:, :, 3:4].astype(np.uint16)
+    premul = ((rgba[:, :, :3].astype(np.uint16) * alpha + 127) // 255).astype(np.uint8)
+    return premul, (255 - alpha).astype(np.uint8)
+
+
+def blend_premultiplied(
+    region: np.ndarray, premul: np.ndarray, inv_alpha: np.ndarray, acc: np.ndarray, tmp: np.ndarray
+) -> np.ndarray:
+    """region = premul + round(region * inv_alpha / 255) (제자리)
+
+    acc/tmp는 region과 같은 크기의 uint16 작업 버퍼
+    """
+    np.multiply(region, inv_alpha, out=acc, dtype=np.uint16)
+    # round(acc / 255) = (acc + 128 + ((acc + 128) >> 8)) >> 8 (0..255*255 범위에서 정확)
+    np.add(acc, 128, out=acc)
+    np.right_shift(acc, 8, out=tmp)
+    np.add(acc, tmp, out=acc)
+    np.right_shift(acc, 8, out=acc)
+    np.add(acc, premul, out=acc)
+    np.copyto(region, acc, casting="unsafe")
+    return region
+
+
+class PremultipliedLayer:
+    """캔버스 위 고정 위치의 premultiplied RGBA 레이어 (bbox 영역만 보관)"""
+
+    def __init__(
+        self, bbox: tuple[int, int, int, int], premul: np.ndarray, inv_alpha: np.ndarray
+    ):
+        self.bbox = tuple(int(v) for v in bbox)
+        self.premul = premul
+        self.inv_alpha = inv_alpha
+
+    @classmethod
+    def from_image(
+        cls, image: Image.Image, offset: tuple[int, int] = (0, 0)
+    ) -> "PremultipliedLayer | None":
+        """PIL 이미지(offset 위치)에서 레이어 생성. 완전히 투명하면 None"""
+        image = image.convert("RGBA")
+        bbox = image.getchannel("A").getbbox()
+        if bbox is None:
+            return None
+        premul, inv_alpha = premultiply(np.asarray(image.crop(bbox)))
+        x, y = offset
+        return cls((bbox[0] + x, bbox[1] + y, bbox[2] + x, bbox[3] + y), premul, inv_alpha)
+
+    def clipped(self, size: tuple[int, int]) -> "PremultipliedLayer | None":
+        """캔버스 밖으로 나간 부분을 잘라낸 레이어 (캔버스와 겹치지 않으면 None)"""
+        W, H = size
+        x0, y0, x1, y1 = self.bbox
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, W), min(y1, H)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return None
+        if (cx0, cy0, cx1, cy1) == self.bbox:
+            return self
+        sy, sx = slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)
+        return PremultipliedLayer(
+            (cx0, cy0, cx1, cy1), self.premul[sy, sx], self.inv_alpha[sy, sx]
+        )
+
+
+class FrameCompositor:
+    """고정 캔버스 크기의 레이어 합성기 (출력/작업 버퍼를 생성 시 1번만 할당)
+
+    composite()가 반환하는 배열은 다음 호출에서 덮어쓰이므로 보관하려면 복사해야 한다
+    (인코더/QA/전환 합성은 프레임을 바로 소비하거나 복사한다)
+    """
+
+    def __init__(self, size: tuple[int, int], layers: list[PremultipliedLayer | None] = ()):
+        W, H = int(size[0]), int(size[1])
+        self.size = (W, H)
+        self.out = np.zeros((H, W, 3), dtype=np.uint8)
+        clipped = [layer.clipped(self.size) for layer in layers if layer is not None]
+        self.layers = [layer for layer in clipped if layer is not None]
+        # 레이어별 uint16 작업 버퍼 2개 (곱/반올림 나눗셈용)
+        self._scratch = [
+            (np.empty(layer.premul.shape, np.uint16), np.empty(layer.premul.shape, np.uint16))
+            for layer in self.layers
+        ]
+
+    def composite(self, base: np.ndarray) -> np.ndarray:
+        """base 프레임 위에 레이어들을 순서대로 블렌딩한 (H, W, 3) uint8 프레임
+
+        base가 캔버스 크기와 다르면 검은 캔버스 왼쪽 위에 놓는다
+        (CompositeVideoClip 기본 위치와 동일)
+        """
+        out = self.out
+        W, H = self.size
+        if base.shape[0] == H and base.shape[1] == W:
+            np.copyto(out, base[:, :, :3], casting="unsafe")
+        else:
+            out.fill(0)
+            h, w = min(H, base.shape[0]), min(W, base.shape[1])
+            np.copyto(out[:h, :w], base[:h, :w, :3], casting="unsafe")
+
+        for layer, (acc, tmp) in zip(self.layers, self._scratch, strict=True):
+            x0, y0, x1, y1 = layer.bbox
+            blend_premultiplied(out[y0:y1, x0:x1], layer.premul, layer.inv_alpha, acc, tmp)
+        return out
+
+    def __call__(self, base: np.ndarray) -> np.ndarray:
+        return self.composite(base)
+
+
+def flatten_layers(images: list[Image.Image], size: tuple[int, int]) -> PremultipliedLayer | None:
+    """캔버스 크기 RGBA 이미지들을 1장으로 평탄화한 레이어 (모두 투명하면 None)"""
+    canvas = Image.new("RGBA", size, (0, 0, 0, 0))
+    for im in images:
+        canvas.alpha_composite(im.convert("RGBA"))
+    return PremultipliedLayer.from_image(canvas)
+
+
+def static_frame(
+    size: tuple[int, int], color: Any, images: list[Image.Image] = ()
+) -> np.ndarray:
+    """단색 배경 위에 RGBA 이미지들을 합성한 정지 RGB 프레임 (플레이스홀더용, 마스크 없음)"""
+    canvas = Image.new("RGBA", size, color)
+    for im in images:
+        canvas.alpha_composite(im.convert("RGBA"))
+    return np.asarray(canvas.convert("RGB"))
@@ -0,0 +1,236 @@
+"""
+S4-3. ffmpeg rawvideo 파이프 인코더
+numpy RGB 프레임을 상주 ffmpeg 프로세스의 stdin으로 직접 스트리밍
+(moviepy write_videofile 대체 백엔드)
+프레임 버퍼 2개를 번갈아 쓰는 더블 버퍼링:
+합성 스레드가 다음 프레임을 채우는 동안 writer 스레드가 전송
+ffmpeg stderr는 별도 스레드가 계속 읽어서 마지막 줄들만 보관 (파이프가 차서 인코더가 멈추지 않게)
+"""
+
+import contextlib
+import queue
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import proglog
+
+from services.segment_cache import ffmpeg_binary
+
+# 실패 메시지에 남길 ffmpeg stderr 끝부분 줄 수
+STDERR_TAIL_LINES = 50
+
+
+class FFmpegPipeWriter:
+    """rgb24 rawvideo를 stdin으로 받아 인코딩하는 ffmpeg 프로세스 래퍼"""
+
+    def __init__(
+        self,
+        output_path: str,
+        size: tuple[int, int],
+        fps: float,
+        codec: str = "libx264",
+        preset: str | None = None,
+        bitrate: str | None = None,
+        threads: int | None = None,
+        ffmpeg_params: list[str] | None = None,
+        buffers: int = 2,
+    ):
+        self.output_path = str(output_path)
+        self.size = (int(size[0]), int(size[1]))
+        self.frames_written = 0
+        self._error: BaseException | None = None
+
+        W, H = self.size
+        cmd = [
+            ffmpeg_binary(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "rawvideo",
+            "-vcodec",
+            "rawvideo",
+            "-s",
+            f"{W}x{H}",
+            "-pix_fmt",
+            "rgb24",
+            "-r",
+            f"{fps:.02f}",
+            "-an",
+            "-i",
+            "-",
+            "-vcodec",
+            codec,
+        ]
+        if preset:
+            cmd += ["-preset", preset]
+        if bitrate:
+            cmd += ["-b", bitrate]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        params = list(ffmpeg_params or [])
+        cmd += params
+        # moviepy와 동일: libx264 + 짝수 해상도면 yuv420p (ffmpeg_params에 지정되어 있으면 생략)
+        if codec == "libx264" and W % 2 == 0 and H % 2 == 0 and "-pix_fmt" not in params:
+            cmd += ["-pix_fmt", "yuv420p"]
+        cmd.append(self.output_path)
+        self.cmd = cmd
+
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        )
+
+        # 더블 버퍼: free → (copyto) → full → (stdin.write) → free
+        self._free: queue.Queue = queue.Queue()
+        self._full: queue.Queue = queue.Queue()
+        for _ in range(max(2, buffers)):
+            self._free.put(np.empty((H, W, 3), dtype=np.uint8))
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+        self._stderr: deque[bytes] = deque(maxlen=STDERR_TAIL_LINES)
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+
+    def _drain_stderr(self) -> None:
+        for line in iter(self.proc.stderr.readline, b""):
+            self._stderr.append(line)
+        self.proc.stderr.close()
+
+    def _stderr_text(self) -> str:
+        return b"".join(self._stderr).decode("utf-8", errors="ignore").strip()
+
+    def _writer_loop(self) -> None:
+        stdin = self.proc.stdin
+        while True:
+            buf = self._full.get()
+            if buf is None:
+                break
+            try:
+                if self._error is None:
+                    stdin.write(memoryview(buf).cast("B"))
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._free.put(buf)
+
+    def write_frame(self, frame: np.ndarray) -> None:
+        """프레임 1장 전송 (빈 버퍼가 생길 때까지만 대기)"""
+        if self._error is not None:
+            # 파이프가 끊겼다면 ffmpeg가 이미 종료된 것이므로 stderr를 끝까지 읽은 뒤 함께 보고
+            self._stderr_thread.join(timeout=1)
+            stderr = self._stderr_text()[-500:]
+            raise RuntimeError(f"ffmpeg 파이프 인코딩 실패: {self._error} {stderr}".strip())
+        buf = self._free.get()
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            frame = frame[..., :3]
+        np.copyto(buf, frame, casting="unsafe")
+        self._full.put(buf)
+        self.frames_written += 1
+
+    def close(self) -> None:
+        """남은 프레임을 모두 보낸 뒤 인코딩 종료 대기"""
+        if self.proc is None:
+            return
+        self._full.put(None)
+        self._thread.join()
+        with contextlib.suppress(OSError):
+            self.proc.stdin.close()
+        rc = self.proc.wait()
+        self._stderr_thread.join()
+        self.proc = None
+        if self._error is not None or rc != 0:
+            stderr = self._stderr_text()[-500:]
+            raise RuntimeError(f"ffmpeg 파이프 인코딩 실패 rc={rc}: {stderr}")
+
+    def abort(self) -> None:
+        """인코딩 중단: ffmpeg 종료 → writer/stderr 스레드 정리 → 미완성 출력 파일 삭제"""
+        if self.proc is None:
+            return
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        # 프로세스가 끝났으므로 막혀 있던 stdin.write는 BrokenPipe로 풀린다
+        self._full.put(None)
+        self._thread.join()
+        with contextlib.suppress(OSError):
+            self.proc.stdin.close()
+        self._stderr_thread.join()
+        self.proc = None
+        Path(self.output_path).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_clip_ffmpeg_pipe(clip, output_path: str, settings: dict[str, Any]) -> int:
+    """write_videofile과 같은 설정 dict로 클립을 파이프 인코딩. 기록한 프레임 수 반환"""
+    fps = settings.get("fps") or clip.fps
+    logger = proglog.default_bar_logger(settings.get("logger"))
+    with FFmpegPipeWriter(
+        output_path,
+        clip.size,
+        fps,
+        codec=settings.get("codec", "libx264"),
+        preset=settings.get("preset"),
+        bitrate=settings.get("bitrate"),
+        threads=settings.get("threads"),
+        ffmpeg_params=settings.get("ffmpeg_params"),
+    ) as writer:
+        for frame in clip.iter_frames(fps=fps, dtype="uint8", logger=logger):
+            writer.write_frame(frame)
+        return writer.frames_written
+
+
+def write_fanout_ffmpeg_pipe(
+    frames_at: Callable[[float], list[np.ndarray]],
+    duration: float,
+    outputs: list[tuple[str, tuple[int, int]]],
+    settings: dict[str, Any],
+    output_settings: list[dict[str, Any]] | None = None,
+) -> int:
+    """한 번의 시간 순회로 여러 출력을 동시에 인코딩 (출력마다 ffmpeg 프로세스 1개)
+
+    frames_at(t)는 outputs 순서대로 프레임 목록을 반환한다. output_settings[k]는 k번째 출력에만
+    덮어쓸 설정 (예: 리프레임용 ffmpeg_params -vf). 하나라도 실패하면 모든 출력 파일을 지운다.
+    출력당 기록한 프레임 수 반환
+    """
+    fps = settings["fps"]
+    logger = proglog.default_bar_logger(settings.get("logger"))
+    times = np.arange(0, duration, 1.0 / fps)
+    per_output = [{**settings, **extra} for extra in output_settings or [{}] * len(outputs)]
+    with ExitStack() as stack:
+        writers = [
+            stack.enter_context(
+                FFmpegPipeWriter(
+                    path,
+                    size,
+                    fps,
+                    codec=opts.get("codec", "libx264"),
+                    preset=opts.get("preset"),
+                    bitrate=opts.get("bitrate"),
+                    threads=opts.get("threads"),
+                    ffmpeg_params=opts.get("ffmpeg_params"),
+                )
+            )
+            for (path, size), opts in zip(outputs, per_output, strict=True)
+        ]
+        for t in logger.iter_bar(t=times):
+            for writer, frame in zip(writers, frames_at(t), strict=True):
+                writer.write_frame(frame)
+        return len(times)
+
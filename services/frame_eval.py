@@ -0,0 +1,155 @@
+"""
+S4-8. 단일 프레임 평가 & 타임라인 필름스트립
+레시피 합성 결과를 인코딩 없이 임의 시점에서 평가하고,
+전체 타임라인에 걸친 썸네일 N장을 한 번에 생성
+(미리보기를 위해 mp4를 굽지 않는다)
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+from services.render_engine import (
+    MOBILE_FPS,
+    MOBILE_HEIGHT,
+    MOBILE_WIDTH,
+    build_timeline,
+    load_assets_from_directory,
+    recipe_shots,
+)
+from services.timeline import TimelineClip
+
+# 필름스트립 기본값
+FILMSTRIP_COUNT = 12
+FILMSTRIP_THUMB_WIDTH = 180
+
+
+class RecipeFrameEvaluator:
+    """레시피 합성 타임라인을 프레임 단위로 평가 (with 문으로 영상 리더 닫기 보장)
+
+    recipe는 dict 또는 recipe.json 경로, assets는 자산 맵 또는 자산 디렉토리.
+    size를 작게 주면 영상 소스가 디코드 단계에서 바로 그 크기로 나온다 (썸네일용).
+    샷은 평가 시각에 활성일 때만 열리므로 긴 타임라인도 열린 리더 수가 일정하다
+    """
+
+    def __init__(
+        self,
+        recipe: dict[str, Any] | str | Path,
+        assets: dict[str, str] | str | Path,
+        size: tuple[int, int] | None = None,
+        fps: float = MOBILE_FPS,
+        safe_mode: bool = False,
+        debug_overlays: bool = False,
+    ):
+        if isinstance(recipe, (str, Path)):
+            with open(recipe, encoding="utf-8") as f:
+                recipe = json.load(f)
+        if isinstance(assets, (str, Path)):
+            assets = load_assets_from_directory(str(assets))
+
+        self.size = tuple(size or (MOBILE_WIDTH, MOBILE_HEIGHT))
+        self.diagnostics = {"missing": set(), "resolved": 0, "built": 0, "reasons": []}
+        self.clip = build_timeline(
+            recipe_shots(recipe),
+            assets,
+            self.diagnostics,
+            safe_mode=safe_mode,
+            debug_overlays=debug_overlays,
+            size=self.size,
+            fps=fps,
+        )
+        if self.clip is None:
+            raise ValueError("No usable shots were produced. recipe has no shots")
+
+    @property
+    def duration(self) -> float:
+        return float(self.clip.duration)
+
+    def shot_spans(self) -> list[tuple[float, float]]:
+        """타임라인 위 각 샷의 (시작, 끝) 시각"""
+        if isinstance(self.clip, TimelineClip):
+            return list(zip(self.clip.starts, self.clip.ends, strict=True))
+        return [(0.0, self.duration)]
+
+    def shot_index_at(self, t: float) -> int:
+        """시각 t에 보이는 샷 인덱스 (전환 중이면 들어오는 샷)"""
+        if isinstance(self.clip, TimelineClip):
+            return self.clip.active_indices(self._clamp(t))[-1]
+        return 0
+
+    def _clamp(self, t: float) -> float:
+        return min(max(float(t), 0.0), max(self.duration - 1e-3, 0.0))
+
+    def frame_at(self, t: float) -> np.ndarray:
+        """시각 t의 합성 프레임 (H, W, 3) uint8"""
+        frame = np.asarray(self.clip.get_frame(self._clamp(t)))[..., :3]
+        return np.array(frame, dtype=np.uint8)  # 리더 버퍼와 분리
+
+    def frames_at(self, times: list[float]) -> list[np.ndarray]:
+        """여러 시각의 프레임 (입력 순서로 반환)
+
+        리더가 앞으로만 읽고 지난 샷은 바로 닫히도록 시간순으로 평가한다
+        """
+        frames: list[np.ndarray | None] = [None] * len(times)
+        for i in sorted(range(len(times)), key=lambda i: times[i]):
+            frames[i] = self.frame_at(times[i])
+        return frames
+
+    def close(self) -> None:
+        self.clip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def evaluate_recipe_frames(
+    recipe: dict[str, Any] | str | Path,
+    assets: dict[str, str] | str | Path,
+    times: list[float],
+    size: tuple[int, int] | None = None,
+    safe_mode: bool = False,
+    debug_overlays: bool = False,
+) -> list[np.ndarray]:
+    """레시피 합성 결과를 주어진 시각들에서 평가 (인코딩 없음)"""
+    with RecipeFrameEvaluator(
+        recipe, assets, size, safe_mode=safe_mode, debug_overlays=debug_overlays
+    ) as ev:
+        return ev.frames_at(times)
+
+
+def timeline_filmstrip(
+    recipe: dict[str, Any] | str | Path,
+    assets: dict[str, str] | str | Path,
+    count: int = FILMSTRIP_COUNT,
+    thumb_width: int = FILMSTRIP_THUMB_WIDTH,
+    safe_mode: bool = False,
+    debug_overlays: bool = False,
+) -> dict[str, Any]:
+    """전체 타임라인을 count 구간으로 나눠 구간 중앙 프레임 썸네일 생성 (한 번의 시간순 패스)
+
+    타임라인을 썸네일 크기로 바로 합성하므로 영상 소스도 썸네일 크기로 디코드된다.
+    반환: times, shots(썸네일별 샷 인덱스), thumbnails(PIL 이미지), strip(가로로 이어붙인 이미지)
+    """
+    count = max(1, int(count))
+    thumb_w = max(2, int(thumb_width) // 2 * 2)
+    thumb_h = max(2, round(thumb_w * MOBILE_HEIGHT / MOBILE_WIDTH / 2) * 2)
+
+    with RecipeFrameEvaluator(
+        recipe, assets, (thumb_w, thumb_h), safe_mode=safe_mode, debug_overlays=debug_overlays
+    ) as ev:
+        step = ev.duration / count
+        times = [(k + 0.5) * step for k in range(count)]
+        frames = ev.frames_at(times)
+        shots = [ev.shot_index_at(t) for t in times]
+
+    thumbnails = [Image.fromarray(frame) for frame in frames]
+    strip = Image.new("RGB", (thumb_w * count, thumb_h))
+    for k, thumb in enumerate(thumbnails):
+        strip.paste(thumb, (k * thumb_w, 0))
+    return {"times": times, "shots": shots, "thumbnails": thumbnails, "strip": strip}
@@ -0,0 +1,379 @@
+"""
+S4-12. 3D LUT 색보정
+색보정을 픽셀별 함수로 정의해서 한 번만 컴파일하고, 프레임에는 입력 RGB 전체(채널당 256단계)로
+직접 인덱싱하는 테이블 조회 1번만 수행한다. .cube 파일(33³ 등)은 베이크할 때 모든 입력값에 대해
+삼선형 보간을 미리 계산하므로 결과는 픽셀별 삼선형 보간과 같다 (픽셀별 보간은 약 30배 느림).
+비네트는 (크기, 강도)별 Q8 고정소수점 게인 마스크로 캐시해서 LUT 조회 직후 같은 패스에서 곱한다
+베이크한 테이블은 LUT_CACHE_DIR에 .npy로 저장하고 이후 렌더/워커 프로세스는 메모리 맵으로 연다
+(베이크 1번, 테이블 페이지는 프로세스 간 공유)
+이름으로 찾는 LUT: 내장 등급(cinematic, warm-soft, identity) 또는
+ADGEN_LUT_DIR(기본 configs/luts)의 <이름>.cube. 알 수 없는 이름은 경고 후 DEFAULT_LUT로 대체
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+LUT_DIR = Path(os.getenv("ADGEN_LUT_DIR", Path(__file__).resolve().parents[1] / "configs" / "luts"))
+
+# 스타일/레시피에 lut이 없거나 찾을 수 없을 때 쓰는 색보정
+DEFAULT_LUT = "cinematic"
+
+# 베이크 테이블 인덱스 비트 수 (채널당 2^8 = 256단계, 테이블 256³×3 = 48MB, 입력 양자화 없음)
+# 7비트(6MB)로 줄이면 조회 속도는 같지만 그라데이션에서 출력 단계가 절반으로 줄어 밴딩이 생긴다
+# 33³/65³ 격자 + 프레임별 삼선형 보간(PIL Color3DLUT)은 1080x1920에서 프레임당 100ms 이상으로
+# 테이블 조회(약 55ms)보다 느리다
+LUT_INDEX_BITS = 8
+
+# 베이크 테이블 디스크 캐시 (빈 문자열이면 끔)
+# 베이크(약 2~3초)를 렌더/워커 프로세스마다 반복하지 않고,
+# 메모리 맵이라 동시에 도는 워커들이 48MB 테이블을 따로 들고 있지 않는다
+LUT_CACHE_DIR = os.getenv("ADGEN_LUT_CACHE_DIR", str(Path(tempfile.gettempdir()) / "adgen_luts"))
+
+# 내장 등급 정의 버전 (BUILTIN_GRADES 함수를 바꾸면 올려서 디스크 캐시 무효화)
+BUILTIN_GRADES_VERSION = 1
+
+# 콘트라스트 기준 밝기: 기존 PIL ImageEnhance.Contrast는 프레임 평균을 기준으로 쓰지만
+# LUT는 픽셀별 함수여야 하므로 고정 기준 사용
+CONTRAST_PIVOT = 128.0
+
+# PIL RGB → L 변환 계수 (ITU-R 601, 16비트 고정소수점)
+_L_WEIGHTS = np.array([19595, 38470, 7471], dtype=np.float64) / 65536.0
+
+
+def _pil_blend(degenerate: np.ndarray, image: np.ndarray, factor: float) -> np.ndarray:
+    """PIL Image.blend와 같은 계산 (결과는 0 방향 절삭 후 0~255 클립)"""
+    return np.clip(np.trunc(degenerate + factor * (image - degenerate)), 0, 255)
+
+
+def _luma_pil(rgb: np.ndarray) -> np.ndarray:
+    return np.floor(rgb @ _L_WEIGHTS + 0.5)
+
+
+def contrast(rgb: np.ndarray, factor: float, pivot: float = CONTRAST_PIVOT) -> np.ndarray:
+    """PIL ImageEnhance.Contrast (기준 밝기 고정)"""
+    return _pil_blend(np.full_like(rgb, float(int(pivot + 0.5))), rgb, factor)
+
+
+def saturation(rgb: np.ndarray, factor: float) -> np.ndarray:
+    """PIL ImageEnhance.Color (회색 기준 채도 조절)"""
+    return _pil_blend(_luma_pil(rgb)[:, None], rgb, factor)
+
+
+def cinematic_grade_pixels(rgb: np.ndarray) -> np.ndarray:
+    """renderer 시네마틱 색보정의 픽셀별 정의 (N, 3) 0~255 → (N, 3)
+
+    시원한 섀도우(루마 < 96), 따뜻한 하이라이트(루마 > 190), 콘트라스트 1.08, 채도 1.06
+    """
+    rgb = np.asarray(rgb, dtype=np.float32).copy()
+    lum = 0.299 * rgb[:, 0] + 0.587 * rgb[:, 1] + 0.114 * rgb[:, 2]
+    sh, hi = lum < 96, lum > 190
+    rgb[sh] *= np.array([0.92, 1.00, 0.98], dtype=np.float32)
+    rgb[hi] = np.minimum(255.0, rgb[hi] * np.array([1.06, 1.02, 0.98], dtype=np.float32))
+    rgb = np.clip(rgb, 0, 255).astype(np.uint8).astype(np.float64)
+    return saturation(contrast(rgb, 1.08), 1.06)
+
+
+def warm_soft_pixels(rgb: np.ndarray) -> np.ndarray:
+    """warm-soft: 살짝 들린 블랙, 따뜻한 색온도, 낮은 콘트라스트 (분석 레시피 globals.lut 기본값)"""
+    rgb = np.asarray(rgb, dtype=np.float64) * np.array([1.03, 1.0, 0.95]) + np.array([6, 4, 2])
+    return saturation(contrast(np.clip(rgb, 0, 255), 0.94), 0.97)
+
+
+BUILTIN_GRADES: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "identity": lambda rgb: np.asarray(rgb, dtype=np.float64),
+    "cinematic": cinematic_grade_pixels,
+    "warm-soft": warm_soft_pixels,
+}
+
+
+def parse_cube(path: str | Path) -> tuple[np.ndarray, np.ndarray]:
+    """.cube 3D LUT → ((N, N, N, 3) float32 [r, g, b] 인덱스 출력값, (2, 3) 입력 범위 [min, max])
+
+    입력 범위는 DOMAIN_MIN/DOMAIN_MAX(채널별) 또는 LUT_3D_INPUT_RANGE(전 채널 공통), 기본값 0~1
+    """
+    size = None
+    domain_min, domain_max = np.zeros(3), np.ones(3)
+    values = []
+    with open(path, encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, _, rest = line.partition(" ")
+            if key == "LUT_3D_SIZE":
+                size = int(rest)
+            elif key == "DOMAIN_MIN":
+                domain_min = np.array(rest.split(), dtype=np.float64)
+            elif key == "DOMAIN_MAX":
+                domain_max = np.array(rest.split(), dtype=np.float64)
+            elif key == "LUT_3D_INPUT_RANGE":
+                lo, hi = (float(v) for v in rest.split()[:2])
+                domain_min, domain_max = np.full(3, lo), np.full(3, hi)
+            elif key == "LUT_1D_SIZE":
+                raise ValueError(f"1D LUT는 지원하지 않습니다: {path}")
+            elif key in ("TITLE", "LUT_1D_INPUT_RANGE"):
+                continue
+            else:
+                values.append(line.split()[:3])
+    if not size or len(values) != size**3:
+        raise ValueError(f"잘못된 .cube 파일: {path} (size={size}, 항목 {len(values)}개)")
+    if np.any(domain_max <= domain_min):
+        raise ValueError(f"잘못된 .cube 입력 범위: {path} ({domain_min} ~ {domain_max})")
+    data = np.array(values, dtype=np.float32)
+    # .cube는 red가 가장 빠르게 변함 → [b, g, r] 순서를 [r, g, b]로
+    lut = data.reshape(size, size, size, 3).transpose(2, 1, 0, 3)
+    return np.ascontiguousarray(lut), np.stack([domain_min, domain_max])
+
+
+def _lattice_pos(rgb01: np.ndarray, n: int, domain: np.ndarray | None) -> np.ndarray:
+    """0~1 입력 → LUT 격자 좌표 (입력 범위 밖은 경계로 클립)"""
+    if domain is not None:
+        rgb01 = (rgb01 - domain[0]) / (domain[1] - domain[0])
+    return np.clip(rgb01, 0.0, 1.0) * (n - 1)
+
+
+def sample_lut(lut: np.ndarray, rgb01: np.ndarray, domain: np.ndarray | None = None) -> np.ndarray:
+    """(N, N, N, 3) LUT를 (M, 3) 0~1 입력에서 삼선형 보간 (domain: parse_cube의 입력 범위)"""
+    n = lut.shape[0]
+    pos = _lattice_pos(np.asarray(rgb01, dtype=np.float64), n, domain)
+    i0 = np.minimum(pos.astype(np.int64), n - 2)
+    f = pos - i0
+    out = np.zeros((len(rgb01), 3), dtype=np.float64)
+    for dr in (0, 1):
+        wr = f[:, 0] if dr else 1 - f[:, 0]
+        for dg in (0, 1):
+            wg = f[:, 1] if dg else 1 - f[:, 1]
+            for db in (0, 1):
+                wb = f[:, 2] if db else 1 - f[:, 2]
+                corner = lut[i0[:, 0] + dr, i0[:, 1] + dg, i0[:, 2] + db]
+                out += corner * (wr * wg * wb)[:, None]
+    return out
+
+
+def _interp_weights(levels01: np.ndarray, n: int, lo: float = 0.0, hi: float = 1.0) -> np.ndarray:
+    """1D 선형 보간 가중치 (len(levels01), n). sample_lut의 한 축과 같은 계산"""
+    pos = np.clip((levels01 - lo) / (hi - lo), 0.0, 1.0) * (n - 1)
+    i0 = np.minimum(pos.astype(np.int64), n - 2)
+    f = pos - i0
+    weights = np.zeros((len(levels01), n), dtype=np.float64)
+    rows = np.arange(len(levels01))
+    weights[rows, i0] = 1 - f
+    weights[rows, i0 + 1] = f
+    return weights
+
+
+class BakedLUT:
+    """입력 상위 LUT_INDEX_BITS비트로 직접 인덱싱하는 RGB 테이블 (프레임당 gather 1번)"""
+
+    def __init__(self, table: np.ndarray, name: str = "", bits: int = LUT_INDEX_BITS):
+        self.table = np.ascontiguousarray(table, dtype=np.uint8).reshape(-1, 3)
+        self.name = name
+        self.bits = bits
+
+    @staticmethod
+    def _levels(bits: int) -> np.ndarray:
+        """인덱스 1단계가 대표하는 입력값 (각 구간 가운데, 0~255). bits=8이면 0..255 그대로"""
+        step = 256 >> bits
+        return np.arange(1 << bits, dtype=np.float64) * step + (step - 1) / 2
+
+    @classmethod
+    def from_function(
+        cls, fn: Callable[[np.ndarray], np.ndarray], name: str = "", bits: int = LUT_INDEX_BITS
+    ) -> "BakedLUT":
+        """픽셀별 색보정 함수((N, 3) 0~255 → (N, 3))를 테이블로 컴파일
+
+        전체 입력(256³)을 한 번에 만들지 않도록 red 단계별 평면으로 나눠 계산
+        """
+        levels = cls._levels(bits)
+        n = len(levels)
+        g, b = np.meshgrid(levels, levels, indexing="ij")
+        plane = np.empty((n * n, 3), dtype=np.float64)
+        table = np.empty((n, n * n, 3), dtype=np.uint8)
+        for i, r in enumerate(levels):
+            plane[:, 0], plane[:, 1], plane[:, 2] = r, g.ravel(), b.ravel()
+            table[i] = np.clip(np.rint(fn(plane)), 0, 255)
+        return cls(table, name, bits)
+
+    @classmethod
+    def from_lut(
+        cls,
+        lut: np.ndarray,
+        name: str = "",
+        bits: int = LUT_INDEX_BITS,
+        domain: np.ndarray | None = None,
+    ) -> "BakedLUT":
+        """(N, N, N, 3) 3D LUT(출력 0~1)를 삼선형 보간으로 테이블화 (domain: parse_cube 입력 범위)
+
+        격자 위 삼선형 보간은 축별 선형 보간의 곱이므로 축마다 가중치 행렬을 곱해서 계산
+        """
+        n = lut.shape[0]
+        levels01 = cls._levels(bits) / 255.0
+        domain = np.array([[0.0] * 3, [1.0] * 3]) if domain is None else domain
+        wr, wg, wb = (_interp_weights(levels01, n, domain[0][c], domain[1][c]) for c in range(3))
+        by_r = np.tensordot(wr, lut.astype(np.float64), axes=(1, 0))  # (L, N, N, 3)
+        table = np.empty((len(levels01), len(levels01), len(levels01), 3), dtype=np.uint8)
+        for i, plane in enumerate(by_r):
+            out = np.einsum("gj,bk,jkc->gbc", wg, wb, plane, optimize=True) * 255.0
+            table[i] = np.clip(np.rint(out), 0, 255)
+        return cls(table, name, bits)
+
+    def index(
+        self, frame: np.ndarray, out: np.ndarray | None = None, tmp: np.ndarray | None = None
+    ) -> np.ndarray:
+        """(H, W, 3) uint8 → (H, W) uint32 테이블 인덱스 (out/tmp 작업 버퍼를 주면 할당 없음)"""
+        if out is None:
+            out = np.empty(frame.shape[:2], dtype=np.uint32)
+        if tmp is None:
+            tmp = np.empty_like(out)
+        shift = 8 - self.bits
+        np.right_shift(frame[..., 0], shift, out=tmp)
+        np.left_shift(tmp, 2 * self.bits, out=out)
+        np.right_shift(frame[..., 1], shift, out=tmp)
+        np.left_shift(tmp, self.bits, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        np.right_shift(frame[..., 2], shift, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        return out
+
+    def apply(self, frame: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """(H, W, 3) uint8 프레임에 LUT 적용 (out을 주면 그 버퍼에 기록)"""
+        return np.take(self.table, self.index(frame[..., :3]), axis=0, out=out, mode="clip")
+
+
+_BAKED: dict[str, BakedLUT] = {}
+_BAKED_LOCK = threading.Lock()
+
+
+def resolve_lut_path(name: str) -> Path | None:
+    """LUT 이름 → .cube 경로 (직접 경로 또는 LUT_DIR/<이름>.cube). 없으면 None"""
+    for candidate in (Path(name), LUT_DIR / name, LUT_DIR / f"{name}.cube"):
+        if candidate.suffix.lower() == ".cube" and candidate.is_file():
+            return candidate
+    return None
+
+
+def _cached_bake(name: str, source: str, bits: int, build: Callable[[], BakedLUT]) -> BakedLUT:
+    """LUT_CACHE_DIR의 베이크 테이블을 메모리 맵으로 열고, 없거나 깨졌으면 베이크 후 저장
+
+    source는 테이블 내용을 결정하는 값(.cube 내용 해시, 내장 등급 버전)이라 바뀌면 새 파일을 쓴다
+    """
+    if not LUT_CACHE_DIR:
+        return build()
+    digest = hashlib.sha1(f"{source}|bits={bits}".encode()).hexdigest()[:16]
+    path = Path(LUT_CACHE_DIR) / f"lut_{bits}b_{digest}.npy"
+    try:
+        table = np.load(path, mmap_mode="r")
+        if table.shape == (1 << (3 * bits), 3) and table.dtype == np.uint8:
+            return BakedLUT(table, name, bits)
+    except (OSError, ValueError):
+        pass
+    baked = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp, baked.table)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠️ LUT 캐시 저장 실패 ({path}): {e}")
+    return baked
+
+
+def _bake(name: str, bits: int = LUT_INDEX_BITS) -> BakedLUT | None:
+    path = resolve_lut_path(name)
+    if path is not None:
+        source = "cube:" + hashlib.sha1(path.read_bytes()).hexdigest()
+
+        def build() -> BakedLUT:
+            lut, domain = parse_cube(path)
+            return BakedLUT.from_lut(lut, name, bits, domain)
+
+        return _cached_bake(name, source, bits, build)
+    if name in BUILTIN_GRADES:
+        source = f"builtin:{name}:v{BUILTIN_GRADES_VERSION}"
+        return _cached_bake(
+            name, source, bits, lambda: BakedLUT.from_function(BUILTIN_GRADES[name], name, bits)
+        )
+    return None
+
+
+def get_lut(name: str = DEFAULT_LUT) -> BakedLUT:
+    """이름의 베이크된 LUT (프로세스 안에서 한 번만 컴파일). .cube 파일이 내장 등급보다 우선
+
+    찾을 수 없는 이름은 경고를 한 번 출력하고 DEFAULT_LUT를 쓴다 (레시피 오타로 렌더가 멈추지 않게)
+    """
+    with _BAKED_LOCK:
+        baked = _BAKED.get(name)
+        if baked is None:
+            baked = _bake(name)
+            if baked is None:
+                print(
+                    f"⚠️ 알 수 없는 LUT '{name}' → {DEFAULT_LUT} 사용 "
+                    f"(내장: {tuple(BUILTIN_GRADES)}, 경로: {LUT_DIR})"
+                )
+                baked = _BAKED.get(DEFAULT_LUT) or _bake(DEFAULT_LUT)
+                _BAKED[DEFAULT_LUT] = baked
+            _BAKED[name] = baked
+    return baked
+
+
+@lru_cache(maxsize=8)
+def vignette_gain(size: tuple[int, int], strength: float) -> np.ndarray:
+    """(크기, 강도)별 비네트 게인 (H, W, 1) uint16 Q8 (256 = 1.0). 읽기 전용 캐시
+
+    게인 = 1 - strength * (중심 거리 / 최대 거리)^1.5
+    """
+    w, h = int(size[0]), int(size[1])
+    y, x = np.ogrid[:h, :w]
+    dist = np.sqrt((x - w / 2.0) ** 2 + (y - h / 2.0) ** 2)
+    gain = 1.0 - float(strength) * (dist / (dist.max() + 1e-6)) ** 1.5
+    gain = np.clip(np.rint(gain * 256.0), 0, 256).astype(np.uint16)[..., None]
+    gain.setflags(write=False)
+    return gain
+
+
+def apply_gain(frame: np.ndarray, gain: np.ndarray, out: np.ndarray, acc: np.ndarray) -> np.ndarray:
+    """out = round(frame * gain / 256) (uint16 작업 버퍼 acc, 최대 255*256+128 < 65536)"""
+    np.multiply(frame, gain, out=acc, dtype=np.uint16)
+    np.add(acc, 128, out=acc)
+    np.right_shift(acc, 8, out=acc)
+    np.copyto(out, acc, casting="unsafe")
+    return out
+
+
+class FrameGrader:
+    """LUT 색보정 + 비네트 융합 패스 (프레임 크기별 작업 버퍼를 1번만 할당)
+
+    프레임을 읽어 인덱스를 만들고, 테이블 조회 결과에 고정소수점 비네트 게인을 곱해 출력 버퍼에 쓴다
+    반환 배열은 다음 호출에서 덮어쓰이므로 보관하려면 복사해야 한다
+    """
+
+    def __init__(self, lut: str | BakedLUT = DEFAULT_LUT, vignette: float = 0.0):
+        self.lut = get_lut(lut) if isinstance(lut, str) else lut
+        self.vignette = float(vignette)
+        self._shape: tuple[int, int] | None = None
+
+    def _allocate(self, h: int, w: int) -> None:
+        self._shape = (h, w)
+        self._idx = np.empty((h, w), dtype=np.uint32)
+        self._tmp = np.empty((h, w), dtype=np.uint32)
+        self._graded = np.empty((h, w, 3), dtype=np.uint8)
+        self._out = np.empty((h, w, 3), dtype=np.uint8)
+        self._acc = np.empty((h, w, 3), dtype=np.uint16)
+        self._gain = vignette_gain((w, h), self.vignette) if self.vignette > 0 else None
+
+    def __call__(self, frame: np.ndarray) -> np.ndarray:
+        h, w = frame.shape[:2]
+        if self._shape != (h, w):
+            self._allocate(h, w)
+        idx = self.lut.index(frame[..., :3], out=self._idx, tmp=self._tmp)
+        if self._gain is None:
+            return np.take(self.lut.table, idx, axis=0, out=self._out, mode="clip")
+        graded = np.take(self.lut.table, idx, axis=0, out=self._graded, mode="clip")
+        return apply_gain(graded, self._gain, self._out, self._acc)
@@ -0,0 +1,128 @@
+"""
+S4-13. 필름 그레인 텍스처 뱅크
+시드 고정 가우시안 노이즈 타일 몇 장을 한 번만 만들어 두고(선택적으로 .npy 메모리 맵),
+프레임마다 미리 정해 둔 (타일, 오프셋) 조합의 뷰를 블록 단위로 더한다.
+프레임당 난수 생성/배열 할당 없음.
+타일은 블렌딩 가중치와 반올림 상수까지 미리 곱한 uint16이라 합성은 곱 1번 + 덧셈 + 시프트로 끝난다
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+GRAIN_TILE = 256  # 타일 한 변 (px)
+GRAIN_BANK_SIZE = 8  # 타일 수
+GRAIN_SEED = 20240917
+GRAIN_SIGMA = 8.0  # 노이즈 표준편차 (128 중심)
+GRAIN_SCHEDULE = 256  # 프레임별 (타일, 오프셋) 조합 주기
+
+# 지정하면 뱅크를 이 디렉토리의 .npy로 저장하고 이후에는 메모리 맵으로 연다 (프로세스 간 공유)
+GRAIN_CACHE_DIR = os.getenv("ADGEN_GRAIN_CACHE_DIR")
+
+
+def generate_tiles(tile: int, count: int, seed: int, sigma: float) -> np.ndarray:
+    """(count, tile, tile) uint8 노이즈 타일. 픽셀 독립 노이즈라 이어 붙여도 이음새가 없다"""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(128.0, sigma, (count, tile, tile))
+    return np.clip(np.rint(noise), 0, 255).astype(np.uint8)
+
+
+def _load_tiles(tile: int, count: int, seed: int, sigma: float) -> np.ndarray:
+    if not GRAIN_CACHE_DIR:
+        return generate_tiles(tile, count, seed, sigma)
+    path = Path(GRAIN_CACHE_DIR) / f"grain_{tile}x{count}_s{seed}_g{sigma:g}.npy"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp.npy")
+        np.save(tmp, generate_tiles(tile, count, seed, sigma))
+        os.replace(tmp, path)
+    return np.load(path, mmap_mode="r")
+
+
+class GrainBank:
+    """불투명도별로 미리 가중한 주기 확장 타일 뱅크
+
+    weighted[k]는 타일 k를 2배로 주기 확장(2T x 2T)한 뒤
+    noise * a + 128(반올림 상수)을 담은 uint16이라
+    어떤 오프셋의 T x T 창도 연속 뷰로 꺼낼 수 있다 (a = round(opacity * 256))
+    """
+
+    def __init__(
+        self,
+        opacity: float,
+        tile: int = GRAIN_TILE,
+        count: int = GRAIN_BANK_SIZE,
+        seed: int = GRAIN_SEED,
+        sigma: float = GRAIN_SIGMA,
+    ):
+        self.tile = int(tile)
+        self.count = int(count)
+        self.alpha = int(round(min(max(opacity, 0.0), 1.0) * 256))
+        tiles = _load_tiles(self.tile, self.count, seed, sigma)
+        self.weighted = np.tile(tiles, (1, 2, 2)).astype(np.uint16) * self.alpha + 128
+        rng = np.random.default_rng(seed + 1)
+        self.schedule = np.stack(
+            [
+                rng.integers(0, self.count, GRAIN_SCHEDULE),
+                rng.integers(0, self.tile, GRAIN_SCHEDULE),
+                rng.integers(0, self.tile, GRAIN_SCHEDULE),
+            ],
+            axis=1,
+        )
+
+
+_BANKS: dict[float, GrainBank] = {}
+_BANKS_LOCK = threading.Lock()
+
+
+def get_grain_bank(opacity: float) -> GrainBank:
+    """불투명도별 뱅크 (프로세스당 1번 생성)"""
+    key = round(float(opacity), 4)
+    with _BANKS_LOCK:
+        bank = _BANKS.get(key)
+        if bank is None:
+            bank = _BANKS[key] = GrainBank(key)
+    return bank
+
+
+class FilmGrain:
+    """프레임에 그레인을 블렌딩 (out = base * (1 - opacity) + noise * opacity, Q8 고정소수점)
+
+    frame_offset으로 샷마다 다른 그레인 순서를 쓴다. 반환 배열은 다음 호출에서 덮어쓰인다
+    """
+
+    def __init__(self, opacity: float = 0.08, fps: float = 24, frame_offset: int = 0):
+        self.bank = get_grain_bank(opacity)
+        self.fps = float(fps)
+        self.frame_offset = int(frame_offset)
+        self._shape: tuple[int, int] | None = None
+
+    def _allocate(self, h: int, w: int) -> None:
+        self._shape = (h, w)
+        self._acc = np.empty((h, w, 3), dtype=np.uint16)
+        self._out = np.empty((h, w, 3), dtype=np.uint8)
+
+    def apply(self, frame: np.ndarray, t: float) -> np.ndarray:
+        """시각 t의 그레인을 블렌딩한 (H, W, 3) uint8 프레임"""
+        h, w = frame.shape[:2]
+        if self._shape != (h, w):
+            self._allocate(h, w)
+        bank, T = self.bank, self.bank.tile
+        acc = self._acc
+        np.multiply(frame[..., :3], 256 - bank.alpha, out=acc, dtype=np.uint16)
+
+        i = (int(round(t * self.fps)) + self.frame_offset) % len(bank.schedule)
+        k0, oy, ox = (int(v) for v in bank.schedule[i])
+        # T x T 블록마다 다음 타일을 써서 T 주기 반복 무늬가 보이지 않게 한다
+        blocks = ((y, x) for y in range(0, h, T) for x in range(0, w, T))
+        for n, (y0, x0) in enumerate(blocks):
+            y1, x1 = min(y0 + T, h), min(x0 + T, w)
+            view = bank.weighted[(k0 + n) % bank.count, oy : oy + y1 - y0, ox : ox + x1 - x0]
+            region = acc[y0:y1, x0:x1]
+            np.add(region, view[..., None], out=region)
+
+        np.right_shift(acc, 8, out=acc)
+        np.copyto(self._out, acc, casting="unsafe")
+        return self._out
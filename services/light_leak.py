@@ -0,0 +1,119 @@
+"""
+S4-14. 라이트 리크 생성기
+기존 방식(2W x 2H RGBA 캔버스에 동심 타원 ~100개 + GaussianBlur(90))과 같은 모양의 방사형 필드를
+1/LEAK_DOWNSCALE 해상도에서 계산/블러하고,
+샷 길이 동안 화면에 들어올 수 있는 영역만 원래 해상도로 업샘플해서
+(색, 크기)별로 캐시한다. 프레임마다 화면과 겹치는 부분에만 premultiplied 정수 블렌딩
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from services.compositor import PremultipliedLayer, blend_premultiplied, premultiply
+
+LEAK_DOWNSCALE = 8  # 필드 계산/블러 해상도 배율
+LEAK_RING_STEP = 20  # 기존 타원 반지름 간격 (px)
+LEAK_BLUR_RADIUS = 90  # 원래 해상도 기준 블러 반경
+LEAK_SPEED = (30.0, 18.0)  # 이동 속도 (px/s)
+
+
+@lru_cache(maxsize=8)
+def leak_field(color: tuple[int, int, int], size: tuple[int, int]) -> Image.Image:
+    """2W x 2H 리크의 저해상도 블러 RGBA 필드 (중심 (W, H), 바깥으로 갈수록 진해지는 동심원)"""
+    W, H = size
+    R = max(W, H)
+    s = LEAK_DOWNSCALE
+    lw, lh = max(1, 2 * W // s), max(1, 2 * H // s)
+    # 저해상도 픽셀 중심의 원래 해상도 좌표
+    y, x = np.ogrid[:lh, :lw]
+    d = np.sqrt(((x + 0.5) * s - W) ** 2 + ((y + 0.5) * s - H) ** 2)
+    inside = d <= R
+    # d를 덮는 가장 작은 타원 반지름 (R, R - 20, ...) → 기존 알파 int(255 * (r / R)^2) // 10
+    r = R - LEAK_RING_STEP * np.floor((R - np.minimum(d, R)) / LEAK_RING_STEP)
+    alpha = np.where(inside, (255 * (r / R) ** 2).astype(np.int32) // 10, 0)
+
+    rgba = np.zeros((lh, lw, 4), dtype=np.uint8)
+    rgba[inside, :3] = color
+    rgba[..., 3] = alpha
+    return Image.fromarray(rgba, "RGBA").filter(ImageFilter.GaussianBlur(LEAK_BLUR_RADIUS / s))
+
+
+@lru_cache(maxsize=16)
+def leak_layer(
+    color: tuple[int, int, int],
+    size: tuple[int, int],
+    opacity: float,
+    box: tuple[int, int, int, int],
+) -> PremultipliedLayer | None:
+    """리크 좌표 box 영역을 원래 해상도로 업샘플한 premultiplied 레이어 (bbox는 리크 좌표)"""
+    x0, y0, x1, y1 = box
+    if x0 >= x1 or y0 >= y1:
+        return None
+    s = LEAK_DOWNSCALE
+    region = leak_field(color, size).resize(
+        (x1 - x0, y1 - y0), Image.Resampling.BILINEAR, box=(x0 / s, y0 / s, x1 / s, y1 / s)
+    )
+    rgba = np.array(region)
+    rgba[..., 3] = np.rint(rgba[..., 3] * opacity).astype(np.uint8)
+    premul, inv_alpha = premultiply(rgba)
+    return PremultipliedLayer(box, premul, inv_alpha)
+
+
+class LightLeak:
+    """시간에 따라 이동하는 라이트 리크 (위치 (-W + 30t, -H + 18t), move=False면 고정)"""
+
+    def __init__(
+        self,
+        dur: float,
+        size: tuple[int, int],
+        color: tuple[int, int, int] = (255, 180, 80),
+        move: bool = True,
+        opacity: float = 0.12,
+    ):
+        W, H = self.size = (int(size[0]), int(size[1]))
+        self.move = move
+        # 샷 동안 화면에 들어올 수 있는 리크 좌표 범위 (위치가 오른쪽/아래로만 이동)
+        (px0, py0), (px1, py1) = self.position(0.0), self.position(float(dur))
+        box = (max(0, -px1), max(0, -py1), min(2 * W, W - px0), min(2 * H, H - py0))
+        self.layer = leak_layer(tuple(int(c) for c in color), self.size, round(opacity, 4), box)
+        self._shape: tuple[int, int] | None = None
+
+    def position(self, t: float) -> tuple[int, int]:
+        W, H = self.size
+        if not self.move:
+            return -W, -H
+        return int(-W + t * LEAK_SPEED[0]), int(-H + t * LEAK_SPEED[1])
+
+    def apply(self, frame: np.ndarray, t: float) -> np.ndarray:
+        """frame 위에 리크를 블렌딩한 (H, W, 3) uint8 (입력은 건드리지 않음, 출력 버퍼 재사용)"""
+        h, w = frame.shape[:2]
+        if self._shape != (h, w):
+            self._shape = (h, w)
+            self._out = np.empty((h, w, 3), dtype=np.uint8)
+            self._acc = np.empty((h, w, 3), dtype=np.uint16)
+            self._tmp = np.empty((h, w, 3), dtype=np.uint16)
+        out = self._out
+        np.copyto(out, frame[..., :3], casting="unsafe")
+        if self.layer is None:
+            return out
+
+        px, py = self.position(t)
+        lx0, ly0, lx1, ly1 = self.layer.bbox
+        # 화면과 겹치는 부분 (화면 좌표)
+        cx0, cy0 = max(lx0 + px, 0), max(ly0 + py, 0)
+        cx1, cy1 = min(lx1 + px, w), min(ly1 + py, h)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return out
+        sy = slice(cy0 - py - ly0, cy1 - py - ly0)
+        sx = slice(cx0 - px - lx0, cx1 - px - lx0)
+        hh, ww = cy1 - cy0, cx1 - cx0
+        blend_premultiplied(
+            out[cy0:cy1, cx0:cx1],
+            self.layer.premul[sy, sx],
+            self.layer.inv_alpha[sy, sx],
+            self._acc[:hh, :ww],
+            self._tmp[:hh, :ww],
+        )
+        return out
@@ -0,0 +1,97 @@
+"""
+S4-4. 렌더 단위 소스 미디어 리더 풀
+같은 영상 파일을 여러 샷/레이어에서 참조해도 VideoFileClip(ffmpeg 리더 프로세스)은 렌더당 1번만 열고
+서브클립으로 나눠 쓴 뒤, 렌더가 끝나면 한 번에 닫는다.
+풀이 리더의 유일한 소유자: 내주는 클립은 리더를 떼어 낸 사본이라
+clip.close()가 ffmpeg 프로세스를 끝내지 않는다
+"""
+
+import contextlib
+from pathlib import Path
+
+from moviepy.editor import VideoFileClip
+
+from services.video_reader import CoverVideoClip
+
+
+def _detached(clip):
+    """리더 참조를 뗀 클립 사본 (프레임은 원본 리더로 계속 읽히고 close()는 리더를 닫지 않음)
+
+    moviepy의 subclip/fl/set_opacity 사본은 reader 속성을 얕게 공유하므로, 떼어 두지 않으면
+    샷 클립을 닫을 때 풀의 ffmpeg 리더까지 종료된다
+    """
+    clip.reader = None
+    return clip
+
+
+class MediaReaderPool:
+    """경로별 VideoFileClip 공유 풀 (렌더 1회 범위, with 문으로 닫기 보장)
+
+    같은 소스의 서브클립들은 리더 하나를 공유하므로 순차 재생(샷 단위 렌더)에 맞춰져 있다.
+    리더 프로세스는 release()/close()만 종료한다
+    """
+
+    def __init__(self):
+        self._readers: dict[str, VideoFileClip | CoverVideoClip] = {}
+        self.opened = 0
+        self.requests = 0
+
+    def _reader(self, key: str, open_clip):
+        self.requests += 1
+        clip = self._readers.get(key)
+        if clip is None:
+            clip = self._readers[key] = open_clip()
+            self.opened += 1
+        return clip
+
+    def video(self, path: str) -> VideoFileClip:
+        """소스 영상 (처음 요청될 때만 연다, 렌더는 무음이므로 오디오 리더는 열지 않음)"""
+        key = str(Path(path).resolve())
+        return _detached(self._reader(key, lambda: VideoFileClip(path, audio=False)).copy())
+
+    def subclip(self, path: str, t_start: float = 0, t_end: float | None = None) -> VideoFileClip:
+        """공유 리더에서 구간 서브클립 생성"""
+        key = str(Path(path).resolve())
+        reader = self._reader(key, lambda: VideoFileClip(path, audio=False))
+        return _detached(reader.subclip(t_start, t_end))
+
+    def cover_video(self, path: str, size: tuple[int, int], fps: float) -> CoverVideoClip:
+        """캔버스 크기/fps로 디코드되는 소스 영상 ((경로, 크기, fps)별 1번만 연다)"""
+        return _detached(self._cover_reader(path, size, fps).copy())
+
+    def _cover_reader(self, path: str, size: tuple[int, int], fps: float) -> CoverVideoClip:
+        key = f"{Path(path).resolve()}|{int(size[0])}x{int(size[1])}@{float(fps)}"
+        return self._reader(key, lambda: CoverVideoClip(path, size, fps))
+
+    def cover_subclip(
+        self,
+        path: str,
+        size: tuple[int, int],
+        fps: float,
+        t_start: float = 0,
+        t_end: float | None = None,
+    ) -> CoverVideoClip:
+        """디코드 단계에서 fit:cover된 공유 리더의 구간 서브클립"""
+        return _detached(self._cover_reader(path, size, fps).subclip(t_start, t_end))
+
+    def release(self, path: str) -> int:
+        """경로의 리더(모든 크기/fps 변형 포함) 닫기. 닫은 리더 수 반환 (이후 요청되면 다시 연다)"""
+        resolved = str(Path(path).resolve())
+        keys = [k for k in self._readers if k == resolved or k.startswith(f"{resolved}|")]
+        for key in keys:
+            with contextlib.suppress(Exception):
+                self._readers.pop(key).close()
+        return len(keys)
+
+    def close(self) -> None:
+        """열린 리더 전부 닫기"""
+        for clip in self._readers.values():
+            with contextlib.suppress(Exception):
+                clip.close()
+        self._readers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
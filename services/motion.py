@@ -0,0 +1,182 @@
+"""
+S4-11. 아핀 모션 엔진 (줌/팬/이징)
+레이어 motion 스펙({"zoom": 1.03, "pan": "left_to_right", "ease": "sine_in_out"})을 렌더 fps 격자의
+프레임별 2x3 아핀 행렬로 미리 계산하고,
+프레임마다 원본 소스에서 cv2.warpAffine 1번으로 출력 버퍼에 그린다
+(fit:cover 스케일도 같은 행렬에 포함되므로 프레임마다 전체 프레임을 PIL로 리샘플링하지 않는다)
+"""
+
+import math
+from typing import Any
+
+import cv2
+import numpy as np
+
+# 모션 렌더 방식이 바뀌면 올려서 세그먼트 캐시 무효화
+MOTION_ENGINE_VERSION = 1
+
+# 팬만 있고 줌이 1 이하이면 팬할 여유가 없으므로 이 배율로 고정 확대
+PAN_DEFAULT_ZOOM = 1.05
+
+# 원본이 출력보다 이 배율 이상 크면 첫 프레임에서 한 번 INTER_AREA로 줄여 둔다
+# (선형 보간 에일리어싱 방지)
+PREDOWNSCALE_RATIO = 2.0
+
+# 이징 곡선 (진행률 배열 0~1 → 0~1)
+EASINGS = {
+    "linear": lambda p: p,
+    "sine_in_out": lambda p: 0.5 - 0.5 * np.cos(np.pi * p),
+    "quad_in_out": lambda p: np.where(p < 0.5, 2 * p * p, 1 - (-2 * p + 2) ** 2 / 2),
+    "cubic_in_out": lambda p: np.where(p < 0.5, 4 * p**3, 1 - (-2 * p + 2) ** 3 / 2),
+}
+
+# 팬 기준점 (원본 여유분 안에서의 정규화 위치, -1=왼쪽/위 1=오른쪽/아래)
+PAN_ANCHORS = {
+    "center": (0.0, 0.0),
+    "left": (-1.0, 0.0),
+    "right": (1.0, 0.0),
+    "top": (0.0, -1.0),
+    "bottom": (0.0, 1.0),
+}
+
+
+def parse_pan(pan: str | None) -> tuple[tuple[float, float], tuple[float, float]]:
+    """팬 문자열 → (시작 기준점, 끝 기준점). "a_to_b" 또는 "b"(가운데 → b), 모르는 값은 가운데"""
+    if not pan:
+        return PAN_ANCHORS["center"], PAN_ANCHORS["center"]
+    start, _, end = pan.partition("_to_") if "_to_" in pan else ("center", "", pan)
+    center = PAN_ANCHORS["center"]
+    return PAN_ANCHORS.get(start, center), PAN_ANCHORS.get(end, center)
+
+
+def normalize_motion(motion: dict[str, Any], duration: float) -> dict[str, Any]:
+    """motion 스펙을 (zoom_from, zoom_to, pan_from, pan_to, ease)로 정규화
+
+    레시피 형식: zoom(끝 배율), pan, ease. 팬이 있으면 zoom 배율로 고정하고 창만 이동,
+    없으면 1 → zoom으로 줌인. 기존 type 형식(zoom-in-slow/zoom-out-slow/pan)도 같은 엔진으로 변환
+    """
+    kind = motion.get("type")
+    if kind == "zoom-in-slow":
+        motion = {"zoom_from": 1.0, "zoom": 1.0 + 0.05 * duration, "ease": "linear"}
+    elif kind == "zoom-out-slow":
+        motion = {"zoom_from": 1.2, "zoom": 1.2 - 0.05 * duration, "ease": "linear"}
+    elif kind == "pan":
+        zoom = 1.0 + max(0.05, 0.1 * float(motion.get("intensity", 0.5)))
+        motion = {"zoom": zoom, "pan": "left_to_right", "ease": "linear"}
+
+    pan_from, pan_to = parse_pan(motion.get("pan"))
+    zoom = float(motion.get("zoom", 1.0))
+    if pan_from != pan_to or pan_from != PAN_ANCHORS["center"]:
+        zoom = zoom if zoom > 1.0 else PAN_DEFAULT_ZOOM
+        zoom_from = float(motion.get("zoom_from", zoom))
+    else:
+        zoom_from = float(motion.get("zoom_from", 1.0))
+    return {
+        "zoom_from": zoom_from,
+        "zoom_to": zoom,
+        "pan_from": pan_from,
+        "pan_to": pan_to,
+        "ease": motion.get("ease", "linear") if motion.get("ease") in EASINGS else "linear",
+    }
+
+
+def has_motion(motion: dict[str, Any] | None) -> bool:
+    """실제로 움직임이 있는 스펙인지 (줌/팬 모두 없으면 False)"""
+    if not motion:
+        return False
+    spec = normalize_motion(motion, 1.0)
+    return (
+        spec["zoom_from"] != 1.0
+        or spec["zoom_to"] != 1.0
+        or spec["pan_from"] != PAN_ANCHORS["center"]
+        or spec["pan_to"] != PAN_ANCHORS["center"]
+    )
+
+
+class AffineMotion:
+    """원본(src_size) → 출력(size) 프레임별 아핀 행렬 (fps 격자로 미리 계산)"""
+
+    def __init__(
+        self,
+        motion: dict[str, Any],
+        src_size: tuple[int, int],
+        size: tuple[int, int],
+        duration: float,
+        fps: float,
+    ):
+        spec = normalize_motion(motion, duration)
+        self.size = (int(size[0]), int(size[1]))
+        self.fps = float(fps)
+        n = max(1, int(math.ceil(duration * self.fps)) + 1)
+
+        t = np.arange(n, dtype=np.float64) / self.fps
+        e = EASINGS[spec["ease"]](np.clip(t / max(duration, 1e-6), 0.0, 1.0))
+        zoom = spec["zoom_from"] + (spec["zoom_to"] - spec["zoom_from"]) * e
+        (px0, py0), (px1, py1) = spec["pan_from"], spec["pan_to"]
+        px = px0 + (px1 - px0) * e
+        py = py0 + (py1 - py0) * e
+
+        w, h = src_size
+        W, H = self.size
+        S = max(W / w, H / h) * zoom  # fit:cover × 모션 줌
+        # 출력 창이 원본 밖으로 나가지 않는 팬 범위 = 원본 여유분의 절반 (원본 좌표)
+        cx = w / 2 + px * np.maximum(w - W / S, 0.0) / 2
+        cy = h / 2 + py * np.maximum(h - H / S, 0.0) / 2
+
+        # 픽셀 중심 기준: x_dst + 0.5 = S * (x_src + 0.5 - cx) + W / 2
+        self.matrices = np.zeros((n, 2, 3), dtype=np.float64)
+        self.matrices[:, 0, 0] = S
+        self.matrices[:, 1, 1] = S
+        self.matrices[:, 0, 2] = W / 2 - 0.5 - S * (cx - 0.5)
+        self.matrices[:, 1, 2] = H / 2 - 0.5 - S * (cy - 0.5)
+        self.min_scale = float(S.min())
+
+    def matrix_at(self, t: float) -> np.ndarray:
+        i = int(round(t * self.fps))
+        return self.matrices[min(max(i, 0), len(self.matrices) - 1)]
+
+    def warp(self, frame: np.ndarray, t: float, out: np.ndarray) -> np.ndarray:
+        """원본 프레임을 시각 t의 행렬로 out 버퍼에 그리기"""
+        return cv2.warpAffine(
+            frame,
+            self.matrix_at(t),
+            self.size,
+            dst=out,
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+
+
+def motion_clip(clip, motion: dict[str, Any], size: tuple[int, int], fps: float):
+    """clip에 motion을 적용한 size 크기 클립 (출력 버퍼는 클립당 1개를 재사용)
+
+    정지 이미지(ImageClip)는 원본 해상도에서 바로 샘플링하고,
+    원본이 훨씬 크면 처음에 한 번만 줄여 둔다.
+    영상은 디코드된 프레임(이미 fit:cover된 캔버스 크기)에 줌/팬만 적용
+    """
+    from moviepy.editor import ImageClip, VideoClip
+
+    W, H = int(size[0]), int(size[1])
+    duration = float(clip.duration)
+    out = np.empty((H, W, 3), dtype=np.uint8)
+
+    if isinstance(clip, ImageClip):
+        src = np.ascontiguousarray(np.asarray(clip.get_frame(0))[:, :, :3], dtype=np.uint8)
+        engine = AffineMotion(motion, (src.shape[1], src.shape[0]), (W, H), duration, fps)
+        if engine.min_scale * PREDOWNSCALE_RATIO < 1.0:
+            # 가장 작게 보이는 순간에도 출력 픽셀당 원본 2픽셀 이상 남도록 축소
+            f = engine.min_scale * PREDOWNSCALE_RATIO
+            dsize = (max(1, round(src.shape[1] * f)), max(1, round(src.shape[0] * f)))
+            src = cv2.resize(src, dsize, interpolation=cv2.INTER_AREA)
+            engine = AffineMotion(motion, dsize, (W, H), duration, fps)
+
+        def make_frame(t):
+            return engine.warp(src, t, out)
+
+    else:
+        engine = AffineMotion(motion, tuple(clip.size), (W, H), duration, fps)
+
+        def make_frame(t):
+            return engine.warp(np.asarray(clip.get_frame(t))[:, :, :3], t, out)
+
+    return VideoClip(make_frame, duration=duration)
@@ -0,0 +1,195 @@
+"""
+S4-9. 스트리밍 QA 분석기
+인코딩 중 흘러가는 프레임을 그대로 받아 블랙/정지 프레임, 평균 밝기를 집계한다.
+출력 영상을 다시 디코드하지 않고, 프레임은 4픽셀 간격으로 샘플링해서 합성 대비 비용을 작게 유지.
+상/하단 세이프존 침범은 픽셀이 아니라 렌더러가 넘겨주는 텍스트 레이어 박스로 판정한다
+(디버그 워터마크 등 텍스트가 아닌 오버레이와 영상 속 고대비 경계는 세지 않음)
+"""
+
+import json
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# 세이프존 높이 (1920px 기준, 캔버스 높이에 비례해서 적용)
+SAFE_ZONE_PX = 250
+REFERENCE_HEIGHT = 1920
+
+# 판정 기준 (샘플링한 luma 0~255 기준)
+BLACK_LUMA = 16.0  # 평균 밝기가 이 값 미만이면 블랙 프레임
+FROZEN_DIFF = 0.5  # 이전 프레임과의 평균 절대차가 이 값 미만이면 정지 프레임
+FROZEN_RUN_LIMIT_S = 3.0  # 이보다 긴 정지 구간은 QA 경고
+BLACK_RUN_LIMIT_S = 0.5  # 이보다 긴 블랙 구간은 QA 경고 (페이드 전환의 짧은 블랙 경유는 허용)
+
+QA_SUFFIX = ".qa.json"
+
+# snapshot 형식이 바뀌면 올려서 세그먼트 캐시에 저장된 QA 집계 무효화
+QA_VERSION = 2
+
+# 텍스트 박스 (x0, y0, x1, y1), 프레임 픽셀 좌표
+Box = tuple[int, int, int, int]
+
+_LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def qa_report_path(video_path: str | Path) -> Path:
+    """영상 옆에 저장되는 QA 리포트 경로 (out.mp4 → out.qa.json)"""
+    return Path(video_path).with_suffix(QA_SUFFIX)
+
+
+def load_qa_report(video_path: str | Path) -> dict[str, Any] | None:
+    """영상의 QA 리포트 (없으면 None)"""
+    try:
+        with open(qa_report_path(video_path), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class StreamingQAAnalyzer:
+    """인코딩되는 프레임 스트림의 QA 통계 누적기 (세그먼트 결과는 snapshot()/merge()로 합산)
+
+    safe_zone_ratio는 프레임 높이 대비 상/하단 세이프존 비율 (기본값 1920px 기준 250px, 포맷별 지정)
+    """
+
+    def __init__(
+        self,
+        fps: float,
+        subsample: int = 4,
+        safe_zone_ratio: float = SAFE_ZONE_PX / REFERENCE_HEIGHT,
+    ):
+        self.fps = float(fps)
+        self.subsample = max(1, int(subsample))
+        self.safe_zone_ratio = float(safe_zone_ratio)
+        self.height = 0
+        self.frames = 0
+        self.luma_sum = 0.0
+        self.luma_min = 255.0
+        self.luma_max = 0.0
+        self.black_frames = 0
+        self.longest_black = 0
+        self.frozen_frames = 0
+        self.longest_frozen = 0
+        self.safe_zone_text_frames = 0
+        self.safe_zone_max_overlap = {"top": 0, "bottom": 0}
+        self._run = 0
+        self._black_run = 0
+        self._prev: np.ndarray | None = None
+
+    def observe(self, frame: np.ndarray, text_boxes: Sequence[Box] = ()) -> None:
+        """프레임 1장 집계 (text_boxes: 이 프레임에 보이는 텍스트 레이어 박스)"""
+        H = self.height = frame.shape[0]
+        s = self.subsample
+        luma = frame[::s, ::s, :3] @ _LUMA_WEIGHTS
+        mean = float(luma.mean())
+
+        self.frames += 1
+        self.luma_sum += mean
+        self.luma_min = min(self.luma_min, mean)
+        self.luma_max = max(self.luma_max, mean)
+        if mean < BLACK_LUMA:
+            self.black_frames += 1
+            self._black_run += 1
+            self.longest_black = max(self.longest_black, self._black_run)
+        else:
+            self._black_run = 0
+
+        prev, self._prev = self._prev, luma
+        if prev is not None and prev.shape == luma.shape:
+            if float(np.abs(luma - prev).mean()) < FROZEN_DIFF:
+                self.frozen_frames += 1
+                self._run += 1
+                self.longest_frozen = max(self.longest_frozen, self._run)
+            else:
+                self._run = 0
+
+        band = round(self.safe_zone_ratio * H)
+        invaded = False
+        for x0, y0, x1, y1 in text_boxes:
+            if x1 <= x0 or y1 <= y0:
+                continue
+            top, bottom = max(0, min(y1, band) - y0), max(0, y1 - max(y0, H - band))
+            self.safe_zone_max_overlap["top"] = max(self.safe_zone_max_overlap["top"], top)
+            self.safe_zone_max_overlap["bottom"] = max(self.safe_zone_max_overlap["bottom"], bottom)
+            invaded |= top > 0 or bottom > 0
+        if invaded:
+            self.safe_zone_text_frames += 1
+
+    def tap_clip(self, clip, text_boxes_at: Callable[[float], Sequence[Box]] | None = None):
+        """get_frame마다 프레임을 분석하는 클립으로 감싸기 (인코딩 경로에 끼워 넣는 용도)
+
+        text_boxes_at(t)는 시각 t에 보이는 텍스트 레이어 박스. clip.fl과 달리 감쌀 때 크기를 재려고
+        t=0 프레임을 미리 평가하지 않으므로 인코딩되는 프레임만 집계된다
+        """
+        get_frame = clip.get_frame
+
+        def tapped(t):
+            frame = get_frame(t)
+            self.observe(np.asarray(frame), text_boxes_at(t) if text_boxes_at else ())
+            return frame
+
+        out = clip.copy()
+        out.make_frame = tapped
+        return out
+
+    def snapshot(self) -> dict[str, Any]:
+        """프로세스 간 전달/세그먼트 캐시 저장용 원시 집계값"""
+        return {
+            "frames": self.frames,
+            "height": self.height,
+            "luma_sum": self.luma_sum,
+            "luma_min": self.luma_min,
+            "luma_max": self.luma_max,
+            "black_frames": self.black_frames,
+            "longest_black": self.longest_black,
+            "frozen_frames": self.frozen_frames,
+            "longest_frozen": self.longest_frozen,
+            "safe_zone_text_frames": self.safe_zone_text_frames,
+            "safe_zone_max_overlap": dict(self.safe_zone_max_overlap),
+        }
+
+    def merge(self, snap: dict[str, Any] | None) -> None:
+        """다른 세그먼트의 snapshot() 합산 (블랙/정지 구간은 세그먼트 경계를 넘어 잇지 않음)"""
+        if not snap or not snap.get("frames"):
+            return
+        self.frames += snap["frames"]
+        self.height = max(self.height, snap.get("height", 0))
+        self.luma_sum += snap["luma_sum"]
+        self.luma_min = min(self.luma_min, snap["luma_min"])
+        self.luma_max = max(self.luma_max, snap["luma_max"])
+        self.black_frames += snap["black_frames"]
+        self.longest_black = max(self.longest_black, snap["longest_black"])
+        self.frozen_frames += snap["frozen_frames"]
+        self.longest_frozen = max(self.longest_frozen, snap["longest_frozen"])
+        self.safe_zone_text_frames += snap["safe_zone_text_frames"]
+        for k, v in snap.get("safe_zone_max_overlap", {}).items():
+            self.safe_zone_max_overlap[k] = max(self.safe_zone_max_overlap.get(k, 0), v)
+
+    def report(self) -> dict[str, Any]:
+        """JSON 저장용 측정 결과 (시간은 초 단위)"""
+        n = max(1, self.frames)
+        longest_frozen_s = self.longest_frozen / self.fps if self.fps else 0.0
+        longest_black_s = self.longest_black / self.fps if self.fps else 0.0
+        return {
+            "frames": self.frames,
+            "fps": self.fps,
+            "luma_mean": round(self.luma_sum / n, 2),
+            "luma_min": round(self.luma_min if self.frames else 0.0, 2),
+            "luma_max": round(self.luma_max, 2),
+            "black_frames": self.black_frames,
+            "black_ratio": round(self.black_frames / n, 4),
+            "longest_black_s": round(longest_black_s, 2),
+            "frozen_frames": self.frozen_frames,
+            "longest_frozen_s": round(longest_frozen_s, 2),
+            "safe_zone_px": round(self.safe_zone_ratio * (self.height or REFERENCE_HEIGHT)),
+            "safe_zone_ratio": round(self.safe_zone_ratio, 4),
+            "safe_zone_text_frames": self.safe_zone_text_frames,
+            "safe_zone_max_overlap_px": dict(self.safe_zone_max_overlap),
+            "checks": {
+                "no_black_gap": longest_black_s <= BLACK_RUN_LIMIT_S,
+                "no_long_freeze": longest_frozen_s <= FROZEN_RUN_LIMIT_S,
+                "safe_zone_clear": self.safe_zone_text_frames == 0,
+            },
+        }
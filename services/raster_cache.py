@@ -0,0 +1,102 @@
+"""
+S4-15. 래스터 중간 결과 메모 (크기 제한 LRU)
+프리뷰 렌더에서 반복되는 블러 배경/전경 소스/자막 래스터를
+내용 키(파일 경로 + mtime, 텍스트 + 스타일 해시)로
+프로세스 안에서 재사용한다. 보관 바이트 합이 한도를 넘으면 가장 오래 안 쓴 항목부터 제거.
+저장된 배열은 읽기 전용으로 바꿔서 공유 중인 값이 수정되지 않게 한다
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+RASTER_CACHE_MB = float(os.getenv("ADGEN_RASTER_CACHE_MB", "256"))
+
+T = TypeVar("T")
+
+
+def file_key(path: str | Path) -> tuple[str, int, int]:
+    """파일 내용 키 (절대 경로, mtime_ns, 크기). 파일이 바뀌면 키도 바뀐다"""
+    p = Path(path).resolve()
+    st = p.stat()
+    return str(p), st.st_mtime_ns, st.st_size
+
+
+def style_hash(style: Any) -> str:
+    """스타일 dict 해시 (키 순서 무관, JSON으로 못 바꾸는 값은 str)"""
+    blob = json.dumps(style, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _freeze(value: Any) -> int:
+    """값 안의 배열을 읽기 전용으로 만들고 총 바이트 수 반환"""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_freeze(v) for v in value)
+    return 0
+
+
+class RasterCache:
+    """바이트 한도 LRU (get_or_create로 없을 때만 생성)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, build: Callable[[], T]) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = build()  # 생성은 잠금 밖에서 (동시에 같은 키를 만들면 나중 값이 남음)
+        size = _freeze(value)
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+        return value
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+_CACHE = RasterCache(int(RASTER_CACHE_MB * 1024 * 1024))
+
+
+def raster_cache() -> RasterCache:
+    """프로세스 공용 래스터 캐시 (Streamlit 재실행 사이에도 유지)"""
+    return _CACHE
@@ -11,16 +11,39 @@ from typing import Any
 
 import numpy as np
 from moviepy.editor import *
-from moviepy.video.fx import resize
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+from proglog import ProgressBarLogger
+
+from services.asset_manifest import get_manifest
+from services.compositor import FrameCompositor, PremultipliedLayer, flatten_layers, static_frame
+from services.ffmpeg_pipe import write_clip_ffmpeg_pipe, write_fanout_ffmpeg_pipe
+from services.media_pool import MediaReaderPool
+from services.motion import MOTION_ENGINE_VERSION, has_motion, motion_clip
+from services.qa_stream import QA_VERSION, StreamingQAAnalyzer, qa_report_path
+from services.render_profile import (
+    RENDER_PROFILE_FILENAME,
+    FrameProgressLogger,
+    RenderProfiler,
+    eta_seconds,
+)
+from services.segment_cache import SEGMENT_CACHE_DIRNAME, SegmentCache, concat_segments, segment_key
+from services.timeline import TRANSITIONS, StreamingTimelineClip, TimelineClip
+from services.video_reader import CoverVideoClip
+from utils.fonts import find_font_path, get_font
+from utils.text_layout import TEXT_LAYOUT_VERSION, layout_text
 
 
 def pil_rgba_to_clip(im_rgba: Image.Image, duration: float) -> VideoClip:
-    """PIL RGBA 이미지를 moviepy VideoClip으로 변환 (RGB+mask 분리)"""
-    # RGBA로 변환
-    rgba_array = np.array(im_rgba.convert("RGBA"))
+    """PIL RGBA 이미지를 moviepy VideoClip으로 변환 (RGB+mask 분리)
+
+    불투명 영역 bbox만 잘라서 그 위치에 놓으므로 마스크가 전체 프레임 크기가 아니다
+    (렌더 경로의 정적 오버레이는 compositor.FrameCompositor로 합성, 이 함수는 moviepy 합성용)
+    """
+    im_rgba = im_rgba.convert("RGBA")
+    bbox = im_rgba.getchannel("A").getbbox() or (0, 0, 1, 1)
 
     # RGB와 Alpha 분리
+    rgba_array = np.asarray(im_rgba.crop(bbox))
     rgb_array = rgba_array[:, :, :3]
     alpha_array = (rgba_array[:, :, 3] / 255.0).astype("float32")
 
@@ -31,7 +54,7 @@ def pil_rgba_to_clip(im_rgba: Image.Image, duration: float) -> VideoClip:
     alpha_mask = ImageClip(alpha_array, ismask=True).set_duration(duration)
 
     # 마스크 적용
-    return rgb_clip.set_mask(alpha_mask)
+    return rgb_clip.set_mask(alpha_mask).set_position(bbox[:2])
 
 
 # 9:16 모바일 비디오 설정
@@ -39,6 +62,52 @@ MOBILE_WIDTH = 1080
 MOBILE_HEIGHT = 1920
 MOBILE_FPS = 30
 
+# 샷 간 기본 전환(페이드) 길이(초)
+TRANSITION_FADE = 0.5
+
+# 이름 위치(center/top/bottom) 텍스트의 줄바꿈 폭 (캔버스 너비 대비)
+TEXT_MAX_WIDTH_RATIO = 0.9
+
+# 병렬 렌더 워커 수 기본값 (렌더 서버에서는 코어 수에 맞춰 환경변수로 지정)
+DEFAULT_RENDER_WORKERS = int(os.getenv("ADGEN_RENDER_WORKERS", "1"))
+
+# 인코더 백엔드: moviepy write_videofile / ffmpeg rawvideo 파이프 직접 전송
+RENDER_BACKENDS = ("moviepy", "ffmpeg_pipe")
+
+# 렌더 품질: final(출고용) / draft(타이밍 확인용 저해상도·저fps 미리보기)
+RENDER_QUALITIES = ("final", "draft")
+DRAFT_SCALE = float(os.getenv("ADGEN_DRAFT_SCALE", "0.5"))  # 해상도 배율
+DRAFT_FPS_SCALE = float(os.getenv("ADGEN_DRAFT_FPS_SCALE", "0.5"))  # fps 배율
+
+# 출력 포맷별 캔버스와 리프레임 규칙 (9:16 마스터 합성 결과에서 크롭/스케일만으로 만든다)
+# crop: 목표 비율 창을 마스터에서 잘라 스케일 (anchor_y: 창의 세로 위치, 0=위 0.5=가운데 1=아래)
+# fit: 마스터 전체를 목표 캔버스 안에 맞추고 여백은 pad_color (가로 포맷은 크롭하면 대부분이 잘림)
+# safe_zone: 포맷별 상/하단 세이프존 높이 비율 (QA 검사용, 피드 포맷은 UI가 가리는 영역이 작음)
+MASTER_FORMAT = "9:16"
+OUTPUT_FORMATS = {
+    "9:16": {"size": (1080, 1920), "mode": "crop", "anchor_y": 0.5, "safe_zone": 250 / 1920},
+    "4:5": {"size": (1080, 1350), "mode": "crop", "anchor_y": 0.5, "safe_zone": 0.06},
+    "1:1": {"size": (1080, 1080), "mode": "crop", "anchor_y": 0.5, "safe_zone": 0.05},
+    "16:9": {"size": (1920, 1080), "mode": "fit", "pad_color": "black", "safe_zone": 0.05},
+}
+
+# 디버그 워터마크/정보 오버레이 표시 여부 기본값 (출고 렌더에서는 ADGEN_DEBUG_OVERLAYS=0)
+DEBUG_OVERLAYS = os.getenv("ADGEN_DEBUG_OVERLAYS", "1") == "1"
+
+# 출력 결과에 영향이 없는 인코딩 설정 (세그먼트 캐시 키에서 제외)
+RUNTIME_ONLY_SETTINGS = ("threads", "logger")
+
+# 레이어가 없는 기존 형식 샷에서 베이스로 쓰는 자산 키 (우선순위 순)
+LEGACY_BASE_ASSET_KEYS = [
+    "product_shot",
+    "store_exterior",
+    "brand_logo",
+    "product",
+    "store",
+    "broll1",
+    "broll2",
+]
+
 
 def fit_cover(clip: VideoClip, size: tuple) -> VideoClip:
     """fit:cover 효과 적용 (화면을 완전히 채우도록 크롭)"""
@@ -68,71 +137,106 @@ def shot_duration(s):
     return b - a
 
 
-def text_clip_pil(
+def text_image_pil(
     text,
     size=(1080, 1920),
     fontsize=64,
     color="white",
     font_path=None,
     bg=(0, 0, 0, 0),
-    duration=2,
     pos="center",
-):
-    """PIL을 사용한 텍스트 클립 생성 (ImageMagick 의존성 제거)"""
+) -> Image.Image:
+    """PIL로 텍스트 RGBA 이미지 생성 (캔버스 크기 전체)
+
+    이름 위치(center/top/bottom)는 캔버스 너비의 TEXT_MAX_WIDTH_RATIO 안에서 줄바꿈해 가운데 정렬,
+    좌표 위치는 줄바꿈 없이 왼쪽 정렬
+    """
     img = Image.new("RGBA", size, bg)
     draw = ImageDraw.Draw(img)
-    try:
-        font = ImageFont.truetype(font_path or "arial.ttf", fontsize)
-    except:
-        font = ImageFont.load_default()
-    bbox = draw.textbbox((0, 0), text, font=font)
-    w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    font, layout, (x, y) = _text_placement(text, size, fontsize, font_path, pos)
+    draw.multiline_text(
+        (x, y), layout.text, font=font, fill=color, spacing=layout.spacing, align=layout.align
+    )
+    return img
+
+
+def _text_placement(text, size, fontsize, font_path, pos):
+    """text_image_pil의 (폰트, 레이아웃, 그리기 원점)"""
+    font = get_font(font_path or "arial.ttf", fontsize)
+    if isinstance(pos, str):
+        layout = layout_text(text, font, size[0] * TEXT_MAX_WIDTH_RATIO, align="center")
+    else:
+        layout = layout_text(text, font)
+    w, h = layout.size
 
     if pos == "center":
-        x, y = (size[0] - w) // 2, (size[1] - h) // 2
+        xy = (size[0] - w) // 2, (size[1] - h) // 2
     elif pos == "top":
-        x, y = (size[0] - w) // 2, 50
+        xy = (size[0] - w) // 2, 50
     elif pos == "bottom":
-        x, y = (size[0] - w) // 2, size[1] - h - 50
+        xy = (size[0] - w) // 2, size[1] - h - 50
     else:
-        x, y = pos
+        xy = tuple(pos)
+    return font, layout, xy
+
 
-    draw.text((x, y), text, font=font, fill=color)
+def text_box(
+    text, size=(1080, 1920), fontsize=64, font_path=None, pos="center"
+) -> tuple[int, int, int, int]:
+    """text_image_pil이 그리는 글자의 캔버스 좌표 박스 (x0, y0, x1, y1), 래스터 없이 계산"""
+    _, layout, (x, y) = _text_placement(text, size, fontsize, font_path, pos)
+    left, top, right, bottom = layout.bbox
+    return x + left, y + top, x + right, y + bottom
+
+
+def text_clip_pil(
+    text,
+    size=(1080, 1920),
+    fontsize=64,
+    color="white",
+    font_path=None,
+    bg=(0, 0, 0, 0),
+    duration=2,
+    pos="center",
+):
+    """PIL을 사용한 텍스트 클립 생성 (ImageMagick 의존성 제거)"""
+    img = text_image_pil(text, size, fontsize, color, font_path, bg, pos)
     # 기존 방식 대신 새로운 RGBA 변환 유틸 사용
     return pil_rgba_to_clip(img, duration)
 
 
-def load_assets_from_directory(assets_dir: str) -> dict[str, str]:
-    """자산 디렉토리에서 파일들을 로드"""
-    assets = {}
-    assets_path = Path(assets_dir)
+def flatten_static_overlays(
+    images: list[Image.Image], size: tuple[int, int]
+) -> PremultipliedLayer | None:
+    """샷 안에서 변하지 않는 RGBA 오버레이들을 1장으로 평탄화
+
+    불투명 영역 bbox로 크롭하고 premultiplied RGB + (255-alpha)로 저장해서
+    프레임마다 덮인 픽셀만 정수 연산으로 블렌딩할 수 있게 한다. 오버레이가 비어 있으면 None
+    """
+    return flatten_layers(images, size)
 
-    if not assets_path.exists():
-        return assets
 
-    # 이미지 파일들
-    for img_file in assets_path.glob("images/*"):
-        if img_file.suffix.lower() in [".png", ".jpg", ".jpeg"]:
-            assets[img_file.stem] = str(img_file)
+def apply_static_overlay(clip: VideoClip, overlay: PremultipliedLayer | None) -> VideoClip:
+    """평탄화된 오버레이를 bbox 영역에만 블렌딩 (합성 버퍼는 클립별로 1번만 할당)"""
+    if overlay is None:
+        return clip
+    return clip.fl_image(FrameCompositor(clip.size, [overlay]).composite)
 
-    # 비디오 파일들
-    for vid_file in assets_path.glob("videos/*"):
-        if vid_file.suffix.lower() in [".mp4", ".mov", ".avi"]:
-            assets[vid_file.stem] = str(vid_file)
 
-    # 텍스트 파일들
-    for txt_file in assets_path.glob("texts/*"):
-        if txt_file.suffix.lower() in [".txt"]:
-            with open(txt_file, encoding="utf-8") as f:
-                assets[txt_file.stem] = f.read().strip()
+def load_assets_from_directory(assets_dir: str) -> dict[str, str]:
+    """자산 디렉토리의 자산 맵 (자산 키 → 파일 경로, 텍스트는 내용)
 
-    return assets
+    asset_manifest.json 인덱스를 증분 갱신해서 읽으므로 바뀐 파일만 다시 해시/probe한다
+    """
+    if not Path(assets_dir).exists():
+        return {}
+    return get_manifest(assets_dir, refresh=True).asset_map()
 
 
 def create_text_clip(
     text_data: dict[str, Any], width: int = MOBILE_WIDTH, height: int = MOBILE_HEIGHT
-) -> TextClip:
-    """텍스트 클립 생성 (볼드+외곽선+슬라이드)"""
+) -> VideoClip:
+    """텍스트 클립 생성 (볼드+외곽선, PIL 기반으로 화면 너비의 90% 안에서 줄바꿈)"""
 
     content = text_data.get("content", "")
     start_time = text_data.get("t", 0)
@@ -143,23 +247,30 @@ def create_text_clip(
     font_size = text_data.get("font_size", 72)
     font_color = text_data.get("color", "white")
     stroke_color = text_data.get("stroke_color", "black")
-    stroke_width = text_data.get("stroke_width", 3)
-
-    # 텍스트 클립 생성
-    text_clip = (
-        TextClip(
-            content,
-            font="Arial-Bold",  # Pretendard-Bold 대신 Arial-Bold 사용
-            fontsize=font_size,
-            color=font_color,
-            stroke_color=stroke_color,
-            stroke_width=stroke_width,
-            method="caption",
-            size=(width * 0.9, None),  # 화면 너비의 90% 사용
-        )
-        .set_start(start_time)
-        .set_duration(duration)
+    stroke_width = int(text_data.get("stroke_width", 3))
+    font = get_font(find_font_path(text_data.get("font")), font_size)
+
+    # 외곽선까지 들어가는 박스에 렌더
+    layout = layout_text(
+        content or " ",
+        font,
+        width * TEXT_MAX_WIDTH_RATIO,
+        align="center",
+        stroke_width=stroke_width,
     )
+    left, top, right, bottom = layout.bbox
+    img = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(img).multiline_text(
+        (-left, -top),
+        layout.text,
+        font=font,
+        fill=font_color,
+        stroke_width=stroke_width,
+        stroke_fill=stroke_color,
+        spacing=layout.spacing,
+        align=layout.align,
+    )
+    text_clip = pil_rgba_to_clip(img, duration).set_start(start_time)
 
     # 위치 설정
     if position == "center":
@@ -172,65 +283,69 @@ def create_text_clip(
     return text_clip
 
 
-def create_placeholder_clip(duration: float, color: str = "#141414", text: str = "") -> VideoClip:
-    """플레이스홀더 클립 생성 (단색+텍스트, PIL 기반)"""
+def create_placeholder_clip(
+    duration: float, color: str = "#141414", text: str = "", size: tuple[int, int] | None = None
+) -> VideoClip:
+    """플레이스홀더 클립 생성 (단색+텍스트, PIL 기반). size 기본값은 9:16 모바일 캔버스"""
+    W, H = size or (MOBILE_WIDTH, MOBILE_HEIGHT)
 
     if text:
         # PIL 기반으로 텍스트가 포함된 클립 생성
         try:
-            # PIL 기반으로 RGBA 이미지 생성 후 pil_rgba_to_clip 사용
-            img = Image.new("RGBA", (MOBILE_WIDTH, MOBILE_HEIGHT), color)
+            # 불투명 배경이므로 마스크 없는 RGB 정지 프레임으로
+            img = Image.new("RGBA", (W, H), color)
             draw = ImageDraw.Draw(img)
-            try:
-                font = ImageFont.truetype("arial.ttf", 48)
-            except:
-                font = ImageFont.load_default()
+            font = get_font("arial.ttf", max(8, round(48 * H / MOBILE_HEIGHT)))
 
             bbox = draw.textbbox((0, 0), text, font=font)
             w, h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            x, y = (MOBILE_WIDTH - w) // 2, (MOBILE_HEIGHT - h) // 2
+            x, y = (W - w) // 2, (H - h) // 2
             draw.text((x, y), text, font=font, fill="white")
 
-            return pil_rgba_to_clip(img, duration)
+            return ImageClip(np.asarray(img.convert("RGB"))).set_duration(duration)
         except Exception as e:
             print(f"PIL 텍스트 실패, 단색으로 대체: {e}")
             # PIL 실패 시 단색 클립만 반환
             pass
 
     # 텍스트가 없거나 PIL 실패 시 단색 클립
-    return ColorClip(size=(MOBILE_WIDTH, MOBILE_HEIGHT), color=color, duration=duration)
-
-
-def apply_motion_effects(clip: VideoClip, motion: dict[str, Any]) -> VideoClip:
-    """모션 효과 적용 (줌/팬/틸트)"""
-
-    motion_type = motion.get("type", "static")
-    intensity = motion.get("intensity", 0.0)
+    return ColorClip(size=(W, H), color=color, duration=duration)
 
-    if motion_type == "zoom-in-slow":
-        # 천천히 줌인
-        def zoom_func(t):
-            return 1 + 0.05 * t
 
-        clip = clip.fx(resize, zoom_func)
-
-    elif motion_type == "zoom-out-slow":
-        # 천천히 줌아웃
-        def zoom_func(t):
-            return 1.2 - 0.05 * t
+def apply_motion_effects(
+    clip: VideoClip,
+    motion: dict[str, Any],
+    size: tuple[int, int] | None = None,
+    fps: float = MOBILE_FPS,
+) -> VideoClip:
+    """모션 효과 적용 (줌/팬/이징, 기존 type 형식 포함). 프레임마다 cv2.warpAffine 1번
 
-        clip = clip.fx(resize, zoom_func)
+    size를 주면 fit:cover까지 같은 변환으로 처리 (기본값은 클립 크기 유지)
+    """
+    if not has_motion(motion):
+        return clip
+    return motion_clip(clip, motion, tuple(size or clip.size), fps)
 
-    elif motion_type == "pan":
-        # 팬 효과
-        pan_intensity = intensity * 0.1
 
-        def pan_func(t):
-            return (pan_intensity * t, 0)
+def _open_video(
+    path: str,
+    dur: float,
+    size: tuple[int, int],
+    media_pool: MediaReaderPool | None = None,
+    fps: float = MOBILE_FPS,
+) -> VideoClip:
+    """영상 소스의 [0, dur) 서브클립을 size(fit:cover)/fps로 디코드 (풀이 있으면 공유 리더 사용)"""
+    if media_pool is not None:
+        return media_pool.cover_subclip(path, size, fps, 0, dur)
+    return CoverVideoClip(path, size, fps).subclip(0, dur)
 
-        clip = clip.set_position(pan_func)
 
-    return clip
+def _label_placeholder(
+    text: str, size: tuple[int, int], fontsize: int, duration: float
+) -> VideoClip:
+    """밝은 회색 배경 + 빨간 안내 문구 정지 클립 (누락/로드 실패 자산 자리)"""
+    label = text_image_pil(text, size=size, fontsize=fontsize, color="red")
+    return ImageClip(static_frame(size, (245, 245, 245), [label])).set_duration(duration)
 
 
 def _clip_from_layer(
@@ -240,14 +355,15 @@ def _clip_from_layer(
     H: int = 1920,
     default_dur: float = 2.0,
     diag: dict | None = None,
+    media_pool: MediaReaderPool | None = None,
+    fps: float = MOBILE_FPS,
 ) -> VideoClip:
-    """레이어에서 클립 생성 (진단 정보 수집)"""
-    from moviepy.editor import ColorClip, CompositeVideoClip
-
+    """레이어에서 클립 생성 (진단 정보 수집, media_pool이 있으면 영상 리더 공유)"""
     kind = layer.get("type")
     ref = layer.get("ref")
     dur = float(layer.get("dur", default_dur))
     dur = max(0.2, dur)  # 최소 0.2초
+    label_fontsize = max(8, round(50 * H / MOBILE_HEIGHT))
 
     if kind in ("video", "image"):
         path = assets.get(ref)
@@ -256,30 +372,27 @@ def _clip_from_layer(
                 diag["missing"].add(ref or "<empty-ref>")
                 diag["reasons"].append(f"missing asset for ref={ref}")
             # 플레이스홀더 생성하여 진행 (PIL 기반)
-            bg = ColorClip((W, H), color=(245, 245, 245), duration=dur)
-            txt = text_clip_pil(
-                f"Missing: {ref}", size=(W, H), fontsize=50, color="red", duration=dur
-            )
-            return CompositeVideoClip([bg, txt])
+            return _label_placeholder(f"Missing: {ref}", (W, H), label_fontsize, dur)
 
         # 실제 파일을 여는 로직
         try:
+            motion = layer.get("motion")
             if path.lower().endswith((".mp4", ".mov", ".avi")):
-                clip = VideoFileClip(path).subclip(0, min(dur, 10))
-                clip = fit_cover(clip, (W, H))  # fit:cover 강제 적용
+                # ffmpeg 필터로 fit:cover + fps 변환된 프레임을 바로 받음
+                clip = _open_video(path, min(dur, 10), (W, H), media_pool, fps)
             else:
                 clip = ImageClip(path).set_duration(dur)
-                clip = fit_cover(clip, (W, H))  # fit:cover 강제 적용
+                if not has_motion(motion):
+                    clip = fit_cover(clip, (W, H))  # fit:cover 강제 적용
+            if has_motion(motion):
+                # 줌/팬(+이미지는 fit:cover)을 원본에서 아핀 변환 1번으로
+                clip = apply_motion_effects(clip, motion, (W, H), fps)
             return clip
         except Exception as e:
             if diag is not None:
                 diag["reasons"].append(f"failed to load {ref}: {str(e)}")
             # 실패 시 플레이스홀더 (PIL 기반)
-            bg = ColorClip((W, H), color=(245, 245, 245), duration=dur)
-            txt = text_clip_pil(
-                f"Error: {ref}", size=(W, H), fontsize=50, color="red", duration=dur
-            )
-            return CompositeVideoClip([bg, txt])
+            return _label_placeholder(f"Error: {ref}", (W, H), label_fontsize, dur)
 
     elif kind == "text":
         txt = layer.get("text", "").strip()
@@ -322,16 +435,144 @@ def _clip_from_layer(
         return None
 
 
+def _shot_text_specs(
+    shot: dict[str, Any], size: tuple[int, int], safe_mode: bool = False
+) -> list[dict[str, Any]]:
+    """샷 텍스트 레이어별 text_image_pil/text_box 인자 (Safe Mode에서는 없음)"""
+    if safe_mode:
+        return []
+    fontsize = max(8, round(64 * size[1] / MOBILE_HEIGHT))
+    return [
+        {"text": layer.get("text", ""), "size": size, "fontsize": fontsize, "pos": "center"}
+        for layer in shot.get("layers", [])
+        if layer.get("type") == "text"
+    ]
+
+
+def shot_text_images(
+    shot: dict[str, Any], size: tuple[int, int], safe_mode: bool = False
+) -> list[Image.Image]:
+    """샷 텍스트 레이어들의 캔버스 크기 RGBA 이미지 (Safe Mode에서는 없음)"""
+    images = []
+    for spec in _shot_text_specs(shot, size, safe_mode):
+        try:
+            images.append(text_image_pil(**spec, color="white"))
+        except Exception as e:
+            print(f"shot#{shot.get('idx', 0)} text layer skipped: {e}")
+    return images
+
+
+def shot_text_boxes(
+    shot: dict[str, Any], size: tuple[int, int], safe_mode: bool = False
+) -> list[tuple[int, int, int, int]]:
+    """샷 텍스트 레이어들의 캔버스 좌표 박스 (QA 세이프존 판정용, 디버그 오버레이 제외)"""
+    boxes = []
+    for spec in _shot_text_specs(shot, size, safe_mode):
+        try:
+            boxes.append(text_box(**spec))
+        except Exception:
+            continue
+    return boxes
+
+
+def window_boxes(
+    boxes: list[tuple[int, int, int, int]], window: tuple[int, int, int, int]
+) -> list[tuple[int, int, int, int]]:
+    """캔버스 박스들을 포맷 영역 (x, y, w, h) 기준 좌표로 (영역 밖으로 나간 부분은 잘라냄)"""
+    x, y, w, h = window
+    out = []
+    for x0, y0, x1, y1 in boxes:
+        box = (max(x0 - x, 0), max(y0 - y, 0), min(x1 - x, w), min(y1 - y, h))
+        if box[2] > box[0] and box[3] > box[1]:
+            out.append(box)
+    return out
+
+
+def shot_debug_images(
+    shot: dict[str, Any],
+    assets: dict[str, str],
+    size: tuple[int, int],
+    safe_mode: bool = False,
+) -> list[Image.Image]:
+    """샷 디버그 워터마크(좌상단 샷 번호/구간)와 정보(우하단 레이어/자산 수) 이미지"""
+    start_time, end_time = shot_bounds(shot)
+    duration = shot_duration(shot)
+    if duration <= 0:
+        duration = 2.0
+    shot_idx = shot.get("idx", 0)
+    layers = shot.get("layers", [])
+
+    if not layers:
+        debug_text = f"SHOT {shot_idx}\n{start_time:.1f}s-{end_time:.1f}s\n{duration:.1f}s"
+        info_text = f"Legacy Mode\nAssets: {len(assets)}"
+        colors = ("yellow", "cyan")
+    else:
+        mode_indicator = "SAFE MODE" if safe_mode else "NORMAL"
+        debug_text = (
+            f"SHOT {shot_idx} [{mode_indicator}]\n{start_time:.1f}s-{end_time:.1f}s\n{duration:.1f}s"
+        )
+        overlay_kinds = ("text", "solid", "vignette", "grain", "glow")
+        overlay_count = (
+            0 if safe_mode else sum(1 for layer in layers if layer.get("type") in overlay_kinds)
+        )
+        info_text = f"Layers: {len(layers)}\nOverlays: {overlay_count}\nAssets: {len(assets)}"
+        colors = ("green", "lime") if safe_mode else ("yellow", "cyan")
+
+    return [
+        # 반투명 검은 배경
+        text_image_pil(
+            debug_text, size=size, fontsize=60, color=colors[0], bg=(0, 0, 0, 128), pos=(40, 40)
+        ),
+        text_image_pil(
+            info_text,
+            size=size,
+            fontsize=40,
+            color=colors[1],
+            bg=(0, 0, 0, 128),
+            pos=(size[0] - 200, size[1] - 100),
+        ),
+    ]
+
+
+def shot_text_overlay(
+    shot: dict[str, Any],
+    size: tuple[int, int],
+    safe_mode: bool = False,
+    debug_assets: dict[str, str] | None = None,
+) -> PremultipliedLayer | None:
+    """샷 텍스트 레이어를 평탄화한 오버레이 (그릴 것이 없으면 None)
+
+    debug_assets를 넘기면 디버그 워터마크/정보를 텍스트 위에 얹는다 (build_shot_clip과 같은 순서)
+    """
+    images = shot_text_images(shot, size, safe_mode)
+    if debug_assets is not None:
+        images += shot_debug_images(shot, debug_assets, size, safe_mode)
+    return flatten_static_overlays(images, size)
+
+
 def build_shot_clip(
     shot: dict[str, Any],
     assets: dict[str, str],
     progress_cb: Callable | None = None,
     safe_mode: bool = False,
+    debug_overlays: bool | None = None,
+    media_pool: MediaReaderPool | None = None,
+    size: tuple[int, int] | None = None,
+    fps: float = MOBILE_FPS,
+    include_text: bool = True,
 ) -> VideoClip:
-    """샷 클립 빌드 (디버그 워터마크 + 안전한 합성 순서)"""
+    """샷 클립 빌드 (디버그 워터마크 + 안전한 합성 순서)
+
+    텍스트/디버그 오버레이는 샷 안에서 변하지 않으므로 1장으로 평탄화해서 베이스 위에
+    bbox 영역만 블렌딩한다. debug_overlays=False면 디버그 워터마크/정보 오버레이 생략 (출고용)
+    media_pool을 넘기면 같은 영상 소스를 렌더 내에서 한 번만 연다 (닫기는 풀 소유자 책임)
+    size/fps로 캔버스 크기와 영상 디코드 fps 지정 (기본값 1080x1920, MOBILE_FPS. 드래프트 렌더용)
+    include_text=False면 텍스트 레이어를 빼고 빌드 (변형 렌더에서 shot_text_overlay로 따로 합성)
+    """
+    if debug_overlays is None:
+        debug_overlays = DEBUG_OVERLAYS
 
     # 새로운 유틸리티 함수 사용 (t 또는 in/out 호환)
-    start_time, end_time = shot_bounds(shot)
     duration = shot_duration(shot)
 
     # 최소 길이 보장
@@ -339,22 +580,14 @@ def build_shot_clip(
         duration = 2.0
 
     shot_idx = shot.get("idx", 0)
-    size = (MOBILE_WIDTH, MOBILE_HEIGHT)
+    size = tuple(size or (MOBILE_WIDTH, MOBILE_HEIGHT))
 
     # 레이어 처리
     layers = shot.get("layers", [])
     if not layers:
         # 기존 형식 지원 - 단순한 자산 로드
         video_asset = None
-        for asset_key in [
-            "product_shot",
-            "store_exterior",
-            "brand_logo",
-            "product",
-            "store",
-            "broll1",
-            "broll2",
-        ]:
+        for asset_key in LEGACY_BASE_ASSET_KEYS:
             if asset_key in assets:
                 video_asset = assets[asset_key]
                 break
@@ -362,56 +595,33 @@ def build_shot_clip(
         if video_asset and os.path.exists(video_asset):
             try:
                 if video_asset.lower().endswith((".mp4", ".mov", ".avi")):
-                    base = VideoFileClip(video_asset).subclip(0, min(duration, 10))
+                    # 디코드 단계에서 fit:cover 적용됨
+                    base = _open_video(video_asset, min(duration, 10), size, media_pool, fps)
                 else:
-                    base = ImageClip(video_asset).set_duration(duration)
-                base = fit_cover(base, size).set_opacity(1)  # fit:cover 강제 적용
+                    base = fit_cover(ImageClip(video_asset).set_duration(duration), size)
+                base = base.set_opacity(1)
             except Exception as e:
                 print(f"자산 로드 실패: {e}")
                 base = create_placeholder_clip(
-                    duration, "#1a1a1a", f"자산 로드 실패: {video_asset}"
+                    duration, "#1a1a1a", f"자산 로드 실패: {video_asset}", size
                 )
         else:
-            base = create_placeholder_clip(duration, "#141414", f"샷 {shot_idx + 1}")
+            base = create_placeholder_clip(duration, "#141414", f"샷 {shot_idx + 1}", size)
 
-        # 강화된 디버그 워터마크 추가
-        debug_text = f"SHOT {shot_idx}\n{start_time:.1f}s-{end_time:.1f}s\n{duration:.1f}s"
-        debug_overlay = text_clip_pil(
-            debug_text,
-            size=size,
-            fontsize=60,
-            color="yellow",
-            bg=(0, 0, 0, 128),  # 반투명 검은 배경
-            duration=duration,
-            pos=(40, 40),
-        )
-
-        # 추가 디버그 정보 (우측 하단)
-        info_text = f"Legacy Mode\nAssets: {len(assets)}"
-        info_overlay = text_clip_pil(
-            info_text,
-            size=size,
-            fontsize=40,
-            color="cyan",
-            bg=(0, 0, 0, 128),
-            duration=duration,
-            pos=(size[0] - 200, size[1] - 100),
-        )
-
-        return CompositeVideoClip([base, debug_overlay, info_overlay], size=size).set_duration(
-            duration
-        )
+        overlay_images = shot_debug_images(shot, assets, size, safe_mode) if debug_overlays else []
+        base = _ensure_canvas(base, size).set_duration(duration)
+        return apply_static_overlay(base, flatten_static_overlays(overlay_images, size))
 
     # 새로운 레시피 형식 처리
     diagnostics = {"missing": set(), "reasons": []}
     base_clip = None
-    overlays = []
+    overlay_images = []
 
     # 1. 베이스 비디오/이미지 레이어 찾기 (반드시 첫 번째)
     for layer in layers:
         if layer.get("type") in ("video", "image"):
             layer_clip = _clip_from_layer(
-                layer, assets, MOBILE_WIDTH, MOBILE_HEIGHT, duration, diagnostics
+                layer, assets, size[0], size[1], duration, diagnostics, media_pool, fps
             )
             if layer_clip is not None:
                 base_clip = layer_clip.set_opacity(1)  # 알파 처리 안전장치
@@ -419,67 +629,28 @@ def build_shot_clip(
 
     # 베이스 클립이 없으면 플레이스홀더 생성
     if base_clip is None:
-        base_clip = create_placeholder_clip(duration, "#141414", f"샷 {shot_idx + 1}")
+        base_clip = create_placeholder_clip(duration, "#141414", f"샷 {shot_idx + 1}", size)
 
     # 2. 오버레이 레이어들 처리 (Safe Mode에서는 건너뛰기)
-    if not safe_mode:
-        for layer in layers:
-            layer_type = layer.get("type")
-            if layer_type == "text":
-                try:
-                    text_clip = text_clip_pil(
-                        layer.get("text", ""),
-                        size=size,
-                        fontsize=64,
-                        color="white",
-                        duration=duration,
-                        pos="center",
-                    )
-                    overlays.append(text_clip)
-                except Exception as e:
-                    print(f"shot#{shot_idx} text layer skipped: {e}")
+    if include_text:
+        overlay_images.extend(shot_text_images(shot, size, safe_mode))
 
-    # 3. 강화된 디버그 워터마크 추가 (무조건)
-    mode_indicator = "SAFE MODE" if safe_mode else "NORMAL"
-    debug_text = (
-        f"SHOT {shot_idx} [{mode_indicator}]\n{start_time:.1f}s-{end_time:.1f}s\n{duration:.1f}s"
-    )
-    debug_overlay = text_clip_pil(
-        debug_text,
-        size=size,
-        fontsize=60,
-        color="yellow" if not safe_mode else "green",
-        bg=(0, 0, 0, 128),  # 반투명 검은 배경
-        duration=duration,
-        pos=(40, 40),
-    )
-    overlays.append(debug_overlay)
+    # 3. 디버그 워터마크/정보는 항상 맨 위에
+    if debug_overlays:
+        overlay_images.extend(shot_debug_images(shot, assets, size, safe_mode))
 
-    # 4. 추가 디버그 정보 (우측 하단)
-    overlay_count = (
-        len([l for l in layers if l.get("type") in ("text", "solid", "vignette", "grain", "glow")])
-        if not safe_mode
-        else 0
-    )
-    info_text = f"Layers: {len(layers)}\nOverlays: {overlay_count}\nAssets: {len(assets)}"
-    info_overlay = text_clip_pil(
-        info_text,
-        size=size,
-        fontsize=40,
-        color="cyan" if not safe_mode else "lime",
-        bg=(0, 0, 0, 128),
-        duration=duration,
-        pos=(size[0] - 200, size[1] - 100),
-    )
-    overlays.append(info_overlay)
+    # 4. 안전한 합성 순서: 베이스 위에 평탄화된 오버레이 1장 (bbox 영역만 블렌딩)
+    if not overlay_images:
+        return base_clip
+    base_clip = _ensure_canvas(base_clip, size).set_duration(duration)
+    return apply_static_overlay(base_clip, flatten_static_overlays(overlay_images, size))
 
-    # 4. 안전한 합성 순서: [베이스, *오버레이들] - base가 반드시 첫 번째
-    all_layers = [base_clip] + overlays
-    if len(all_layers) == 1:
-        return all_layers[0]
-    else:
-        # base가 첫 번째임을 보장하고 size 강제 설정
-        return CompositeVideoClip(all_layers, size=size).set_duration(duration)
+
+def _ensure_canvas(clip: VideoClip, size: tuple[int, int]) -> VideoClip:
+    """클립이 캔버스 크기와 다르면 검은 캔버스 왼쪽 위에 놓기 (베이스 클립용, 마스크는 버림)"""
+    if tuple(clip.size) == tuple(size):
+        return clip
+    return clip.set_mask(None).fl_image(FrameCompositor(size).composite)
 
 
 def create_transition_effect(
@@ -498,14 +669,799 @@ def create_transition_effect(
     return concatenate_videoclips([clip1, clip2], method="compose")
 
 
+def shot_asset_paths(shot: dict[str, Any], assets: dict[str, str]) -> list[str | None]:
+    """샷이 실제로 참조하는 자산 파일 경로 목록 (build_shot_clip의 해석 규칙과 동일)"""
+    layers = shot.get("layers", [])
+    if not layers:
+        for asset_key in LEGACY_BASE_ASSET_KEYS:
+            if asset_key in assets:
+                return [assets[asset_key]]
+        return []
+    return [
+        assets.get(layer.get("ref"))
+        for layer in layers
+        if layer.get("type") in ("video", "image")
+    ]
+
+
+def encode_settings(recipe: dict[str, Any]) -> dict[str, Any]:
+    """레시피 스타일에 맞는 write_videofile 인코딩 설정"""
+    # Serene Minimal Gold 스타일이면 고품질 설정
+    if recipe.get("style", "") == "serene_minimal_gold":
+        bg_color = recipe.get("canvas", {}).get("bg_color", "E9E3D9").replace("#", "")
+        return {
+            "fps": MOBILE_FPS,
+            "codec": "libx264",
+            "audio": False,
+            "preset": "slow",  # 고품질 프리셋
+            "bitrate": "6M",  # 높은 비트레이트
+            "ffmpeg_params": [
+                "-profile:v",
+                "high",
+                "-pix_fmt",
+                "yuv420p",
+                "-crf",
+                "18",  # 고품질 CRF
+                "-movflags",
+                "+faststart",
+                "-vf",
+                f"scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:color={bg_color},format=yuv420p",
+            ],
+            "threads": 4,
+            "logger": None,
+        }
+    # 기본 설정
+    return {
+        "fps": MOBILE_FPS,
+        "codec": "libx264",
+        "audio": False,
+        "bitrate": "4M",
+        "preset": "medium",
+        "threads": 4,
+        "logger": None,
+    }
+
+
+def draft_canvas(scale: float = DRAFT_SCALE) -> tuple[int, int]:
+    """드래프트 캔버스 크기 (9:16 유지, yuv420p 인코딩을 위해 짝수로 맞춤)"""
+    scale = min(1.0, max(0.1, scale))
+    return (
+        max(2, round(MOBILE_WIDTH * scale / 2) * 2),
+        max(2, round(MOBILE_HEIGHT * scale / 2) * 2),
+    )
+
+
+def draft_encode_settings(
+    settings: dict[str, Any], fps_scale: float = DRAFT_FPS_SCALE
+) -> dict[str, Any]:
+    """최종 인코딩 설정을 드래프트용으로 변환 (ultrafast, 낮은 fps/비트레이트)
+
+    스타일별 ffmpeg_params(-vf 1080x1920 패딩, -crf 등)는 드래프트 캔버스와 맞지 않으므로 버린다
+    """
+    return {
+        "fps": max(1, round(settings.get("fps", MOBILE_FPS) * min(1.0, max(0.1, fps_scale)))),
+        "codec": settings.get("codec", "libx264"),
+        "audio": False,
+        "bitrate": "1M",
+        "preset": "ultrafast",
+        "ffmpeg_params": ["-pix_fmt", "yuv420p"],
+        "threads": settings.get("threads", 4),
+        "logger": None,
+    }
+
+
+def format_canvas(name: str, master_size: tuple[int, int]) -> tuple[int, int]:
+    """출력 포맷 캔버스 크기 (마스터가 드래프트 크기면 같은 배율, yuv420p용 짝수)"""
+    scale = master_size[1] / MOBILE_HEIGHT
+    W, H = OUTPUT_FORMATS[name]["size"]
+    return max(2, round(W * scale / 2) * 2), max(2, round(H * scale / 2) * 2)
+
+
+def reframe_window(name: str, master_size: tuple[int, int]) -> tuple[int, int, int, int]:
+    """포맷이 마스터에서 쓰는 영역 (x, y, w, h). fit 모드는 마스터 전체"""
+    spec = OUTPUT_FORMATS[name]
+    mw, mh = master_size
+    if spec["mode"] != "crop":
+        return 0, 0, mw, mh
+    W, H = spec["size"]
+    w = min(mw, round(mh * W / H) // 2 * 2)
+    h = min(mh, round(mw * H / W) // 2 * 2)
+    return (mw - w) // 2, round((mh - h) * spec.get("anchor_y", 0.5)), w, h
+
+
+def reframe_filter(name: str, master_size: tuple[int, int]) -> str:
+    """마스터 프레임 → 포맷 캔버스 ffmpeg -vf 필터 (크롭/스케일 또는 스케일/패딩)"""
+    spec = OUTPUT_FORMATS[name]
+    W, H = format_canvas(name, master_size)
+    if spec["mode"] == "crop":
+        x, y, w, h = reframe_window(name, master_size)
+        return f"crop={w}:{h}:{x}:{y},scale={W}:{H}"
+    pad = spec.get("pad_color", "black")
+    return (
+        f"scale={W}:{H}:force_original_aspect_ratio=decrease,"
+        f"pad={W}:{H}:(ow-iw)/2:(oh-ih)/2:color={pad}"
+    )
+
+
+def format_output_path(output_path: str, name: str) -> str:
+    """포맷별 출력 경로 (out.mp4 + 4:5 → out_4x5.mp4)"""
+    out = Path(output_path)
+    return str(out.with_name(f"{out.stem}_{name.replace(':', 'x')}{out.suffix}"))
+
+
+def format_encode_settings(settings: dict[str, Any], vf: str) -> dict[str, Any]:
+    """마스터 인코딩 설정에서 -vf만 포맷 리프레임 필터로 교체"""
+    params = list(settings.get("ffmpeg_params") or [])
+    if "-vf" in params:
+        k = params.index("-vf")
+        del params[k : k + 2]
+    return {**settings, "ffmpeg_params": params + ["-vf", vf]}
+
+
+def write_clip(
+    clip: VideoClip, output_path: str, settings: dict[str, Any], backend: str = "moviepy"
+) -> int:
+    """선택한 인코더 백엔드로 클립 인코딩 (settings는 write_videofile 인자 형식). 프레임 수 반환"""
+    if backend == "ffmpeg_pipe":
+        return write_clip_ffmpeg_pipe(clip, output_path, settings)
+    elif backend == "moviepy":
+        clip.write_videofile(output_path, **settings)
+        # write_videofile도 iter_frames와 같은 시각 격자로 프레임을 뽑는다
+        fps = settings.get("fps") or clip.fps
+        return len(np.arange(0, clip.duration, 1.0 / fps))
+    else:
+        raise ValueError(f"unknown render backend: {backend} (지원: {RENDER_BACKENDS})")
+
+
+def write_formats(
+    clip: VideoClip,
+    output_path: str,
+    format_paths: list[str],
+    extras: list[dict[str, Any]],
+    analyzers: list[StreamingQAAnalyzer],
+    settings: dict[str, Any],
+    text_boxes_at: Callable[[float], list] | None = None,
+) -> int:
+    """마스터 프레임을 마스터 + 추가 포맷 인코더에 함께 보내기 (ffmpeg 파이프, 프레임 수 반환)
+
+    크롭/스케일은 포맷별 인코더의 -vf가 맡고, analyzers[k]는 k번째 포맷이 쓰는 영역만 분석한다.
+    text_boxes_at(t)는 시각 t의 캔버스 텍스트 박스 (포맷 영역 기준으로 옮겨서 세이프존 판정)
+    """
+
+    def frames_at(t: float) -> list[np.ndarray]:
+        frame = np.asarray(clip.get_frame(t))
+        boxes = text_boxes_at(t) if text_boxes_at else []
+        for extra, analyzer in zip(extras, analyzers, strict=True):
+            x, y, w, h = extra["window"]
+            analyzer.observe(frame[y : y + h, x : x + w], window_boxes(boxes, extra["window"]))
+        return [frame] * (1 + len(extras))
+
+    return write_fanout_ffmpeg_pipe(
+        frames_at,
+        clip.duration,
+        [(output_path, clip.size)] + [(path, clip.size) for path in format_paths],
+        settings,
+        [{}] + [format_encode_settings(settings, extra["vf"]) for extra in extras],
+    )
+
+
+class _QueueProgressLogger(ProgressBarLogger):
+    """워커 프로세스의 인코딩 진행률(프레임 비율)을 큐로 보내는 proglog 로거"""
+
+    def __init__(self, queue, tag: int, step: float = 0.05):
+        super().__init__()
+        self.queue = queue
+        self.tag = tag
+        self.step = step
+        self._last = 0.0
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar != "t" or attr != "index":
+            return
+        total = self.bars[bar].get("total") or 1
+        frac = min(1.0, value / total)
+        if frac - self._last >= self.step:
+            self._last = frac
+            self.queue.put((self.tag, frac))
+
+
+def _render_shot_segment(
+    shot: dict[str, Any],
+    assets: dict[str, str],
+    safe_mode: bool,
+    fade_in: bool,
+    fade_out: bool,
+    settings: dict[str, Any],
+    out_path: str,
+    progress_queue=None,
+    tag: int = 0,
+    backend: str = "moviepy",
+    debug_overlays: bool | None = None,
+    media_pool: MediaReaderPool | None = None,
+    size: tuple[int, int] | None = None,
+    on_frames: Callable | None = None,
+    formats: list[dict[str, Any]] | None = None,
+) -> tuple[float, dict[str, Any], dict[str, Any], dict[str, dict[str, Any]]]:
+    """샷 하나를 빌드해서 세그먼트 mp4로 인코딩 (워커 프로세스에서도 호출)
+
+    (길이(초), 이 샷의 RenderProfiler.snapshot(), StreamingQAAnalyzer.snapshot(),
+    포맷별 QA snapshot) 반환. 진행률은 progress_queue(워커) 또는 on_frames(done, total)
+    콜백(같은 프로세스)으로 실제 인코딩된 프레임 수 기준으로 보낸다.
+    media_pool이 없으면 이 샷 전용 풀을 만들고 인코딩 후 바로 닫는다.
+    formats(추가 출력 포맷, 항목마다 format/path/vf/window/safe_zone)가 있으면 같은 합성 프레임을
+    포맷별 세그먼트(path)로도 함께 인코딩한다
+    """
+    import time
+
+    profiler = RenderProfiler()
+    qa = StreamingQAAnalyzer(settings["fps"])
+    own_pool = media_pool is None
+    pool = MediaReaderPool() if own_pool else media_pool
+    try:
+        t0 = time.perf_counter()
+        clip = build_shot_clip(
+            shot, assets, None, safe_mode, debug_overlays, pool, size, settings["fps"]
+        )
+        if clip is None:
+            raise ValueError("build_shot_clip returned None")
+        profiler.record_shot(tag, time.perf_counter() - t0)
+
+        # 페이드 전환은 샷 경계 안쪽에서만 일어나므로 세그먼트에 미리 굽는다
+        if fade_in:
+            clip = clip.fadein(TRANSITION_FADE)
+        if fade_out:
+            clip = clip.fadeout(TRANSITION_FADE)
+        if progress_queue is not None:
+            settings = {**settings, "logger": _QueueProgressLogger(progress_queue, tag)}
+        elif on_frames is not None:
+            settings = {**settings, "logger": FrameProgressLogger(on_frames)}
+        try:
+            t0 = time.perf_counter()
+            # QA는 인코딩되는 프레임을 그대로 분석 (출력 재디코드 없음), 세이프존은 텍스트 박스로
+            boxes = shot_text_boxes(shot, tuple(clip.size), safe_mode)
+            tapped = qa.tap_clip(profiler.timed_clip(clip), lambda t: boxes)
+            formats = formats or []
+            analyzers = [
+                StreamingQAAnalyzer(settings["fps"], safe_zone_ratio=f["safe_zone"])
+                for f in formats
+            ]
+            if formats:
+                paths = [f["path"] for f in formats]
+                frames = write_formats(
+                    tapped, out_path, paths, formats, analyzers, settings, lambda t: boxes
+                )
+            else:
+                frames = write_clip(tapped, out_path, settings, backend)
+            profiler.record_encode(frames, time.perf_counter() - t0)
+            format_qa = {
+                f["format"]: a.snapshot() for f, a in zip(formats, analyzers, strict=True)
+            }
+            return float(clip.duration), profiler.snapshot(), qa.snapshot(), format_qa
+        finally:
+            clip.close()  # 풀이 내준 클립은 리더가 떼어져 있어 공유 리더는 닫히지 않음
+    finally:
+        if own_pool:
+            pool.close()
+
+
+def _run_segment_jobs_parallel(
+    jobs: list[dict[str, Any]],
+    assets: dict[str, str],
+    safe_mode: bool,
+    settings: dict[str, Any],
+    workers: int,
+    on_progress: Callable,
+    on_done: Callable,
+    backend: str = "moviepy",
+    debug_overlays: bool | None = None,
+    size: tuple[int, int] | None = None,
+) -> None:
+    """세그먼트 작업들을 프로세스 풀에서 병렬 인코딩. 워커별 진행률은 on_progress로 합산"""
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from multiprocessing import Manager
+    from queue import Empty
+
+    from utils.diagnostics import heartbeat
+
+    # 워커 수만큼 인코딩 스레드를 나눠서 코어 과점유 방지
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    worker_settings = {**settings, "threads": threads}
+
+    with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        queue = manager.Queue()
+        futures = {
+            pool.submit(
+                _render_shot_segment,
+                job["shot"],
+                assets,
+                safe_mode,
+                job["fade_in"],
+                job["fade_out"],
+                worker_settings,
+                str(job["temp_path"]),
+                queue,
+                job["index"],
+                backend,
+                debug_overlays,
+                None,
+                size,
+                None,
+                job["formats"],
+            ): job
+            for job in jobs
+        }
+        pending = set(futures)
+        while pending:
+            heartbeat("render_shots")
+            done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            while True:
+                try:
+                    idx, frac = queue.get_nowait()
+                except Empty:
+                    break
+                on_progress(idx, frac)
+            for fut in done:
+                job = futures[fut]
+                try:
+                    on_done(job, fut.result(), None)
+                except Exception as e:
+                    on_done(job, None, e)
+
+
+def _render_segmented(
+    shots: list[dict[str, Any]],
+    assets: dict[str, str],
+    output_path: str,
+    settings: dict[str, Any],
+    cache_dir: Path,
+    progress_cb: Callable,
+    safe_mode: bool,
+    diagnostics: dict,
+    workers: int = 1,
+    backend: str = "moviepy",
+    debug_overlays: bool = True,
+    size: tuple[int, int] = (MOBILE_WIDTH, MOBILE_HEIGHT),
+    profiler: RenderProfiler | None = None,
+    qa: StreamingQAAnalyzer | None = None,
+    extras: list[dict[str, Any]] | None = None,
+) -> tuple[int, float]:
+    """샷별 세그먼트 캐시 렌더 → concat. (성공 샷 수, 총 길이) 반환
+
+    workers > 1이면 캐시에 없는 샷들을 프로세스 풀에서 병렬로 빌드/인코딩한다.
+    샷별 빌드/인코딩 측정값은 profiler에, QA 집계는 qa에 합산 (QA 집계는 세그먼트 메타에 캐싱)
+    extras(추가 출력 포맷)가 있으면 샷마다 합성 프레임을 포맷별 세그먼트 인코더에 함께 보내고
+    포맷별로 따로 결합한다. 포맷 QA는 extra["qa"]에 합산
+    샷 경계는 xfade가 cut이면 그대로 붙이고, 나머지는 페이드를 세그먼트에 굽는다
+    """
+    import time
+
+    from utils.diagnostics import heartbeat, loop_guard
+
+    profiler = profiler or RenderProfiler()
+    qa = qa or StreamingQAAnalyzer(settings["fps"])
+
+    cache = SegmentCache(cache_dir)
+    extras = extras or []
+    segments: dict[int, dict[str, Any]] = {}
+    format_segments: dict[str, dict[int, dict[str, Any]]] = {e["format"]: {} for e in extras}
+    used_keys = set()
+    jobs = []
+    # 스레드 수/로거는 결과물에 영향이 없으므로 캐시 키에서 제외
+    key_settings = {k: v for k, v in settings.items() if k not in RUNTIME_ONLY_SETTINGS}
+
+    # 세그먼트는 서로 겹칠 수 없으므로 겹침 전환(cross/slide)도 경계 안쪽 블랙 페이드로 굽는다
+    transitions = shot_transitions(shots)
+    guard = loop_guard("render_shots", max_iter=len(shots) * 2, warn_every=5)
+    for i, shot in enumerate(shots):
+        heartbeat("render_shots")
+        guard.tick({"shot_index": i, "max_shots": len(shots), "built_count": len(segments)})
+
+        fade_in = i > 0 and transitions[i - 1] != "cut"
+        fade_out = i < len(shots) - 1 and transitions[i] != "cut"
+        asset_paths = shot_asset_paths(shot, assets)
+        key_extra = {
+            "safe_mode": safe_mode,
+            "fade_in": fade_in,
+            "fade_out": fade_out,
+            "assets": len(assets),
+            # 추가 포맷이 있으면 마스터도 포맷 분기용 ffmpeg 파이프로 인코딩된다
+            "backend": "ffmpeg_pipe" if extras else backend,
+            "debug_overlays": debug_overlays,
+            "video_decode": "ffmpeg_cover_v2",
+            "motion_engine": MOTION_ENGINE_VERSION,
+            "text_layout": TEXT_LAYOUT_VERSION,
+            "qa": QA_VERSION,
+            "canvas": list(size),
+        }
+        key = segment_key(shot, asset_paths, key_settings, key_extra)
+        format_keys = [
+            segment_key(
+                shot, asset_paths, key_settings, {**key_extra, "format": e["format"], "vf": e["vf"]}
+            )
+            for e in extras
+        ]
+        used_keys.update([key, *format_keys])
+
+        # 마스터와 모든 포맷 세그먼트가 캐시에 있어야 재사용 (하나라도 없으면 샷 전체를 다시 인코딩)
+        cached = []
+        for k in [key, *format_keys]:
+            meta = cache.get(k)
+            if meta is None:
+                break
+            cached.append(meta)
+        if len(cached) == 1 + len(extras):
+            segments[i] = cached[0]
+            profiler.record_shot(i, 0.0, cached=True)
+            qa.merge(cached[0].get("qa"))
+            for extra, meta in zip(extras, cached[1:], strict=True):
+                format_segments[extra["format"]][i] = meta
+                extra["qa"].merge(meta.get("qa"))
+            print(f"♻️ Shot {i + 1} reused from cache ({cached[0]['duration']:.2f}s)")
+            continue
+        jobs.append(
+            {
+                "index": i,
+                "shot": shot,
+                "key": key,
+                "fade_in": fade_in,
+                "fade_out": fade_out,
+                "temp_path": cache.temp_path_for(key),
+                "format_keys": format_keys,
+                "formats": [
+                    {
+                        "format": e["format"],
+                        "path": str(cache.temp_path_for(k)),
+                        "vf": e["vf"],
+                        "window": e["window"],
+                        "safe_zone": e["safe_zone"],
+                    }
+                    for e, k in zip(extras, format_keys, strict=True)
+                ],
+            }
+        )
+
+    # 진행률은 인코딩된 프레임 비율을 샷 길이(= 프레임 수)로 가중 평균, ETA는 렌더할 샷 기준
+    weights = [max(shot_duration(s), 0.1) for s in shots]
+    fractions = [1.0 if i in segments else 0.0 for i in range(len(shots))]
+    pending_weight = sum(weights[job["index"]] for job in jobs)
+    encode_started = time.perf_counter()
+
+    def report(message: str) -> None:
+        done = sum(w * f for w, f in zip(weights, fractions, strict=True))
+        if pending_weight:
+            job_done = sum(weights[job["index"]] * fractions[job["index"]] for job in jobs)
+            eta = eta_seconds(time.perf_counter() - encode_started, job_done / pending_weight)
+            if eta is not None and job_done < pending_weight:
+                message = f"{message} · ETA {eta:.0f}s"
+        progress_cb(15 + int(70 * done / sum(weights)), message)
+
+    def on_progress(idx: int, frac: float) -> None:
+        fractions[idx] = max(fractions[idx], frac)
+        report(f"샷 렌더 중... ({len(segments)}/{len(shots)} 완료)")
+
+    def on_done(
+        job: dict[str, Any], result: tuple[float, dict, dict, dict] | None, error: Exception | None
+    ) -> None:
+        i = job["index"]
+        fractions[i] = 1.0
+        if error is not None:
+            job["temp_path"].unlink(missing_ok=True)
+            for f in job["formats"]:
+                Path(f["path"]).unlink(missing_ok=True)
+            diagnostics["reasons"].append(f"shot#{i} error: {str(error)}")
+            print(f"❌ Shot {i + 1} error: {str(error)}")
+        else:
+            dur, shot_profile, shot_qa, format_qa = result
+            profiler.merge(shot_profile)
+            qa.merge(shot_qa)
+            segments[i] = cache.commit(
+                job["key"], job["temp_path"], {"duration": dur, "shot_index": i, "qa": shot_qa}
+            )
+            for extra, f, k in zip(extras, job["formats"], job["format_keys"], strict=True):
+                meta = {"duration": dur, "shot_index": i, "qa": format_qa[f["format"]]}
+                format_segments[f["format"]][i] = cache.commit(k, f["path"], meta)
+                extra["qa"].merge(meta["qa"])
+            print(f"✅ Shot {i + 1} encoded to segment (duration: {dur:.2f}s)")
+        report(f"샷 {i + 1}/{len(shots)} 완료")
+
+    report(f"샷 {len(segments)}/{len(shots)} 캐시 사용, {len(jobs)}개 렌더 예정")
+    if workers > 1 and len(jobs) > 1:
+        _run_segment_jobs_parallel(
+            jobs,
+            assets,
+            safe_mode,
+            settings,
+            min(workers, len(jobs)),
+            on_progress,
+            on_done,
+            backend,
+            debug_overlays,
+            size,
+        )
+    else:
+        # 순차 렌더는 렌더 전체에서 영상 리더 풀 하나를 공유하되,
+        # 뒤 샷에서 다시 쓰지 않는 소스는 바로 닫아서 열린 리더 수를 타임라인 길이와 무관하게 유지
+        last_use: dict[str, int] = {}
+        for n, job in enumerate(jobs):
+            for path in shot_asset_paths(job["shot"], assets):
+                if path:
+                    last_use[path] = n
+        with MediaReaderPool() as pool:
+            for n, job in enumerate(jobs):
+                heartbeat("render_shots")
+                try:
+                    result = _render_shot_segment(
+                        job["shot"],
+                        assets,
+                        safe_mode,
+                        job["fade_in"],
+                        job["fade_out"],
+                        settings,
+                        str(job["temp_path"]),
+                        backend=backend,
+                        debug_overlays=debug_overlays,
+                        tag=job["index"],
+                        media_pool=pool,
+                        size=size,
+                        on_frames=lambda n, total, i=job["index"]: on_progress(i, n / total),
+                        formats=job["formats"],
+                    )
+                    on_done(job, result, None)
+                except Exception as e:
+                    on_done(job, None, e)
+                for path in [p for p, last in last_use.items() if last == n]:
+                    pool.release(path)
+
+    diagnostics["built"] += len(segments)
+    diagnostics["cache_hits"] = cache.hits
+    diagnostics["cache_misses"] = cache.misses
+    if not segments:
+        return 0, 0.0
+
+    ordered = [segments[i] for i in sorted(segments)]
+    progress_cb(90, "세그먼트 결합 중...")
+    t0 = time.perf_counter()
+    concat_segments([seg["path"] for seg in ordered], output_path)
+    for extra in extras:
+        by_shot = format_segments[extra["format"]]
+        concat_segments([by_shot[i]["path"] for i in sorted(segments)], extra["path"])
+    profiler.record_ffmpeg(time.perf_counter() - t0)
+    cache.prune(keep=used_keys)
+    return len(ordered), sum(float(seg["duration"]) for seg in ordered)
+
+
+def recipe_shots(recipe: dict[str, Any]) -> list[dict[str, Any]]:
+    """레시피에서 렌더할 샷 목록 (timeline이 있으면 timeline, 없으면 shots)
+
+    타임라인은 샷을 필요할 때만 열기 때문에 샷 수 제한 없음 (60샷 2분 영상도 같은 메모리로 렌더)
+    """
+    return list(recipe.get("timeline") or recipe.get("shots", []))
+
+
+def planned_shot_duration(shot: dict[str, Any]) -> float:
+    """타임라인 배치에 쓰는 샷 길이 (build_shot_clip과 같이 0 이하면 2초)"""
+    duration = shot_duration(shot)
+    return duration if duration > 0 else 2.0
+
+
+def shot_transitions(shots: list[dict[str, Any]]) -> list[str]:
+    """샷 경계별 전환 종류 (경계 i는 들어오는 샷 shots[i+1]의 xfade)
+
+    "in"/"out"(인트로/아웃트로 표시)이나 지원하지 않는 값은 블랙 경유 fade
+    """
+    kinds = []
+    for shot in shots[1:]:
+        kind = str(shot.get("xfade") or "fade").lower()
+        kinds.append(kind if kind in TRANSITIONS else "fade")
+    return kinds
+
+
+def build_timeline(
+    shots: list[dict[str, Any]],
+    assets: dict[str, str],
+    diagnostics: dict,
+    safe_mode: bool = False,
+    debug_overlays: bool = True,
+    size: tuple[int, int] = (MOBILE_WIDTH, MOBILE_HEIGHT),
+    fps: float = MOBILE_FPS,
+    profiler: RenderProfiler | None = None,
+    include_text: bool = True,
+) -> StreamingTimelineClip | None:
+    """샷들을 플랫 타임라인 1개로 합성 (샷이 없으면 None)
+
+    렌더/프레임 평가/필름스트립이 같은 합성 규칙(샷 순서, 샷별 xfade 전환)을 쓰도록 공유하는 단계.
+    샷은 활성화되기 직전에 빌드하고 활성 구간이 끝나면 닫는다. 영상 리더는 타임라인 1개가 풀 하나를
+    공유하고, 샷을 닫을 때 열려 있는 샷과 다음 샷이 쓰지 않는 소스의 리더만 닫으므로
+    연속 샷의 같은 소스는 다시 열지 않고 열린 리더 수는 타임라인 길이와 무관하다.
+    풀은 타임라인을 close()할 때 닫히며, 연 리더 수는 diagnostics["readers_opened"]에 누적.
+    빌드에 실패한 샷은 같은 길이의 플레이스홀더로 채워 타이밍을 유지하고 diagnostics["reasons"]에 기록.
+    include_text=False면 텍스트 레이어 없는 베이스 타임라인 (변형 렌더용)
+    """
+    import time
+
+    from utils.diagnostics import heartbeat
+
+    if not shots:
+        return None
+    profiler = profiler or RenderProfiler()
+    durations = [planned_shot_duration(shot) for shot in shots]
+    diagnostics.setdefault("readers_opened", 0)
+    built: set[int] = set()
+    pool = MediaReaderPool()
+    sources = [{p for p in shot_asset_paths(shot, assets) if p} for shot in shots]
+
+    def count_readers() -> None:
+        diagnostics["readers_opened"] += pool.opened
+        pool.opened = 0
+
+    def close_pool() -> None:
+        count_readers()
+        pool.close()
+
+    def open_shot(i: int) -> tuple[VideoClip, Callable[[], None]]:
+        heartbeat("render_shots")
+
+        def release() -> None:
+            count_readers()
+            keep = set().union(*(sources[j] for j in timeline.loaded if j != i))
+            if i + 1 < len(shots):
+                keep |= sources[i + 1]
+            for path in sources[i] - keep:
+                pool.release(path)
+
+        try:
+            t0 = time.perf_counter()
+            clip = build_shot_clip(
+                shots[i], assets, None, safe_mode, debug_overlays, pool, size, fps, include_text
+            )
+            if clip is None:
+                raise ValueError("returned None")
+            profiler.record_shot(i, time.perf_counter() - t0)
+            if i not in built:
+                built.add(i)
+                diagnostics["built"] += 1
+                print(f"✅ Shot {i + 1} opened (duration: {durations[i]:.2f}s)")
+        except Exception as e:
+            release()
+            diagnostics["reasons"].append(f"shot#{i} error: {str(e)}")
+            print(f"❌ Shot {i + 1} error: {str(e)}")
+            clip = create_placeholder_clip(durations[i], "#141414", f"샷 {i + 1}", size)
+        return _ensure_canvas(clip, size).set_duration(durations[i]), release
+
+    # 프레임마다 활성 샷 1~2개만 열어서 평가
+    transitions = shot_transitions(shots)
+    timeline = StreamingTimelineClip(
+        open_shot,
+        durations,
+        transitions,
+        [TRANSITION_FADE] * len(transitions),
+        size,
+        on_close=close_pool,
+    )
+    return timeline
+
+
+def timeline_text_boxes(
+    timeline: TimelineClip,
+    shots: list[dict[str, Any]],
+    size: tuple[int, int],
+    safe_mode: bool = False,
+) -> Callable[[float], list[tuple[int, int, int, int]]]:
+    """시각 t에 보이는 샷 텍스트 박스를 돌려주는 함수 (전환 구간에서는 두 샷 모두)"""
+    boxes = [shot_text_boxes(shot, size, safe_mode) for shot in shots]
+
+    def at(t: float) -> list[tuple[int, int, int, int]]:
+        return [box for i in timeline.active_indices(t) for box in boxes[i]]
+
+    return at
+
+
+def _render_single_pass(
+    shots: list[dict[str, Any]],
+    assets: dict[str, str],
+    output_path: str,
+    settings: dict[str, Any],
+    progress_cb: Callable,
+    safe_mode: bool,
+    diagnostics: dict,
+    backend: str = "moviepy",
+    debug_overlays: bool = True,
+    size: tuple[int, int] = (MOBILE_WIDTH, MOBILE_HEIGHT),
+    profiler: RenderProfiler | None = None,
+    qa: StreamingQAAnalyzer | None = None,
+    extras: list[dict[str, Any]] | None = None,
+) -> tuple[int, float]:
+    """전체 타임라인을 한 번에 합성/인코딩. (성공 샷 수, 총 길이) 반환
+
+    합성은 인코딩 중 프레임 단위로 일어나므로 진행률/ETA는 실제 인코딩된 프레임 수 기준.
+    샷은 인코딩 중 활성화될 때 빌드되므로 샷 빌드 시간도 인코딩 구간 안에 포함된다.
+    인코딩되는 프레임은 qa에도 흘려보낸다. extras(추가 출력 포맷)가 있으면 같은 마스터 프레임을
+    포맷별 ffmpeg 인코더에 함께 보내고 크롭/스케일은 각 인코더의 -vf가 맡는다 (ffmpeg 파이프 사용)
+    """
+    import time
+
+    profiler = profiler or RenderProfiler()
+    qa = qa or StreamingQAAnalyzer(settings["fps"])
+    built_before = diagnostics["built"]
+    final_clip = build_timeline(
+        shots, assets, diagnostics, safe_mode, debug_overlays, size, settings["fps"], profiler
+    )
+    if final_clip is None:
+        return 0, 0.0
+
+    # 고급 비디오 인코딩 (모바일 최적화)
+    progress_cb(20, "비디오 인코딩 중...")
+    encode_started = time.perf_counter()
+
+    def on_frames(done: int, total: int) -> None:
+        eta = eta_seconds(time.perf_counter() - encode_started, done / total)
+        eta_text = f" · ETA {eta:.0f}s" if eta is not None and done < total else ""
+        progress_cb(20 + int(75 * done / total), f"비디오 인코딩 중... {done}/{total} 프레임{eta_text}")
+
+    boxes_at = timeline_text_boxes(final_clip, shots, size, safe_mode)
+    tapped = qa.tap_clip(profiler.timed_clip(final_clip), boxes_at)
+    settings = {**settings, "logger": FrameProgressLogger(on_frames)}
+    try:
+        if extras:
+            frames = write_formats(
+                tapped,
+                output_path,
+                [extra["path"] for extra in extras],
+                extras,
+                [extra["qa"] for extra in extras],
+                settings,
+                boxes_at,
+            )
+        else:
+            frames = write_clip(tapped, output_path, settings, backend)
+        profiler.record_encode(frames, time.perf_counter() - encode_started)
+    finally:
+        final_clip.close()  # 열려 있는 샷/리더 해제 (파일 잠김 방지)
+    diagnostics["max_open_shots"] = final_clip.max_loaded
+    return diagnostics["built"] - built_before, float(final_clip.duration)
+
+
 def render_video(
     recipe_path: str,
     assets_dir: str,
     output_path: str,
     progress_cb: Callable | None = None,
     safe_mode: bool = False,
+    use_segment_cache: bool = True,
+    cache_dir: str | None = None,
+    workers: int | None = None,
+    backend: str = "moviepy",
+    debug_overlays: bool | None = None,
+    quality: str = "final",
+    draft_scale: float = DRAFT_SCALE,
+    draft_fps_scale: float = DRAFT_FPS_SCALE,
+    formats: list[str] | None = None,
 ) -> dict[str, Any]:
-    """메인 렌더링 함수"""
+    """메인 렌더링 함수
+
+    use_segment_cache=True면 샷별 세그먼트를 내용 해시로 캐싱해서 바뀐 샷만 다시 인코딩하고
+    ffmpeg concat으로 결합한다. cache_dir 기본값은 출력 디렉토리의 .segment_cache
+    workers > 1이면 샷 세그먼트를 프로세스 풀에서 병렬 렌더 (세그먼트 경로 강제).
+    기본값은 ADGEN_RENDER_WORKERS 환경변수
+    backend="ffmpeg_pipe"면 moviepy write_videofile 대신 ffmpeg stdin 파이프로 직접 인코딩
+    debug_overlays=False면 디버그 워터마크 없이 출고용으로 렌더 (기본값 ADGEN_DEBUG_OVERLAYS)
+    quality="draft"면 같은 레시피를 draft_scale 해상도, draft_fps_scale fps, ultrafast 프리셋,
+    디버그 오버레이 없이 렌더 (타이밍 확인용 미리보기)
+    자산 로드/샷 빌드/프레임 합성/인코딩 시간과 최대 RSS는 used_assets.json의 "profile"과
+    render_profile.json에 기록. 인코딩 중 측정한 QA 값은 "qa"와 <출력>.qa.json에 기록
+    formats(예: ["9:16", "4:5", "1:1", "16:9"])를 주면 9:16 마스터(output_path)를 한 번만 합성하고
+    나머지 포맷은 OUTPUT_FORMATS 리프레임 규칙대로 <출력>_4x5.mp4 등으로 함께 인코딩한다.
+    단일 패스는 타임라인 프레임을, 세그먼트 경로는 샷 프레임을 포맷별 인코더로 바로 분기하고
+    (세그먼트는 포맷별로 캐싱/결합), 포맷마다 QA를 측정해서 <출력>_4x5.qa.json 등에 기록한다
+    """
+
+    if backend not in RENDER_BACKENDS:
+        raise ValueError(f"unknown render backend: {backend} (지원: {RENDER_BACKENDS})")
+    if quality not in RENDER_QUALITIES:
+        raise ValueError(f"unknown render quality: {quality} (지원: {RENDER_QUALITIES})")
+    for name in formats or []:
+        if name not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format: {name} (지원: {tuple(OUTPUT_FORMATS)})")
 
     # 진행률 콜백 기본값
     if progress_cb is None:
@@ -517,44 +1473,89 @@ def render_video(
         with open(recipe_path, encoding="utf-8") as f:
             recipe = json.load(f)
 
+        profiler = RenderProfiler()
+
         # 자산 로드
         progress_cb(10, "자산 로드 중...")
-        assets = load_assets_from_directory(assets_dir)
+        with profiler.stage("asset_load"):
+            assets = load_assets_from_directory(assets_dir)
 
         # 샷 클립들 생성
         progress_cb(15, "샷 클립 생성 중...")
         shots = recipe.get("shots", [])
         timeline = recipe.get("timeline", [])
 
-        # timeline이 있으면 timeline 사용, 없으면 shots 사용
         source_shots = timeline if timeline else shots
-        max_shots = min(12, len(source_shots))  # MVP: 최대 12샷
-        shot_clips = []
+        render_shots = recipe_shots(recipe)
+        max_shots = len(render_shots)
         diagnostics = {"missing": set(), "resolved": 0, "built": 0, "reasons": []}
 
-        # 진단 시스템 초기화
-        from utils.diagnostics import heartbeat, loop_guard
-        
-        guard = loop_guard("render_shots", max_iter=max_shots * 2, warn_every=5)
-        for i, shot in enumerate(source_shots[:max_shots]):
-            heartbeat("render_shots")
-            guard.tick({"shot_index": i, "max_shots": max_shots, "built_count": len(shot_clips)})
-            
-            progress_cb(15 + int(60 * i / max_shots), f"샷 {i + 1}/{max_shots} 생성 중...")
-            try:
-                shot_clip = build_shot_clip(shot, assets, progress_cb, safe_mode)
-                if shot_clip is not None:
-                    shot_clips.append(shot_clip)
-                    diagnostics["built"] += 1
-                    print(
-                        f"✅ Shot {i + 1} created successfully (duration: {shot_clip.duration:.2f}s)"
-                    )
-                else:
-                    diagnostics["reasons"].append(f"shot#{i} returned None")
-                    print(f"❌ Shot {i + 1} failed: returned None")
-            except Exception as e:
-                diagnostics["reasons"].append(f"shot#{i} error: {str(e)}")
-                print(f"❌ Shot {i + 1} error: {str(e)}")
+        # 출력 디렉토리 생성
+        output_dir = Path(output_path).parent
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        settings = encode_settings(recipe)
+        size = (MOBILE_WIDTH, MOBILE_HEIGHT)
+        if quality == "draft":
+            settings = draft_encode_settings(settings, draft_fps_scale)
+            size = draft_canvas(draft_scale)
+            debug_overlays = False
+        qa = StreamingQAAnalyzer(settings["fps"])
+        extras = [
+            {
+                "format": name,
+                "path": format_output_path(output_path, name),
+                "size": format_canvas(name, size),
+                "vf": reframe_filter(name, size),
+                "window": reframe_window(name, size),
+                "safe_zone": OUTPUT_FORMATS[name]["safe_zone"],
+                "qa": StreamingQAAnalyzer(
+                    settings["fps"], safe_zone_ratio=OUTPUT_FORMATS[name]["safe_zone"]
+                ),
+            }
+            for name in dict.fromkeys(formats or [])
+            if name != MASTER_FORMAT
+        ]
+        workers = max(1, workers or DEFAULT_RENDER_WORKERS)
+        if debug_overlays is None:
+            debug_overlays = DEBUG_OVERLAYS
+        # 병렬 렌더는 세그먼트 단위로만 가능
+        use_segment_cache = use_segment_cache or workers > 1
+        if use_segment_cache:
+            cache_root = Path(cache_dir) if cache_dir else output_dir / SEGMENT_CACHE_DIRNAME
+            built, duration = _render_segmented(
+                render_shots,
+                assets,
+                output_path,
+                settings,
+                cache_root,
+                progress_cb,
+                safe_mode,
+                diagnostics,
+                workers,
+                backend,
+                debug_overlays,
+                size,
+                profiler,
+                qa,
+                extras,
+            )
+        else:
+            built, duration = _render_single_pass(
+                render_shots,
+                assets,
+                output_path,
+                settings,
+                progress_cb,
+                safe_mode,
+                diagnostics,
+                backend,
+                debug_overlays,
+                size,
+                profiler,
+                qa,
+                extras,
+            )
 
         # 진단 정보 출력
         print("\n🔍 렌더링 진단:")
@@ -562,11 +1563,16 @@ def render_video(
         print(f"   - 처리된 샷: {max_shots}")
         print(f"   - 성공한 샷: {diagnostics['built']}")
         print(f"   - 실패한 샷: {len(diagnostics['reasons'])}")
+        if use_segment_cache:
+            print(
+                f"   - 세그먼트 캐시: hit={diagnostics.get('cache_hits', 0)}, "
+                f"miss={diagnostics.get('cache_misses', 0)}"
+            )
         if diagnostics["reasons"]:
             print(f"   - 실패 원인: {diagnostics['reasons'][:3]}...")  # 처음 3개만 표시
 
         # 빈 샷 방어
-        if not shot_clips:
+        if not built:
             msg = (
                 "No usable shots were produced. "
                 f"timeline={len(timeline)}, shots={len(shots)}, "
@@ -575,87 +1581,78 @@ def render_video(
             )
             raise ValueError(msg)
 
-        # 클립들 합성
-        progress_cb(80, "클립 합성 중...")
-        if len(shot_clips) == 1:
-            final_clip = shot_clips[0]
-        else:
-            # 전환 효과 적용
-            final_clip = shot_clips[0]
-            transition_guard = loop_guard("render_transitions", max_iter=len(shot_clips) * 2, warn_every=3)
-            for i in range(1, len(shot_clips)):
-                heartbeat("render_transitions")
-                transition_guard.tick({"transition_index": i, "total_clips": len(shot_clips)})
-                
-                transition_type = "fade"  # 기본 전환
-                final_clip = create_transition_effect(final_clip, shot_clips[i], transition_type)
-
-        # 출력 디렉토리 생성
-        output_dir = Path(output_path).parent
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        # 고급 비디오 인코딩 (모바일 최적화)
-        progress_cb(90, "비디오 인코딩 중...")
-
-        # Serene Minimal Gold 스타일이면 고품질 설정
-        recipe_style = recipe.get("style", "")
-        if recipe_style == "serene_minimal_gold":
-            # 고품질 모바일 최적화 설정
-            final_clip.write_videofile(
-                output_path,
-                fps=MOBILE_FPS,
-                codec="libx264",
-                audio=False,
-                preset="slow",  # 고품질 프리셋
-                bitrate="6M",  # 높은 비트레이트
-                ffmpeg_params=[
-                    "-profile:v",
-                    "high",
-                    "-pix_fmt",
-                    "yuv420p",
-                    "-crf",
-                    "18",  # 고품질 CRF
-                    "-movflags",
-                    "+faststart",
-                    "-vf",
-                    f"scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:color={recipe.get('canvas', {}).get('bg_color', 'E9E3D9').replace('#', '')},format=yuv420p",
-                ],
-                threads=4,
-                logger=None,
-            )
-        else:
-            # 기본 설정
-            final_clip.write_videofile(
-                output_path,
-                fps=MOBILE_FPS,
-                codec="libx264",
-                audio=False,
-                bitrate="4M",
-                preset="medium",
-                threads=4,
-                logger=None,
-            )
-        final_clip.close()  # 파일 잠김 방지
-
         # 메타데이터 수집
         file_size = os.path.getsize(output_path) / (1024 * 1024)  # MB
-        duration = final_clip.duration
 
         # 사용된 자산 정보 저장
         used_assets = {
             "video_file": output_path,
             "file_size_mb": round(file_size, 2),
             "duration_seconds": round(duration, 2),
-            "resolution": f"{MOBILE_WIDTH}x{MOBILE_HEIGHT}",
-            "fps": MOBILE_FPS,
+            "resolution": f"{size[0]}x{size[1]}",
+            "fps": settings["fps"],
             "used_assets": list(assets.keys()),
-            "total_shots": len(shot_clips),
+            "total_shots": built,
+            "backend": backend,
+            "quality": quality,
+        }
+        if use_segment_cache:
+            used_assets["segment_cache"] = {
+                "hits": diagnostics.get("cache_hits", 0),
+                "misses": diagnostics.get("cache_misses", 0),
+            }
+        profile = profiler.report()
+        used_assets["profile"] = profile
+        qa_report = {
+            **qa.report(),
+            "resolution": used_assets["resolution"],
+            "duration_seconds": used_assets["duration_seconds"],
+            "bitrate_mbps": round(file_size * 8 / duration, 2) if duration else 0.0,
+            "codec": settings.get("codec", "libx264"),
         }
+        used_assets["qa"] = qa_report
+        if extras:
+            used_assets["formats"] = [
+                {
+                    "format": MASTER_FORMAT,
+                    "video_file": output_path,
+                    "resolution": used_assets["resolution"],
+                    "file_size_mb": used_assets["file_size_mb"],
+                }
+            ]
+        for extra in extras:
+            extra_size = os.path.getsize(extra["path"]) / (1024 * 1024)
+            extra_qa = {
+                **extra["qa"].report(),
+                "resolution": f"{extra['size'][0]}x{extra['size'][1]}",
+                "duration_seconds": used_assets["duration_seconds"],
+                "bitrate_mbps": round(extra_size * 8 / duration, 2) if duration else 0.0,
+                "codec": settings.get("codec", "libx264"),
+            }
+            with open(qa_report_path(extra["path"]), "w", encoding="utf-8") as f:
+                json.dump(extra_qa, f, ensure_ascii=False, indent=2)
+            used_assets["formats"].append(
+                {
+                    "format": extra["format"],
+                    "video_file": extra["path"],
+                    "resolution": f"{extra['size'][0]}x{extra['size'][1]}",
+                    "file_size_mb": round(extra_size, 2),
+                    "qa": extra_qa,
+                }
+            )
+        print(
+            f"   - 프로파일: 총 {profile['total_s']}s, 인코딩 {profile['encode']['fps']}fps, "
+            f"프레임 평균 {profile['frames']['mean_ms']}ms, 최대 RSS {profile['peak_rss_mb']['self']}MB"
+        )
 
-        # used_assets.json 저장
+        # used_assets.json / render_profile.json 저장
         assets_info_path = output_dir / "used_assets.json"
         with open(assets_info_path, "w", encoding="utf-8") as f:
             json.dump(used_assets, f, ensure_ascii=False, indent=2)
+        with open(output_dir / RENDER_PROFILE_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+        with open(qa_report_path(output_path), "w", encoding="utf-8") as f:
+            json.dump(qa_report, f, ensure_ascii=False, indent=2)
 
         progress_cb(100, "렌더링 완료!")
 
@@ -666,6 +1663,216 @@ def render_video(
         raise e
 
 
+VARIANTS_SUMMARY_FILENAME = "variants.json"
+
+
+def apply_text_variant(
+    shots: list[dict[str, Any]], variant: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """변형 스펙의 텍스트 교체를 적용한 샷 목록 (원본 샷은 수정하지 않음)
+
+    variant["texts"]는 샷 인덱스 → 교체 텍스트. 문자열이면 그 샷의 첫 텍스트 레이어,
+    리스트면 텍스트 레이어 순서대로 교체 (None은 원문 유지)
+    """
+    texts = {int(k): v for k, v in (variant.get("texts") or {}).items()}
+    out = []
+    for i, shot in enumerate(shots):
+        replacements = texts.get(i)
+        if replacements is None:
+            out.append(shot)
+            continue
+        if isinstance(replacements, str):
+            replacements = [replacements]
+        remaining = iter(replacements)
+        layers = []
+        for layer in shot.get("layers", []):
+            if layer.get("type") == "text":
+                text = next(remaining, None)
+                if text is not None:
+                    layer = {**layer, "text": text}
+            layers.append(layer)
+        out.append({**shot, "layers": layers})
+    return out
+
+
+def render_variants(
+    recipe_path: str,
+    assets_dir: str,
+    output_dir: str,
+    variants: list[dict[str, Any]],
+    progress_cb: Callable | None = None,
+    safe_mode: bool = False,
+    debug_overlays: bool = False,
+    quality: str = "final",
+    draft_scale: float = DRAFT_SCALE,
+    draft_fps_scale: float = DRAFT_FPS_SCALE,
+) -> dict[str, Any]:
+    """캡션/CTA 텍스트만 다른 A/B 변형들을 한 번의 패스로 렌더
+
+    variants: [{"name": "cta_b", "texts": {"5": "지금 주문하세요"}}, ...] (apply_text_variant 참고).
+    텍스트 없는 베이스 타임라인(영상/이미지 디코드, 스케일, 전환)은 프레임마다 1번만 평가하고
+    변형별 텍스트 오버레이만 복사본에 블렌딩해서 변형마다 ffmpeg 인코더 1개로 동시에 쓴다.
+    debug_overlays=True면 디버그 워터마크는 변형 텍스트 위에 얹는다 (텍스트가 덮지 않게)
+    출력은 output_dir/variant_<name>.mp4 (+ .qa.json), 요약은 output_dir/variants.json
+    """
+    import time
+
+    from utils.diagnostics import heartbeat
+
+    if quality not in RENDER_QUALITIES:
+        raise ValueError(f"unknown render quality: {quality} (지원: {RENDER_QUALITIES})")
+    if not variants:
+        raise ValueError("variants가 비어 있습니다.")
+    if progress_cb is None:
+
+        def progress_cb(p, m):
+            print(f"{p}%: {m}")
+
+
+    try:
+        progress_cb(5, "레시피 로드 중...")
+        with open(recipe_path, encoding="utf-8") as f:
+            recipe = json.load(f)
+
+        profiler = RenderProfiler()
+        progress_cb(10, "자산 로드 중...")
+        with profiler.stage("asset_load"):
+            assets = load_assets_from_directory(assets_dir)
+
+        shots = recipe_shots(recipe)
+        settings = encode_settings(recipe)
+        size = (MOBILE_WIDTH, MOBILE_HEIGHT)
+        if quality == "draft":
+            settings = draft_encode_settings(settings, draft_fps_scale)
+            size = draft_canvas(draft_scale)
+        # 변형 수만큼 인코더가 동시에 돌므로 코어를 나눠 쓴다
+        settings = {**settings, "threads": max(1, (os.cpu_count() or 1) // len(variants))}
+
+        out_dir = Path(output_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        names = [str(v.get("name") or f"v{k + 1}") for k, v in enumerate(variants)]
+        paths = [str(out_dir / f"variant_{name}.mp4") for name in names]
+        variant_shots = [apply_text_variant(shots, v) for v in variants]
+
+        diagnostics = {"missing": set(), "resolved": 0, "built": 0, "reasons": []}
+        # 디버그 오버레이는 베이스에 굽지 않고 변형별 텍스트 위에 얹는다 (단일 렌더와 같은 순서)
+        base = build_timeline(
+            shots,
+            assets,
+            diagnostics,
+            safe_mode,
+            False,
+            size,
+            settings["fps"],
+            profiler,
+            include_text=False,
+        )
+        if base is None:
+            raise ValueError("No usable shots were produced. recipe has no shots")
+
+        # 텍스트 합성기는 (샷, 텍스트) 단위로 활성 구간 동안만 캐싱 (같은 텍스트면 변형끼리 공유)
+        overlays: dict[tuple, FrameCompositor | None] = {}
+        debug_assets = assets if debug_overlays else None
+
+        def text_filter(k: int, i: int) -> Callable:
+            shot = variant_shots[k][i]
+            texts = [
+                layer.get("text", "")
+                for layer in shot.get("layers", [])
+                if layer.get("type") == "text"
+            ]
+            key = (i, tuple(texts))
+
+            def apply(frame: np.ndarray) -> np.ndarray:
+                if key not in overlays:
+                    overlay = shot_text_overlay(shot, size, safe_mode, debug_assets)
+                    overlays[key] = None if overlay is None else FrameCompositor(size, [overlay])
+                compositor = overlays[key]
+                return frame if compositor is None else compositor.composite(frame)
+
+            return apply
+
+        filters = [[text_filter(k, i) for i in range(len(shots))] for k in range(len(variants))]
+        qas = [StreamingQAAnalyzer(settings["fps"]) for _ in variants]
+        boxes_at = [timeline_text_boxes(base, vs, size, safe_mode) for vs in variant_shots]
+
+        def frames_at(t: float) -> list[np.ndarray]:
+            heartbeat("render_shots")
+            t0 = time.perf_counter()
+            frames = base.frames_at(t, filters)
+            profiler.record_frame(time.perf_counter() - t0)
+            active = base.active_indices(t)
+            for key in [key for key in overlays if key[0] not in active]:
+                del overlays[key]
+            for qa, frame, text_boxes in zip(qas, frames, boxes_at, strict=True):
+                qa.observe(frame, text_boxes(t))
+            return frames
+
+        progress_cb(20, f"변형 {len(variants)}개 인코딩 중...")
+        encode_started = time.perf_counter()
+
+        def on_frames(done: int, total: int) -> None:
+            eta = eta_seconds(time.perf_counter() - encode_started, done / total)
+            eta_text = f" · ETA {eta:.0f}s" if eta is not None and done < total else ""
+            progress_cb(20 + int(75 * done / total), f"변형 인코딩 중... {done}/{total} 프레임{eta_text}")
+
+        try:
+            frames = write_fanout_ffmpeg_pipe(
+                frames_at,
+                base.duration,
+                [(path, size) for path in paths],
+                {**settings, "logger": FrameProgressLogger(on_frames)},
+            )
+            profiler.record_encode(frames * len(paths), time.perf_counter() - encode_started)
+        finally:
+            base.close()
+
+        if not diagnostics["built"]:
+            raise ValueError(f"No usable shots were produced. reasons={diagnostics['reasons']}")
+
+        duration = float(base.duration)
+        results = []
+        for name, path, variant, qa in zip(names, paths, variants, qas, strict=True):
+            file_size = os.path.getsize(path) / (1024 * 1024)
+            qa_report = {
+                **qa.report(),
+                "resolution": f"{size[0]}x{size[1]}",
+                "duration_seconds": round(duration, 2),
+                "bitrate_mbps": round(file_size * 8 / duration, 2) if duration else 0.0,
+                "codec": settings.get("codec", "libx264"),
+            }
+            with open(qa_report_path(path), "w", encoding="utf-8") as f:
+                json.dump(qa_report, f, ensure_ascii=False, indent=2)
+            results.append(
+                {
+                    "name": name,
+                    "video_file": path,
+                    "file_size_mb": round(file_size, 2),
+                    "texts": variant.get("texts") or {},
+                    "qa": qa_report,
+                }
+            )
+
+        summary = {
+            "duration_seconds": round(duration, 2),
+            "resolution": f"{size[0]}x{size[1]}",
+            "fps": settings["fps"],
+            "quality": quality,
+            "total_shots": diagnostics["built"],
+            "variants": results,
+            "profile": profiler.report(),
+        }
+        with open(out_dir / VARIANTS_SUMMARY_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        progress_cb(100, f"변형 {len(results)}개 렌더링 완료!")
+        return summary
+
+    except Exception as e:
+        progress_cb(0, f"변형 렌더링 실패: {str(e)}")
+        raise e
+
+
 def create_subtitle_srt(recipe: dict[str, Any], output_path: str) -> str:
     """자막 SRT 파일 생성"""
 
@@ -720,7 +1927,7 @@ def frame_variance(clip: VideoClip, t: float = 0.1) -> float:
 def render_single_shot_preview(
     shot: dict[str, Any], assets: dict[str, str], output_dir: str, safe_mode: bool = False
 ) -> dict[str, Any]:
-    """단일 샷 미리보기 렌더 (디버그용)"""
+    """단일 샷 미리보기 (디버그용). 인코딩 없이 0.1초 시점 프레임만 평가해서 PNG 저장"""
     try:
         # 디버그 출력 디렉토리 생성
         debug_dir = Path(output_dir) / "debug"
@@ -733,36 +1940,28 @@ def render_single_shot_preview(
         shot_copy["in"] = 0.0
         shot_copy["out"] = 2.0
 
-        shot_clip = build_shot_clip(shot_copy, assets, safe_mode=safe_mode)
-
-        if shot_clip is None:
-            return {"error": "샷 클립 생성 실패"}
+        with MediaReaderPool() as pool:
+            shot_clip = build_shot_clip(shot_copy, assets, safe_mode=safe_mode, media_pool=pool)
+            if shot_clip is None:
+                return {"error": "샷 클립 생성 실패"}
+            try:
+                frame = np.asarray(shot_clip.get_frame(0.1))[..., :3].astype(np.uint8)
+                duration = shot_clip.duration
+            finally:
+                shot_clip.close()
 
-        # 프레임 분산 계산
-        variance = frame_variance(shot_clip, t=0.1)
+        # 프레임 분산 계산 (흑/회색 화면 감지)
+        variance = float(np.var(frame))
 
         # 프레임 이미지 저장
         frame_path = debug_dir / "shot0_0100ms.png"
-        shot_clip.save_frame(str(frame_path), t=0.1)
-
-        # 미니 비디오 저장 (2초)
-        video_path = debug_dir / "shot0_preview.mp4"
-        shot_clip.write_videofile(
-            str(video_path),
-            fps=30,
-            codec="libx264",
-            audio=False,
-            bitrate="2M",
-            preset="fast",
-            logger=None,
-        )
-        shot_clip.close()
+        Image.fromarray(frame).save(frame_path)
 
         return {
             "variance": variance,
             "frame_path": str(frame_path),
-            "video_path": str(video_path),
-            "duration": shot_clip.duration,
+            "video_path": None,
+            "duration": duration,
             "warning": "프레임 분산이 너무 낮습니다(흑/회색 화면 의심)" if variance < 10 else None,
         }
 
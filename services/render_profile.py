@@ -0,0 +1,192 @@
+"""
+S4-6. 렌더 프로파일링
+자산 로드/샷 빌드/프레임 합성/인코딩 시간과 최대 RSS를 렌더 중에 수집해서
+used_assets.json과 render_profile.json에 남긴다 (회귀 추적, 렌더 서버 규모 산정용)
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from proglog import ProgressBarLogger
+
+# 프레임 합성 시간 히스토그램 버킷 상한(ms), 마지막 버킷은 그 이상
+FRAME_HIST_BUCKETS_MS = (2, 5, 10, 20, 50, 100, 200, 500)
+
+RENDER_PROFILE_FILENAME = "render_profile.json"
+
+
+def peak_rss_mb() -> dict[str, float]:
+    """현재 프로세스(self)와 종료된 자식 프로세스(children, ffmpeg 등)의 최대 RSS(MB)"""
+    try:
+        import resource
+
+        # Linux는 KB, macOS는 byte 단위
+        unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return {
+            "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+            "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit,
+        }
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        mem = psutil.Process().memory_info()
+        # Windows는 peak_wset, 그 외에는 현재 RSS로 근사
+        return {"self": getattr(mem, "peak_wset", mem.rss) / (1024 * 1024), "children": 0.0}
+    except Exception:
+        return {"self": 0.0, "children": 0.0}
+
+
+class RenderProfiler:
+    """렌더 1회의 시간/메모리 측정값 누적기 (워커 프로세스 결과는 snapshot()/merge()로 합산)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self.shots: list[dict[str, Any]] = []
+        self.frame_hist = [0] * (len(FRAME_HIST_BUCKETS_MS) + 1)
+        self.frame_count = 0
+        self.frame_total_s = 0.0
+        self.frame_max_s = 0.0
+        self.encoded_frames = 0
+        self.encode_s = 0.0
+        self.ffmpeg_s = 0.0
+        self.peak_rss: dict[str, float] = {"self": 0.0, "children": 0.0}
+
+    @contextmanager
+    def stage(self, name: str):
+        """구간 벽시계 시간 누적"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - t0
+
+    def record_shot(self, index: int, build_s: float, **extra) -> None:
+        self.shots.append({"index": index, "build_s": round(build_s, 4), **extra})
+
+    def record_frame(self, seconds: float) -> None:
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(FRAME_HIST_BUCKETS_MS) and ms > FRAME_HIST_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.frame_hist[bucket] += 1
+        self.frame_count += 1
+        self.frame_total_s += seconds
+        self.frame_max_s = max(self.frame_max_s, seconds)
+
+    def timed_clip(self, clip):
+        """get_frame마다 합성 시간을 기록하는 클립으로 감싸기
+
+        clip.fl은 감쌀 때 크기를 재려고 t=0 프레임을 한 번 평가하므로 (그 프레임까지 집계됨)
+        QA tap_clip과 같이 make_frame만 바꾼 사본을 반환한다
+        """
+        get_frame = clip.get_frame
+
+        def timed(t):
+            t0 = time.perf_counter()
+            frame = get_frame(t)
+            self.record_frame(time.perf_counter() - t0)
+            return frame
+
+        out = clip.copy()
+        out.make_frame = timed
+        return out
+
+    def record_encode(self, frames: int, seconds: float) -> None:
+        """인코딩(ffmpeg 프로세스 수명 동안) 프레임 수와 벽시계 시간"""
+        self.encoded_frames += frames
+        self.encode_s += seconds
+        self.ffmpeg_s += seconds
+
+    def record_ffmpeg(self, seconds: float) -> None:
+        """인코딩 외 ffmpeg 호출 (세그먼트 concat 등)"""
+        self.ffmpeg_s += seconds
+
+    def sample_memory(self) -> None:
+        rss = peak_rss_mb()
+        for k, v in rss.items():
+            self.peak_rss[k] = max(self.peak_rss.get(k, 0.0), v)
+
+    def snapshot(self) -> dict[str, Any]:
+        """프로세스 간 전달용 원시 측정값"""
+        self.sample_memory()
+        return {
+            "stages": dict(self.stages),
+            "shots": list(self.shots),
+            "frame_hist": list(self.frame_hist),
+            "frame_count": self.frame_count,
+            "frame_total_s": self.frame_total_s,
+            "frame_max_s": self.frame_max_s,
+            "encoded_frames": self.encoded_frames,
+            "encode_s": self.encode_s,
+            "ffmpeg_s": self.ffmpeg_s,
+            "peak_rss": dict(self.peak_rss),
+        }
+
+    def merge(self, snap: dict[str, Any]) -> None:
+        """워커 프로세스의 snapshot() 합산 (RSS는 프로세스별 최대값)"""
+        for k, v in snap.get("stages", {}).items():
+            self.stages[k] = self.stages.get(k, 0.0) + v
+        self.shots.extend(snap.get("shots", []))
+        self.frame_hist = [a + b for a, b in zip(self.frame_hist, snap["frame_hist"], strict=True)]
+        self.frame_count += snap["frame_count"]
+        self.frame_total_s += snap["frame_total_s"]
+        self.frame_max_s = max(self.frame_max_s, snap["frame_max_s"])
+        self.encoded_frames += snap["encoded_frames"]
+        self.encode_s += snap["encode_s"]
+        self.ffmpeg_s += snap["ffmpeg_s"]
+        for k, v in snap.get("peak_rss", {}).items():
+            self.peak_rss[k] = max(self.peak_rss.get(k, 0.0), v)
+
+    def report(self) -> dict[str, Any]:
+        """JSON 저장용 요약 (초/ms/MB 단위, 소수점 정리)"""
+        self.sample_memory()
+        labels = [f"<={b}ms" for b in FRAME_HIST_BUCKETS_MS] + [f">{FRAME_HIST_BUCKETS_MS[-1]}ms"]
+        return {
+            "total_s": round(time.perf_counter() - self.started, 3),
+            "asset_load_s": round(self.stages.get("asset_load", 0.0), 4),
+            "stages_s": {k: round(v, 4) for k, v in self.stages.items()},
+            "shots": sorted(self.shots, key=lambda s: s["index"]),
+            "frames": {
+                "count": self.frame_count,
+                "mean_ms": round(1000 * self.frame_total_s / max(1, self.frame_count), 3),
+                "max_ms": round(1000 * self.frame_max_s, 3),
+                "histogram": dict(zip(labels, self.frame_hist, strict=True)),
+            },
+            "encode": {
+                "frames": self.encoded_frames,
+                "wall_s": round(self.encode_s, 3),
+                "fps": round(self.encoded_frames / self.encode_s, 2) if self.encode_s else 0.0,
+            },
+            "ffmpeg_wall_s": round(self.ffmpeg_s, 3),
+            "peak_rss_mb": {k: round(v, 1) for k, v in self.peak_rss.items()},
+        }
+
+
+def eta_seconds(elapsed: float, frac: float) -> float | None:
+    """지금까지 걸린 시간과 완료 비율로 남은 시간(초) 추정. 진행이 없으면 None"""
+    if frac <= 0:
+        return None
+    return max(0.0, elapsed * (1 - frac) / frac)
+
+
+class FrameProgressLogger(ProgressBarLogger):
+    """인코딩 중 실제로 쓴 프레임 수를 콜백(done, total)으로 전달하는 proglog 로거"""
+
+    def __init__(self, on_frames, every: int = 5):
+        super().__init__()
+        # ProgressLogger.callback은 proglog가 상태 갱신마다 부르는 훅이므로 다른 이름으로 보관
+        self.on_frames = on_frames
+        self.every = max(1, every)
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar != "t" or attr != "index":
+            return
+        total = self.bars[bar].get("total") or 1
+        done = value + 1
+        if done % self.every == 0 or done >= total:
+            self.on_frames(done, total)
@@ -2,12 +2,32 @@ import random
 from pathlib import Path
 from typing import Any
 
+import cv2
 import numpy as np
-from moviepy.editor import ColorClip, CompositeVideoClip, ImageClip, concatenate_videoclips, vfx
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+from moviepy.editor import (
+    ColorClip,
+    CompositeVideoClip,
+    ImageClip,
+    VideoClip,
+    concatenate_videoclips,
+    vfx,
+)
+from PIL import Image, ImageDraw, ImageFilter
+
+from services.grading import DEFAULT_LUT, FrameGrader
+from services.grain import FilmGrain
+from services.light_leak import LightLeak
+from services.motion import PREDOWNSCALE_RATIO
+from services.raster_cache import file_key, raster_cache, style_hash
+from utils.fonts import find_font_path, get_font
+from utils.text_layout import layout_text
 
 W, H = 1080, 1920  # 9:16
 FPS = 30
+VIGNETTE_STRENGTH = 0.35
+GRAIN_OPACITY = 0.08
+PREVIEW_FPS = 24  # 시네마틱 프리뷰 출력 fps
+KEN_BURNS_ZOOM = (1.04, 1.12)  # 줌인 (시작, 끝) 전경 배율, 줌아웃은 반대
 
 
 # ----------------- utils -----------------
@@ -16,86 +36,15 @@ def _hex_to_rgb(h: str):
     return tuple(int(h[i : i + 2], 16) for i in (0, 2, 4))
 
 
-def _ensure_rgb(frame: np.ndarray) -> np.ndarray:
-    """입력 프레임을 항상 (H, W, 3) uint8로 맞춘다."""
-    if frame.ndim == 2:  # grayscale
-        frame = np.stack([frame, frame, frame], axis=-1)
-    if frame.shape[-1] == 4:  # RGBA → RGB (알파 제거)
-        frame = frame[..., :3]
-    return frame.astype(np.uint8)
+def _post_clip(clip, *passes):
+    # 프레임 단위 후처리(apply(frame, t))를 순서대로 한 번에 적용
+    def fl(get_frame, t):
+        frame = np.asarray(get_frame(t))
+        for p in passes:
+            frame = p.apply(frame, t)
+        return frame
 
-
-def _apply_cinematic_grade(frame: np.ndarray) -> np.ndarray:
-    frame = _ensure_rgb(frame)
-    arr = frame.astype(np.float32)
-
-    # 픽셀 단위(2D) 루미넌스 마스크
-    lum = 0.299 * arr[..., 0] + 0.587 * arr[..., 1] + 0.114 * arr[..., 2]
-    sh_mask = lum < 96
-    hi_mask = lum > 190
-
-    # 채널까지 명시해서 브로드캐스팅 안정화
-    arr[sh_mask, :] = arr[sh_mask, :] * np.array(
-        [0.92, 1.00, 0.98], dtype=np.float32
-    )  # 살짝 시원한 섀도우
-    arr[hi_mask, :] = np.minimum(
-        255.0,
-        arr[hi_mask, :] * np.array([1.06, 1.02, 0.98], dtype=np.float32),  # 따뜻한 하이라이트
-    )
-
-    # 약간의 콘트라스트/채도
-    arr = np.clip(arr, 0, 255).astype(np.uint8)
-    img = Image.fromarray(arr, mode="RGB")
-    img = ImageEnhance.Contrast(img).enhance(1.08)
-    img = ImageEnhance.Color(img).enhance(1.06)
-    return np.array(img, dtype=np.uint8)
-
-
-def _add_vignette(frame: np.ndarray, strength: float = 0.35) -> np.ndarray:
-    frame = _ensure_rgb(frame)
-    h, w = frame.shape[:2]
-    y, x = np.ogrid[:h, :w]
-    cx, cy = w / 2.0, h / 2.0
-    dist = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
-    mask = dist / (dist.max() + 1e-6)
-    vignette = 1.0 - strength * (mask**1.5)
-
-    out = frame.astype(np.float32)
-    out *= vignette[..., None]  # (H, W, 1)로 명시
-    return np.clip(out, 0, 255).astype(np.uint8)
-
-
-def _grain_clip(dur: float, opacity: float = 0.08, scale: int = 1):
-    # 매 프레임 노이즈 생성 → 필름그레인 느낌
-    def make_frame(t):
-        noise = np.random.normal(0.0, 8.0, (H // scale, W // scale, 1)).astype(np.float32) + 128
-        noise = np.clip(noise, 0, 255).astype(np.uint8)
-        noise = np.repeat(np.repeat(noise, scale, axis=0), scale, axis=1)
-        noise = np.repeat(noise, 3, axis=2)
-        return noise
-
-    return (
-        ImageClip(make_frame(0))
-        .set_make_frame(make_frame)
-        .set_opacity(opacity)
-        .set_duration(float(dur))
-    )
-
-
-def _light_leak_clip(dur: float, color=(255, 180, 80), move=True, opacity=0.12):
-    # 라디얼 그라디언트 생성 후 천천히 이동
-    base = Image.new("RGBA", (W * 2, H * 2), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(base)
-    for r in range(max(W, H), 0, -20):
-        a = int(255 * (r / max(W, H)) ** 2)
-        draw.ellipse([W - r, H - r, W + r, H + r], fill=(color[0], color[1], color[2], a // 10))
-    base = base.filter(ImageFilter.GaussianBlur(radius=90))
-    leak = ImageClip(np.array(base)).set_duration(float(dur)).set_opacity(opacity)
-    if move:
-        leak = leak.set_position(lambda t: (int(-W + t * 30), int(-H + t * 18)))
-    else:
-        leak = leak.set_position((-W, -H))
-    return leak
+    return clip.fl(fl)
 
 
 def _fill_blur_bg(img: Image.Image) -> Image.Image:
@@ -104,21 +53,6 @@ def _fill_blur_bg(img: Image.Image) -> Image.Image:
     return img.filter(ImageFilter.GaussianBlur(radius=15))
 
 
-def _fit_to_canvas(img: Image.Image, size: tuple) -> Image.Image:
-    # 비율 유지하면서 캔버스에 맞춤
-    w, h = size
-    img_w, img_h = img.size
-    scale = min(w / img_w, h / img_h) * 1.1  # 살짝 크게
-    new_w, new_h = int(img_w * scale), int(img_h * scale)
-    img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-
-    # 중앙에 배치
-    canvas = Image.new("RGB", (w, h), (0, 0, 0))
-    x, y = (w - new_w) // 2, (h - new_h) // 2
-    canvas.paste(img, (x, y))
-    return canvas
-
-
 def list_ref_images(ref_dir: Path) -> list[Path]:
     # 레퍼런스 이미지 목록 반환
     if not ref_dir.exists():
@@ -128,43 +62,8 @@ def list_ref_images(ref_dir: Path) -> list[Path]:
 
 
 def _find_font_path(pref_family: str | None = None) -> str | None:
-    # Windows / macOS / Linux 후보 경로 (한글 가독용 말굽/나눔/애플/Noto/Arial)
-    candidates = []
-    if pref_family:
-        pref_family = pref_family.lower()
-    candidates += [
-        "C:/Windows/Fonts/malgun.ttf",
-        "C:/Windows/Fonts/malgunsl.ttf",
-        "C:/Windows/Fonts/arial.ttf",
-        "/System/Library/Fonts/AppleSDGothicNeo.ttc",
-        "/Library/Fonts/Arial.ttf",
-        "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
-        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-    ]
-    for p in candidates:
-        if Path(p).exists():
-            return p
-    return None
-
-
-def _text_width(text: str, font: ImageFont.FreeTypeFont) -> int:
-    dummy = Image.new("RGB", (10, 10))
-    draw = ImageDraw.Draw(dummy)
-    return int(draw.textlength(text, font=font))  # getsize 대신 textlength 사용
-
-
-def _wrap_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
-    lines, cur = [], ""
-    for ch in text:
-        if _text_width(cur + ch, font) <= max_width:
-            cur += ch
-        else:
-            if cur:
-                lines.append(cur)
-            cur = ch
-    if cur:
-        lines.append(cur)
-    return "\n".join(lines)
+    # 폰트 레지스트리에서 1회만 해석 (utils/fonts.py)
+    return find_font_path(pref_family)
 
 
 def _make_caption_image(text: str, width: int, style: dict[str, Any], pos: str) -> Image.Image:
@@ -177,23 +76,15 @@ def _make_caption_image(text: str, width: int, style: dict[str, Any], pos: str)
 
     font_path = _find_font_path(font_family)
     fs = 64 if pos == "center" else 54
-    try:
-        font = ImageFont.truetype(font_path, int(fs)) if font_path else ImageFont.load_default()
-    except Exception:
-        font = ImageFont.load_default()
+    font = get_font(font_path, int(fs))
 
     width = int(width)
     pad_x, pad_y = 28, 18
     text_w = int(width - pad_x * 2)
 
-    wrapped = _wrap_text(text or " ", font, text_w)
-
-    # 텍스트 박스 크기 계산 (정수로!)
-    dummy = Image.new("RGBA", (width, 1000), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(dummy)
-    bbox = draw.multiline_textbbox((0, 0), wrapped, font=font, spacing=6, align="center")
-    tw = int(bbox[2] - bbox[0])
-    th = int(bbox[3] - bbox[1])
+    # 줄바꿈 + 박스 크기 (글리프 advance 캐시, 한글은 음절/라틴은 단어 단위)
+    layout = layout_text(text or " ", font, text_w, spacing=6, align="center")
+    tw, th = layout.size
 
     box_w = int(tw + pad_x * 2)
     box_h = int(th + pad_y * 2)
@@ -211,7 +102,7 @@ def _make_caption_image(text: str, width: int, style: dict[str, Any], pos: str)
     fg = _hex_to_rgb(fg_hex)
     draw.multiline_text(
         (int(pad_x), int(pad_y)),
-        wrapped,
+        layout.text,
         font=font,
         fill=(int(fg[0]), int(fg[1]), int(fg[2]), 255),
         spacing=6,
@@ -221,10 +112,18 @@ def _make_caption_image(text: str, width: int, style: dict[str, Any], pos: str)
     return img
 
 
+def _caption_raster(text: str, width: int, style: dict[str, Any], pos: str) -> np.ndarray:
+    # 자막 RGBA 배열 (텍스트 + 폭 + 위치 + 자막 관련 스타일 해시 키로 메모)
+    looks = {k: style.get(k) for k in ("font", "caption", "cta_style")}
+    key = ("caption", text, int(width), pos, style_hash(looks))
+    return raster_cache().get_or_create(
+        key, lambda: np.array(_make_caption_image(text, width, style, pos))
+    )
+
+
 def _caption_clip(text: str, style: dict[str, Any], pos: str, dur: float) -> ImageClip:
     width = int(W * 0.86)
-    pil = _make_caption_image(text or " ", width, style, pos)
-    np_img = np.array(pil)
+    np_img = _caption_raster(text or " ", width, style, pos)
     clip = ImageClip(np_img).set_duration(float(dur))
 
     y = int(H * 0.78) if pos == "center" else int(H * 0.87)
@@ -232,15 +131,32 @@ def _caption_clip(text: str, style: dict[str, Any], pos: str, dur: float) -> Ima
     return clip
 
 
+def _ken_burns_source(img_path: Path) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+    # (블러 배경, 1회 축소한 전경 원본, 원본 크기). 경로 + mtime 키로 메모해서 같은 이미지는 다시 열지 않음
+    def build():
+        base = Image.open(img_path).convert("RGB")
+        iw, ih = base.size
+        bg = np.asarray(_fill_blur_bg(base))
+        # 가장 크게 보일 때도 출력 픽셀당 원본 2픽셀 이상 남도록 한 번만 축소
+        src = np.asarray(base)
+        f = PREDOWNSCALE_RATIO * min(W / iw, H / ih) * 1.1 * max(KEN_BURNS_ZOOM)
+        if f < 1.0:
+            dsize = (max(1, round(iw * f)), max(1, round(ih * f)))
+            src = cv2.resize(src, dsize, interpolation=cv2.INTER_AREA)
+        return bg, src, (iw, ih)
+
+    return raster_cache().get_or_create(("ken_burns", *file_key(img_path), W, H), build)
+
+
 def ken_burns_clip(
-    img_path: Path, dur: float, mode: str = "in", pan: str = "auto"
-) -> CompositeVideoClip:
-    base = Image.open(img_path).convert("RGB")
-    bg = _fill_blur_bg(base)
-    fg_canvas = _fit_to_canvas(base, (W, H)).convert("RGB")
+    img_path: Path, dur: float, mode: str = "in", pan: str = "auto", lut: str = DEFAULT_LUT
+) -> VideoClip:
+    # 블러 배경 위에 전경(비율 유지 맞춤 1.1배, 가운데)을 ease-out 줌/세로 팬으로 올린 샷.
+    # 캔버스/리사이즈 중간 이미지 없이 프레임마다 원본에서 cv2.warpAffine 1번으로 출력 버퍼에 그리고
+    # 색보정 + 비네트 융합 패스 적용 (기존 정수 크기/위치 계산은 그대로)
+    bg, src, (iw, ih) = _ken_burns_source(img_path)
 
-    fg_start = 1.04 if mode == "in" else 1.12
-    fg_end = 1.12 if mode == "in" else 1.04
+    fg_start, fg_end = KEN_BURNS_ZOOM if mode == "in" else KEN_BURNS_ZOOM[::-1]
 
     if pan == "auto":
         pan = random.choice(["lr", "rl", "tb", "bt", "none"])
@@ -250,37 +166,72 @@ def ken_burns_clip(
         return fg_start + (fg_end - fg_start) * (1 - (1 - p) * (1 - p))  # ease-out
 
     def mover(t):
-        px, py, shift = 0, 0, 28
+        # 가로 팬(lr/rl)은 기존처럼 가운데 고정, 세로 팬만 위치를 옮긴다
+        py, shift = 0, 28
         p = t / max(dur, 0.001)
-        if pan == "lr":
-            px = -shift + 2 * shift * p
-        if pan == "rl":
-            px = shift - 2 * shift * p
         if pan == "tb":
             py = shift - 2 * shift * p
         if pan == "bt":
             py = -shift + 2 * shift * p
         return ("center", int(H / 2 + py))
 
-    bg_clip = ImageClip(np.array(bg)).set_duration(float(dur))
-    fg_clip = (
-        ImageClip(np.array(fg_canvas))
-        .resize(lambda t: scaler(t))
-        .set_position(mover)
-        .set_duration(float(dur))
-    )
+    # 전경 캔버스 안의 이미지 배치 (비율 유지 맞춤 × 1.1, 가운데 정렬 정수 오프셋)
+    k = min(W / iw, H / ih) * 1.1
+    nw, nh = int(iw * k), int(ih * k)
+    cx0, cy0 = (W - nw) // 2, (H - nh) // 2
+    # 캔버스 안에 보이는 이미지 영역 (나머지는 검은 여백)
+    vx0, vy0, vx1, vy1 = max(cx0, 0), max(cy0, 0), min(cx0 + nw, W), min(cy0 + nh, H)
+    covers = (vx0, vy0, vx1, vy1) == (0, 0, W, H)
 
-    base_clip = CompositeVideoClip([bg_clip, fg_clip], size=(W, H))
-    # 프레임별 색보정 + 비네트
-    base_clip = base_clip.fl_image(_apply_cinematic_grade).fl_image(_add_vignette)
-    return base_clip
+    sx, sy = nw / src.shape[1], nh / src.shape[0]  # 원본 픽셀 → 캔버스 픽셀
+
+    out = np.empty((H, W, 3), dtype=np.uint8)
+    grade = FrameGrader(lut, VIGNETTE_STRENGTH)
+
+    def make_frame(t):
+        s = scaler(t)
+        ws, hs = int(W * s), int(H * s)  # moviepy resize와 같은 정수 크기
+        x0, y0 = int((W - ws) / 2), mover(t)[1]
+        zx, zy = ws / W, hs / H  # 캔버스 → 출력
+
+        np.copyto(out, bg)
+        fx0, fy0, fx1, fy1 = max(x0, 0), max(y0, 0), min(x0 + ws, W), min(y0 + hs, H)
+        if fx0 >= fx1 or fy0 >= fy1:
+            return grade(out)
+        if covers:
+            rx0, ry0, rx1, ry1 = fx0, fy0, fx1, fy1
+        else:
+            out[fy0:fy1, fx0:fx1] = 0
+            rx0, ry0 = max(fx0, x0 + round(vx0 * zx)), max(fy0, y0 + round(vy0 * zy))
+            rx1, ry1 = min(fx1, x0 + round(vx1 * zx)), min(fy1, y0 + round(vy1 * zy))
+        if rx0 < rx1 and ry0 < ry1:
+            # 픽셀 중심 기준: X + 0.5 = x0 + (cx0 + (u + 0.5) * sx) * zx
+            M = np.array(
+                [
+                    [sx * zx, 0.0, x0 + (cx0 + 0.5 * sx) * zx - 0.5 - rx0],
+                    [0.0, sy * zy, y0 + (cy0 + 0.5 * sy) * zy - 0.5 - ry0],
+                ]
+            )
+            region = out[ry0:ry1, rx0:rx1]
+            warped = cv2.warpAffine(
+                src,
+                M,
+                (rx1 - rx0, ry1 - ry0),
+                dst=region,
+                flags=cv2.INTER_LINEAR,
+                borderMode=cv2.BORDER_REPLICATE,
+            )
+            if not np.shares_memory(warped, region):
+                np.copyto(region, warped)
+        return grade(out)
+
+    return VideoClip(make_frame, duration=float(dur))
 
 
 def caption_animated(text: str, style: dict[str, Any], pos: str, dur: float) -> ImageClip:
     # 하단 미니멀 로워서드 스타일
     width = int(W * 0.9)
-    pil = _make_caption_image(text or " ", width, style, pos)
-    np_img = np.array(pil)
+    np_img = _caption_raster(text or " ", width, style, pos)
     clip = ImageClip(np_img).set_duration(float(dur))
 
     y = int(H * 0.9)  # 하단 고정
@@ -289,8 +240,12 @@ def caption_animated(text: str, style: dict[str, Any], pos: str, dur: float) ->
 
 
 # ----------------- renderer -----------------
-def render_preview(shots, style, overlays, out_path: Path, crossfade: float = 0.3) -> Path:
+def render_preview(
+    shots, style, overlays, out_path: Path, crossfade: float = 0.3, lut: str | None = None
+) -> Path:
     palette = style.get("palette", ["#161616", "#222", "#333"])
+    # 색보정 LUT: 인자 > style.lut > style.globals.lut (레시피 globals 형식) > 기본값
+    lut = lut or style.get("lut") or style.get("globals", {}).get("lut") or DEFAULT_LUT
     ref_imgs = list_ref_images(Path(__file__).resolve().parents[1] / "outputs" / "refs")
     clips = []
 
@@ -300,13 +255,14 @@ def render_preview(shots, style, overlays, out_path: Path, crossfade: float = 0.
             img_path = ref_imgs[i % len(ref_imgs)]
             mode = "in" if s.get("type") in ["intro", "value", "middle", None] else "out"
             pan = "auto"
-            base = ken_burns_clip(img_path, dur, mode=mode, pan=pan)
+            base = ken_burns_clip(img_path, dur, mode=mode, pan=pan, lut=lut)
         else:
             base = ColorClip((W, H), color=_hex_to_rgb(palette[i % len(palette)])).set_duration(dur)
 
-        # 라이트리크/그레인
-        leak = _light_leak_clip(dur)
-        grain = _grain_clip(dur)
+        # 라이트리크 + 그레인 (캐시된 리크는 화면과 겹치는 부분만, 그레인은 텍스처 뱅크 뷰를 바로 블렌딩)
+        leak = LightLeak(dur, (W, H))
+        grain = FilmGrain(GRAIN_OPACITY, fps=PREVIEW_FPS, frame_offset=i * 97)
+        graded = _post_clip(base, leak, grain)
 
         # 자막 (하단 미니멀 로워서드)
         ov = overlays[i] if i < len(overlays) else {"text": s.get("caption", ""), "pos": "center"}
@@ -318,7 +274,7 @@ def render_preview(shots, style, overlays, out_path: Path, crossfade: float = 0.
         cap = caption_animated(ov.get("text", ""), cap_style, "bottom", dur)
 
         clip = (
-            CompositeVideoClip([base, leak, grain, cap], size=(W, H))
+            CompositeVideoClip([graded, cap], size=(W, H))
             .set_duration(dur)
             .fx(vfx.fadein, crossfade / 2)
             .fx(vfx.fadeout, crossfade / 2)
@@ -330,6 +286,8 @@ def render_preview(shots, style, overlays, out_path: Path, crossfade: float = 0.
     final = concatenate_videoclips(clips, method="compose")
     out_path.parent.mkdir(parents=True, exist_ok=True)
     # 시네마틱은 24fps 권장 (로그 출력 억제)
-    final.write_videofile(str(out_path), fps=24, codec="libx264", audio=False, logger=None)
+    final.write_videofile(
+        str(out_path), fps=PREVIEW_FPS, codec="libx264", audio=False, logger=None
+    )
     final.close()  # 파일 잠김 방지
     return out_path
@@ -0,0 +1,152 @@
+"""
+S4-1. 샷 세그먼트 캐시
+샷 단위로 인코딩한 중간 세그먼트(mp4)를 내용 해시로 캐싱하고,
+ffmpeg concat demuxer로 이어붙여 최종 mp4 생성
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+
+# 캐시 기본 위치 (출력 디렉토리 하위)
+SEGMENT_CACHE_DIRNAME = ".segment_cache"
+SEGMENT_CACHE_MAX_ENTRIES = 256
+
+
+def ffmpeg_binary() -> str:
+    """moviepy와 같은 ffmpeg 바이너리 경로 반환"""
+    try:
+        from moviepy.config import get_setting
+
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        return "ffmpeg"
+
+
+def file_fingerprint(path: str | None) -> dict[str, Any]:
+    """파일 지문 (경로 + 크기 + 수정시각). 파일이 없으면 missing 표시"""
+    if not path:
+        return {"path": None, "missing": True}
+    try:
+        st = os.stat(path)
+        return {"path": str(Path(path).resolve()), "size": st.st_size, "mtime": st.st_mtime_ns}
+    except OSError:
+        return {"path": str(path), "missing": True}
+
+
+def segment_key(
+    shot: dict[str, Any],
+    asset_paths: list[str | None],
+    encode_settings: dict[str, Any],
+    extra: dict[str, Any] | None = None,
+) -> str:
+    """샷 dict + 참조 자산 지문 + 인코딩 설정으로 세그먼트 캐시 키 생성"""
+    payload = {
+        "shot": shot,
+        "assets": [file_fingerprint(p) for p in asset_paths],
+        "encode": encode_settings,
+        "extra": extra or {},
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SegmentCache:
+    """키 → 세그먼트 mp4 + 메타(json) 저장소"""
+
+    def __init__(self, root: str | Path, max_entries: int = SEGMENT_CACHE_MAX_ENTRIES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}.mp4"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def temp_path_for(self, key: str) -> Path:
+        """인코딩 중 임시 경로 (완료 후 commit으로 원자적 교체)"""
+        return self.root / f"{key}.{os.getpid()}.part.mp4"
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """캐시 적중 시 메타 반환 (path, duration 등)"""
+        seg, meta_path = self.path_for(key), self._meta_path(key)
+        if not (seg.exists() and meta_path.exists() and seg.stat().st_size > 0):
+            self.misses += 1
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except Exception:
+            self.misses += 1
+            return None
+        # LRU 정리를 위해 사용 시각 갱신
+        os.utime(seg, None)
+        self.hits += 1
+        meta["path"] = str(seg)
+        return meta
+
+    def commit(self, key: str, temp_path: str | Path, meta: dict[str, Any]) -> dict[str, Any]:
+        """임시 세그먼트를 캐시에 등록"""
+        seg = self.path_for(key)
+        os.replace(temp_path, seg)
+        with open(self._meta_path(key), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        return {**meta, "path": str(seg)}
+
+    def prune(self, keep: set[str] | None = None) -> int:
+        """오래된 세그먼트부터 삭제해 max_entries 이하로 유지. 삭제 개수 반환"""
+        keep = keep or set()
+        segs = sorted(self.root.glob("*.mp4"), key=lambda p: p.stat().st_mtime)
+        segs = [p for p in segs if ".part" not in p.name]
+        removed = 0
+        for seg in segs[: max(0, len(segs) - self.max_entries)]:
+            if seg.stem in keep:
+                continue
+            seg.unlink(missing_ok=True)
+            self._meta_path(seg.stem).unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+def concat_segments(segment_paths: list[str], output_path: str) -> None:
+    """ffmpeg concat demuxer로 세그먼트 스트림 복사 결합 (재인코딩 없음)"""
+    if not segment_paths:
+        raise ValueError("concat할 세그먼트가 없습니다.")
+
+    out = Path(output_path)
+    list_path = out.with_name(f"{out.stem}.concat.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for p in segment_paths:
+            safe = Path(p).resolve().as_posix().replace("'", "'\\''")
+            f.write(f"file '{safe}'\n")
+
+    cmd = [
+        ffmpeg_binary(),
+        "-y",
+        "-loglevel",
+        "error",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-i",
+        str(list_path),
+        "-c",
+        "copy",
+        "-movflags",
+        "+faststart",
+        str(out),
+    ]
+    try:
+        p = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", errors="ignore")
+        if p.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat 실패 rc={p.returncode}: {p.stderr.strip()[:500]}")
+    finally:
+        list_path.unlink(missing_ok=True)
@@ -0,0 +1,239 @@
+"""
+S4-2. 플랫 타임라인 합성기
+모든 샷 클립 + 전환 정보를 한 번에 받아서,
+각 프레임 시점에 활성화된 1~2개 샷만 평가하는 단일 패스 합성
+(create_transition_effect를 반복 중첩하면 샷 수만큼 합성 깊이가 늘어나는 문제 해결)
+StreamingTimelineClip은 샷을 활성 구간에서만 열어 긴 타임라인도 메모리/리더 수가 일정
+"""
+
+import contextlib
+from bisect import bisect_right
+from collections.abc import Callable
+
+import numpy as np
+from moviepy.editor import VideoClip
+
+# 전환 종류: 겹침 없는 전환(fade: 블랙 경유, cut)
+#           겹침 전환(cross: 크로스페이드, slide: 우→좌 슬라이드)
+#           겹침 전환도 샷 시작 시각은 바꾸지 않고,
+#           들어오는 샷 앞부분에서 이전 샷 마지막 프레임과 섞는다 (세그먼트 렌더/SRT와 같은 타이밍)
+OVERLAP_TRANSITIONS = ("cross", "slide")
+TRANSITIONS = ("fade", "cut", *OVERLAP_TRANSITIONS)
+DEFAULT_TRANSITION_SEC = 0.5
+
+
+class TimelineClip(VideoClip):
+    """샷 클립 목록을 평평한 타임라인으로 합성하는 VideoClip
+
+    transitions[i]는 clips[i] → clips[i+1] 경계의 전환 종류,
+    durations[i]는 그 전환의 길이(초). 샷은 전환과 무관하게 이어서 배치하고(총 길이 = 샷 길이 합),
+    겹침 전환은 clips[i+1]의 처음 durations[i]초 동안 clips[i]의 마지막 프레임과 블렌딩한다.
+    """
+
+    def __init__(
+        self,
+        clips: list[VideoClip],
+        transitions: list[str] | None = None,
+        durations: list[float] | None = None,
+        size: tuple[int, int] | None = None,
+    ):
+        if not clips:
+            raise ValueError("TimelineClip에는 최소 1개의 클립이 필요합니다.")
+
+        self.clips = clips
+        self._layout([float(c.duration) for c in clips], transitions, durations)
+        VideoClip.__init__(self, make_frame=self._make_frame, duration=self.ends[-1])
+        self.size = tuple(size or clips[0].size)
+
+    def _layout(
+        self,
+        shot_durations: list[float],
+        transitions: list[str] | None,
+        durations: list[float] | None,
+    ) -> None:
+        """샷 길이와 전환 정보로 각 샷의 시작/끝 시각 계산 (전환 종류와 무관하게 이어 붙임)"""
+        n = len(shot_durations)
+        self.shot_durations = shot_durations
+        self.transitions = list(transitions or ["fade"] * (n - 1))
+        self.transition_durations = list(durations or [DEFAULT_TRANSITION_SEC] * (n - 1))
+        if len(self.transitions) != n - 1 or len(self.transition_durations) != n - 1:
+            raise ValueError("transitions/durations 길이는 클립 수 - 1 이어야 합니다.")
+
+        self.starts = [0.0]
+        for i in range(1, n):
+            self.starts.append(self.starts[-1] + shot_durations[i - 1])
+        self.ends = [s + d for s, d in zip(self.starts, shot_durations, strict=True)]
+
+    def _overlap(self, boundary: int) -> float:
+        """경계 boundary(샷 boundary → boundary+1)의 겹침 블렌딩 길이 (들어오는 샷 시작부터)"""
+        if self.transitions[boundary] not in OVERLAP_TRANSITIONS:
+            return 0.0
+        limit = min(self.shot_durations[boundary], self.shot_durations[boundary + 1])
+        return float(min(self.transition_durations[boundary], limit))
+
+    def _clip(self, i: int) -> VideoClip:
+        return self.clips[i]
+
+    def active_indices(self, t: float) -> list[int]:
+        """시각 t에 활성화된 샷 인덱스 (최대 2개, 시작 순)
+
+        겹침 전환 구간이면 이전 샷(마지막 프레임 고정)과 들어오는 샷
+        """
+        i = max(0, bisect_right(self.starts, t) - 1)
+        if i > 0 and t < self.starts[i] + self._overlap(i - 1):
+            return [i - 1, i]
+        return [i]
+
+    def _local_time(self, i: int, t: float) -> float:
+        return min(max(t - self.starts[i], 0.0), self.shot_durations[i] - 1e-6)
+
+    def _raw_frame(self, i: int, local: float) -> np.ndarray:
+        return np.asarray(self._clip(i).get_frame(local))[..., :3]
+
+    def _fade(self, i: int, local: float, frame: np.ndarray) -> np.ndarray:
+        """겹침 없는 fade 전환의 블랙 페이드 적용"""
+        gain = 1.0
+        if i > 0 and self.transitions[i - 1] == "fade":
+            d = self.transition_durations[i - 1]
+            if local < d:
+                gain *= local / d
+        if i < len(self.shot_durations) - 1 and self.transitions[i] == "fade":
+            d = self.transition_durations[i]
+            remain = self.shot_durations[i] - local
+            if remain < d:
+                gain *= remain / d
+        if gain < 1.0:
+            frame = (frame * max(gain, 0.0)).astype(np.uint8)
+        return frame
+
+    def _blend(self, active: list[int], frames: list[np.ndarray], t: float) -> np.ndarray:
+        """활성 샷 프레임들을 전환 규칙대로 합성"""
+        if len(active) == 1:
+            return frames[0]
+
+        a, b = active
+        kind = self.transitions[a]
+        overlap = self._overlap(a)
+        p = min(max((t - self.starts[b]) / max(overlap, 1e-6), 0.0), 1.0)
+        out_frame, in_frame = frames
+
+        if kind == "slide":
+            # 다음 샷이 오른쪽에서 밀려 들어옴
+            W = out_frame.shape[1]
+            x = int(round(W * (1.0 - p)))
+            frame = out_frame.copy()
+            if x < W:
+                frame[:, x:] = in_frame[:, : W - x]
+            return frame
+
+        # cross: 선형 크로스페이드
+        blended = out_frame.astype(np.float32) * (1.0 - p) + in_frame.astype(np.float32) * p
+        return blended.astype(np.uint8)
+
+    def _prepare(self, active: list[int]) -> None:
+        """프레임 평가 직전 훅 (활성 샷 목록)"""
+
+    def frames_at(
+        self, t: float, shot_filters: list[list[Callable | None]] | None = None
+    ) -> list[np.ndarray]:
+        """시각 t의 합성 프레임을 필터 세트별로 (활성 샷 원본 프레임은 1번만 평가)
+
+        shot_filters[k][i]는 k번째 출력에서 샷 i의 원본 프레임에 적용할 함수 (원본을 수정하지 않고
+        새 배열 반환, None이면 그대로). 필터는 전환(페이드/크로스페이드) 전에 적용된다
+        """
+        active = self.active_indices(t)
+        self._prepare(active)
+        raw = [(i, self._local_time(i, t)) for i in active]
+        raw = [(i, local, self._raw_frame(i, local)) for i, local in raw]
+
+        outputs = []
+        for filters in shot_filters or [None]:
+            frames = []
+            for i, local, frame in raw:
+                f = filters[i] if filters else None
+                frames.append(self._fade(i, local, f(frame) if f is not None else frame))
+            outputs.append(self._blend(active, frames, t))
+        return outputs
+
+    def _make_frame(self, t: float) -> np.ndarray:
+        return self.frames_at(t)[0]
+
+    def close(self) -> None:
+        """하위 샷 클립까지 모두 닫기"""
+        for clip in self.clips:
+            with contextlib.suppress(Exception):
+                clip.close()
+        super().close()
+
+
+class StreamingTimelineClip(TimelineClip):
+    """샷을 필요할 때만 여는 플랫 타임라인 (메모리/리더 프로세스 수가 타임라인 길이와 무관)
+
+    open_shot(i)는 (샷 클립, 해제 함수)를 반환한다. 샷이 활성화되기 직전에 열고,
+    활성 구간을 벗어나면 바로 해제하므로 동시에 열려 있는 샷은 전환 구간의 최대 2개다.
+    샷 길이는 미리 계획한 shot_durations를 따른다 (열린 클립 길이가 달라도 타임라인은 고정)
+    on_close는 샷을 모두 해제한 뒤 호출된다 (타임라인 단위 리더 풀 닫기 등)
+    """
+
+    def __init__(
+        self,
+        open_shot: Callable[[int], tuple[VideoClip, Callable[[], None]]],
+        shot_durations: list[float],
+        transitions: list[str] | None = None,
+        durations: list[float] | None = None,
+        size: tuple[int, int] = (1080, 1920),
+        on_close: Callable[[], None] | None = None,
+    ):
+        if not shot_durations:
+            raise ValueError("StreamingTimelineClip에는 최소 1개의 샷이 필요합니다.")
+
+        self.open_shot = open_shot
+        self.on_close = on_close
+        self.loaded: dict[int, tuple[VideoClip, Callable[[], None]]] = {}
+        self.opened_count = 0
+        self.max_loaded = 0
+        self._layout([float(d) for d in shot_durations], transitions, durations)
+        VideoClip.__init__(self, make_frame=self._make_frame, duration=self.ends[-1])
+        self.size = tuple(size)
+
+    def _clip(self, i: int) -> VideoClip:
+        if i not in self.loaded:
+            self.loaded[i] = self.open_shot(i)
+            self.opened_count += 1
+            self.max_loaded = max(self.max_loaded, len(self.loaded))
+        return self.loaded[i][0]
+
+    def release(self, i: int) -> None:
+        """샷 i의 클립과 소스 리더 해제"""
+        entry = self.loaded.pop(i, None)
+        if entry is None:
+            return
+        clip, release = entry
+        with contextlib.suppress(Exception):
+            clip.close()
+        release()
+
+    def _prepare(self, active: list[int]) -> None:
+        for i in [i for i in self.loaded if i not in active]:
+            self.release(i)
+
+    def close(self) -> None:
+        """열려 있는 샷 전부 해제"""
+        for i in list(self.loaded):
+            self.release(i)
+        if self.on_close is not None:
+            self.on_close()
+            self.on_close = None
+        VideoClip.close(self)
+
+
+def compose_timeline(
+    clips: list[VideoClip],
+    transitions: list[str] | None = None,
+    durations: list[float] | None = None,
+    size: tuple[int, int] | None = None,
+) -> VideoClip:
+    """샷 클립들을 플랫 타임라인으로 합성 (클립 1개면 그대로 반환)"""
+    if len(clips) == 1:
+        return clips[0]
+    return TimelineClip(clips, transitions, durations, size)
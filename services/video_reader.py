@@ -0,0 +1,169 @@
+"""
+S4-5. 디코드 단계 스케일/크롭/fps 변환 리더
+ffmpeg 필터(fps → scale → crop)로 영상 소스를 캔버스 크기(fit:cover)와 출력 fps로 바로 받아온다.
+fit_cover(clip.resize().crop())처럼 원본 해상도(폰 4K 등) 프레임을 파이썬에서
+매 프레임 리사이즈하지 않고,
+출력에 쓰이지 않을 프레임은 스케일되지도, 파이프로 넘어오지도 않는다
+"""
+
+import os
+import subprocess
+from typing import Any
+
+import numpy as np
+from moviepy.editor import VideoClip
+from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+from services.asset_manifest import reader_infos
+from services.segment_cache import ffmpeg_binary
+
+
+def cover_filter(src_size: tuple[int, int], size: tuple[int, int], fps: float) -> str:
+    """fit:cover와 같은 결과를 내는 ffmpeg 필터 그래프
+
+    축소는 area, 확대는 bilinear (moviepy resize와 동일)
+
+    fps를 먼저 적용해서 출력 fps로 버려질 원본 프레임은 스케일하지 않는다
+    """
+    W, H = size
+    w, h = src_size
+    scale = max(W / w, H / h)
+    flags = "area" if scale < 1 else "bilinear"
+    return (
+        f"fps={fps},scale={W}:{H}:force_original_aspect_ratio=increase:flags={flags},"
+        f"crop={W}:{H}"
+    )
+
+
+class CoverVideoReader:
+    """필터가 적용된 rgb24 프레임을 순차로 읽는 ffmpeg 리더
+
+    탐색 규칙은 moviepy FFMPEG_VideoReader와 같다
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        size: tuple[int, int],
+        fps: float,
+        infos: dict[str, Any] | None = None,
+    ):
+        # 자산 매니페스트에 probe 결과가 있으면 ffmpeg 헤더 파싱 생략
+        infos = infos or reader_infos(filename) or ffmpeg_parse_infos(filename)
+        self.filename = filename
+        self.size = (int(size[0]), int(size[1]))
+        self.fps = float(fps)
+        self.duration = float(infos.get("video_duration") or infos.get("duration") or 0.0)
+        self.nframes = int(self.duration * self.fps)
+        self.src_frame = 1.0 / float(infos.get("video_fps") or self.fps)
+
+        src_w, src_h = infos["video_size"]
+        if infos.get("video_rotation") in (90, 270):
+            src_w, src_h = src_h, src_w
+        self.vf = cover_filter((src_w, src_h), self.size, self.fps)
+
+        self.nbytes = self.size[0] * self.size[1] * 3
+        self.proc = None
+        self.pos = 0
+        self.lastread: np.ndarray | None = None
+
+    def initialize(self, starttime: float = 0) -> None:
+        """starttime부터 읽는 ffmpeg 프로세스 시작"""
+        self.close()
+        i_arg = ["-i", self.filename]
+        if starttime:
+            i_arg = ["-ss", f"{starttime:.06f}", *i_arg]
+        cmd = (
+            [ffmpeg_binary(), "-loglevel", "error"]
+            + i_arg
+            + ["-an", "-vf", self.vf, "-f", "rawvideo", "-pix_fmt", "rgb24", "-"]
+        )
+        popen_params = {
+            "bufsize": self.nbytes + 100,
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.DEVNULL,
+            "stdin": subprocess.DEVNULL,
+        }
+        if os.name == "nt":
+            popen_params["creationflags"] = 0x08000000
+        self.proc = subprocess.Popen(cmd, **popen_params)
+
+    def read_frame(self) -> np.ndarray:
+        data = self.proc.stdout.read(self.nbytes)
+        if len(data) != self.nbytes:
+            # 끝을 넘어가면 마지막 유효 프레임 재사용 (moviepy와 동일)
+            if self.lastread is None:
+                raise OSError(f"failed to read the first frame of video file {self.filename}")
+            return self.lastread
+        W, H = self.size
+        self.lastread = np.frombuffer(data, dtype=np.uint8).reshape(H, W, 3)
+        return self.lastread
+
+    def skip_frames(self, n: int = 1) -> None:
+        for _ in range(n):
+            self.proc.stdout.read(self.nbytes)
+        self.pos += n
+
+    def get_frame(self, t: float) -> np.ndarray:
+        pos = int(self.fps * t + 0.00001) + 1
+        if pos > self.nframes > 0:
+            # 끝을 넘는 시각은 마지막 프레임으로 (끝 너머로 탐색하면 읽을 프레임이 없음)
+            pos = self.nframes
+            t = (pos - 1) / self.fps
+
+        if not self.proc:
+            self.initialize(t)
+            self.pos = pos
+            self.lastread = None
+            try:
+                return self.read_frame()
+            except OSError:
+                if t <= 0:
+                    raise
+                # 원본 fps가 더 낮으면 끝 근처 시각 뒤에 원본 프레임이 없다 (1프레임 앞에서 다시)
+                self.initialize(max(0.0, t - self.src_frame))
+                return self.read_frame()
+
+        if pos == self.pos and self.lastread is not None:
+            return self.lastread
+        if pos < self.pos or pos > self.pos + 100:
+            self.initialize(t)
+            self.pos = pos
+        else:
+            self.skip_frames(pos - self.pos - 1)
+        result = self.read_frame()
+        self.pos = pos
+        return result
+
+    def close(self) -> None:
+        if self.proc:
+            self.proc.terminate()
+            self.proc.stdout.close()
+            self.proc.wait()
+            self.proc = None
+
+    def __del__(self):
+        self.close()
+
+
+class CoverVideoClip(VideoClip):
+    """캔버스 크기/출력 fps로 디코드되는 영상 클립 (VideoFileClip + fit_cover 대체)"""
+
+    def __init__(
+        self,
+        filename: str,
+        size: tuple[int, int],
+        fps: float,
+        infos: dict[str, Any] | None = None,
+    ):
+        self.reader = CoverVideoReader(filename, size, fps, infos)
+        VideoClip.__init__(self, duration=self.reader.duration)
+        self.make_frame = lambda t: self.reader.get_frame(t)
+        self.size = self.reader.size
+        self.fps = self.reader.fps
+        self.filename = filename
+
+    def close(self) -> None:
+        if self.reader:
+            self.reader.close()
+            self.reader = None
@@ -0,0 +1,83 @@
+"""자산 매니페스트 probe 테스트 (ffprobe 없는 환경의 ffmpeg -i 파싱)"""
+
+import json
+import subprocess
+
+import pytest
+
+from services import asset_manifest
+from services.asset_manifest import AssetManifest, probe_video
+
+FFMPEG_STDERR = """\
+Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'clip.mp4':
+  Metadata:
+    major_brand     : isom
+  Duration: 00:01:02.50, start: 0.000000, bitrate: 60 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(tv, bt709, progressive), \
+1920x1080 [SAR 1:1 DAR 16:9], 55 kb/s, 29.97 fps, 29.97 tbr, 30k tbn (default)
+      Metadata:
+        handler_name    : VideoHandler
+      Side data:
+        displaymatrix: rotation of -90.00 degrees
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 48000 Hz, stereo, fltp, 128 kb/s
+At least one output file must be specified
+"""
+
+
+@pytest.fixture
+def no_ffprobe(monkeypatch):
+    monkeypatch.setattr(asset_manifest, "ffprobe_binary", lambda: None)
+
+
+def _fake_run(stderr: str):
+    def run(cmd):
+        return subprocess.CompletedProcess(cmd, 1, "", stderr)
+
+    return run
+
+
+def test_ffmpeg_fallback_parses_stream_info(monkeypatch, no_ffprobe):
+    monkeypatch.setattr(asset_manifest, "_run_probe", _fake_run(FFMPEG_STDERR))
+    assert probe_video("clip.mp4") == {
+        "duration": 62.5,
+        # displaymatrix -90(반시계) → 시계 방향 90도, 화면 기준 세로
+        "width": 1080,
+        "height": 1920,
+        "fps": 29.97,
+        "codec": "h264",
+        "pix_fmt": "yuv420p",
+        "has_alpha": False,
+        "rotation": 90,
+    }
+
+
+def test_ffmpeg_fallback_alpha_and_missing_stream(monkeypatch, no_ffprobe):
+    alpha = "  Stream #0:0: Video: qtrle (rle  / 0x20656C72), argb(progressive), 64x48, 25 fps\n"
+    monkeypatch.setattr(asset_manifest, "_run_probe", _fake_run(alpha))
+    media = probe_video("alpha.mov")
+    assert media["has_alpha"] and (media["width"], media["height"]) == (64, 48)
+
+    bad = "clip.mp4: Invalid data found when processing input\n"
+    monkeypatch.setattr(asset_manifest, "_run_probe", _fake_run(bad))
+    assert probe_video("clip.mp4") == {"probe_error": bad.strip()}
+
+
+def test_missing_probe_binary_is_not_persisted(tmp_path, monkeypatch, no_ffprobe):
+    (tmp_path / "videos").mkdir()
+    video = tmp_path / "videos" / "clip.mp4"
+    video.write_bytes(b"\0" * 16)
+    monkeypatch.setattr(asset_manifest, "ffmpeg_binary", lambda: str(tmp_path / "no-ffmpeg"))
+
+    manifest = AssetManifest(tmp_path)
+    manifest.refresh()
+    saved = json.loads(manifest.path.read_text(encoding="utf-8"))
+    assert saved["entries"] == {} and manifest.entries == {}
+
+    media = manifest.entry(video)["media"]
+    assert media["probe_unavailable"] and "no-ffmpeg" in media["probe_error"]
+    assert "videos/clip.mp4" not in manifest.entries
+
+    # 바이너리가 생기면 다음 조회에서 다시 probe해서 저장
+    monkeypatch.setattr(asset_manifest, "_run_probe", _fake_run(FFMPEG_STDERR))
+    assert manifest.entry(video)["media"]["codec"] == "h264"
+    assert "videos/clip.mp4" in manifest.entries
@@ -0,0 +1,65 @@
+"""uint8 premultiplied-alpha 합성 테스트 (float 기준 구현과 비교)"""
+
+import numpy as np
+from PIL import Image
+
+from services.compositor import (
+    FrameCompositor,
+    PremultipliedLayer,
+    blend_premultiplied,
+    premultiply,
+)
+
+
+def _reference_over(base: np.ndarray, rgba: np.ndarray) -> np.ndarray:
+    """float64 over 합성 (straight alpha)"""
+    a = rgba[..., 3:4].astype(np.float64) / 255.0
+    out = rgba[..., :3].astype(np.float64) * a + base.astype(np.float64) * (1.0 - a)
+    return out
+
+
+def test_blend_premultiplied_matches_float_reference():
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (64, 48, 3), dtype=np.uint8)
+    rgba = rng.integers(0, 256, (64, 48, 4), dtype=np.uint8)
+    rgba[0, :, 3] = 0
+    rgba[1, :, 3] = 255
+
+    premul, inv_alpha = premultiply(rgba)
+    acc = np.empty(base.shape, np.uint16)
+    tmp = np.empty(base.shape, np.uint16)
+    out = blend_premultiplied(base.copy(), premul, inv_alpha, acc, tmp)
+
+    # premultiply 반올림 + 블렌딩 반올림 → 최대 1 차이
+    assert np.abs(out.astype(np.float64) - _reference_over(base, rgba)).max() <= 1.0
+    # 완전 투명/불투명 행은 정확히 base/전경
+    np.testing.assert_array_equal(out[0], base[0])
+    np.testing.assert_array_equal(out[1], rgba[1, :, :3])
+
+
+def test_blend_premultiplied_rounding_is_exact():
+    # round(base * inv / 255)를 정수 시프트로 계산하는 부분은 전 범위에서 정확해야 한다
+    base = np.repeat(np.arange(256, dtype=np.uint8), 256).reshape(256, 256, 1)
+    inv_alpha = np.tile(np.arange(256, dtype=np.uint8), 256).reshape(256, 256, 1)
+    premul = np.zeros_like(base)
+    acc = np.empty(base.shape, np.uint16)
+    tmp = np.empty(base.shape, np.uint16)
+    out = blend_premultiplied(base.copy(), premul, inv_alpha, acc, tmp)
+
+    prod = base.astype(np.int64) * inv_alpha
+    np.testing.assert_array_equal(out, (2 * prod + 255) // 510)
+
+
+def test_frame_compositor_clips_layers_to_canvas():
+    image = Image.new("RGBA", (20, 20), (255, 0, 0, 128))
+    layer = PremultipliedLayer.from_image(image, offset=(-10, 30))
+    compositor = FrameCompositor((40, 40), [layer, None])
+
+    out = compositor.composite(np.zeros((40, 40, 3), np.uint8))
+    assert compositor.layers[0].bbox == (0, 30, 10, 40)
+    assert out[35, 5, 0] in (127, 128) and out[35, 5, 1:].tolist() == [0, 0]
+    assert out[:30].max() == 0 and out[:, 10:].max() == 0
+
+
+def test_fully_transparent_image_has_no_layer():
+    assert PremultipliedLayer.from_image(Image.new("RGBA", (8, 8), (255, 255, 255, 0))) is None
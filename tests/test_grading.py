@@ -0,0 +1,174 @@
+"""3D LUT 베이크 / .cube 파싱 / 비네트 Q8 게인 테스트"""
+
+import numpy as np
+import pytest
+
+from services import grading
+from services.grading import (
+    BakedLUT,
+    FrameGrader,
+    apply_gain,
+    parse_cube,
+    sample_lut,
+    vignette_gain,
+)
+
+BITS = 5  # 32단계 테이블 (테스트 속도용)
+
+
+def _write_identity_cube(path, n: int, header: str = "") -> None:
+    lines = ['TITLE "identity"', f"LUT_3D_SIZE {n}"]
+    if header:
+        lines.append(header)
+    # .cube는 red가 가장 빠르게 변한다
+    for b in range(n):
+        for g in range(n):
+            for r in range(n):
+                lines.append(f"{r / (n - 1):.6f} {g / (n - 1):.6f} {b / (n - 1):.6f}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _random_frame(seed: int = 0, shape=(17, 23, 3)) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, shape, dtype=np.uint8)
+
+
+def _level_centers(frame: np.ndarray, bits: int) -> np.ndarray:
+    """인덱스 구간 가운데 값 (BakedLUT._levels와 같은 기준)"""
+    step = 256 >> bits
+    return (frame.astype(np.float64) // step) * step + (step - 1) / 2
+
+
+def test_parse_cube_identity_layout(tmp_path):
+    path = tmp_path / "id.cube"
+    _write_identity_cube(path, 3)
+    lut, domain = parse_cube(path)
+
+    assert lut.shape == (3, 3, 3, 3)
+    # [r, g, b] 인덱스 순서로 읽혀야 한다
+    assert lut[2, 0, 1].tolist() == pytest.approx([1.0, 0.0, 0.5])
+    np.testing.assert_array_equal(domain, [[0, 0, 0], [1, 1, 1]])
+
+
+def test_parse_cube_input_range(tmp_path):
+    path = tmp_path / "range.cube"
+    _write_identity_cube(path, 2, "LUT_3D_INPUT_RANGE 0.0 2.0")
+    _, domain = parse_cube(path)
+    np.testing.assert_array_equal(domain, [[0, 0, 0], [2, 2, 2]])
+
+
+def test_parse_cube_rejects_bad_size(tmp_path):
+    path = tmp_path / "bad.cube"
+    path.write_text("LUT_3D_SIZE 2\n0 0 0\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        parse_cube(path)
+
+
+def test_baked_identity_cube(tmp_path):
+    path = tmp_path / "id.cube"
+    _write_identity_cube(path, 5)
+    lut, domain = parse_cube(path)
+    baked = BakedLUT.from_lut(lut, "id", bits=BITS, domain=domain)
+
+    frame = _random_frame()
+    out = baked.apply(frame)
+    assert out.dtype == np.uint8 and out.shape == frame.shape
+    assert np.abs(out - _level_centers(frame, BITS)).max() <= 1.0
+
+
+def test_baked_cube_honours_input_range(tmp_path):
+    path = tmp_path / "range.cube"
+    _write_identity_cube(path, 2, "LUT_3D_INPUT_RANGE 0.0 2.0")
+    lut, domain = parse_cube(path)
+    baked = BakedLUT.from_lut(lut, "range", bits=BITS, domain=domain)
+
+    frame = _random_frame(1)
+    # 입력 범위 0~2의 항등 LUT → 0~1 입력은 절반 값이 된다
+    assert np.abs(baked.apply(frame) - _level_centers(frame, BITS) / 2).max() <= 1.0
+
+
+def test_baked_table_matches_trilinear_sampling():
+    lut = np.random.default_rng(2).random((4, 4, 4, 3)).astype(np.float32)
+    baked = BakedLUT.from_lut(lut, "random", bits=BITS)
+
+    levels = BakedLUT._levels(BITS) / 255.0
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    rgb01 = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    expected = np.clip(np.rint(sample_lut(lut, rgb01) * 255.0), 0, 255)
+    np.testing.assert_array_equal(baked.table, expected)
+
+
+def test_from_function_identity():
+    baked = BakedLUT.from_function(lambda rgb: rgb, "id", bits=BITS)
+    frame = _random_frame(3)
+    assert np.abs(baked.apply(frame) - _level_centers(frame, BITS)).max() <= 0.5
+
+
+def test_vignette_gain_shape_and_cache():
+    gain = vignette_gain((40, 30), 0.35)
+    assert gain.shape == (30, 40, 1) and gain.dtype == np.uint16
+    assert not gain.flags.writeable
+    assert vignette_gain((40, 30), 0.35) is gain
+    assert gain.max() <= 256 and gain[15, 20, 0] == 256
+    # 모서리는 1 - strength까지 어두워진다
+    assert gain[0, 0, 0] == pytest.approx(round(0.65 * 256), abs=1)
+
+
+def test_frame_grader_q8_matches_float_vignette():
+    w, h, strength = 40, 30, 0.35
+    baked = BakedLUT.from_function(lambda rgb: rgb, "id", bits=BITS)
+    frame = _random_frame(4, (h, w, 3))
+    out = FrameGrader(baked, vignette=strength)(frame)
+
+    y, x = np.ogrid[:h, :w]
+    dist = np.sqrt((x - w / 2.0) ** 2 + (y - h / 2.0) ** 2)
+    gain = 1.0 - strength * (dist / (dist.max() + 1e-6)) ** 1.5
+    reference = baked.apply(frame).astype(np.float64) * gain[..., None]
+    assert np.abs(out - reference).max() <= 1.0
+
+
+def test_frame_grader_without_vignette_is_lut_only():
+    baked = BakedLUT.from_function(lambda rgb: 255 - rgb, "invert", bits=BITS)
+    frame = _random_frame(5)
+    np.testing.assert_array_equal(FrameGrader(baked)(frame), baked.apply(frame))
+
+
+def test_apply_gain_unit_gain_is_identity():
+    frame = _random_frame(6)
+    gain = np.full(frame.shape[:2] + (1,), 256, np.uint16)
+    out = apply_gain(frame, gain, np.empty_like(frame), np.empty(frame.shape, np.uint16))
+    np.testing.assert_array_equal(out, frame)
+
+
+def test_baked_tables_are_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(grading, "LUT_CACHE_DIR", str(tmp_path))
+    first = grading._bake("cinematic", bits=BITS)
+    files = list(tmp_path.glob("*.npy"))
+    assert len(files) == 1
+
+    # 두 번째부터는 베이크하지 않고 메모리 맵으로 연다
+    monkeypatch.setattr(BakedLUT, "from_function", lambda *a, **k: pytest.fail("re-baked"))
+    second = grading._bake("cinematic", bits=BITS)
+    assert not second.table.flags.writeable
+    np.testing.assert_array_equal(second.table, first.table)
+
+
+def test_cube_cache_follows_file_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(grading, "LUT_CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "look.cube"
+    _write_identity_cube(path, 2)
+    identity = grading._bake(str(path), bits=BITS)
+
+    _write_identity_cube(path, 2, "LUT_3D_INPUT_RANGE 0.0 2.0")
+    halved = grading._bake(str(path), bits=BITS)
+    assert len(list((tmp_path / "cache").glob("*.npy"))) == 2
+    frame = _random_frame(7)
+    assert np.abs(halved.apply(frame) - identity.apply(frame) / 2).max() <= 1.0
+
+
+def test_corrupt_cache_file_is_rebaked(tmp_path, monkeypatch):
+    monkeypatch.setattr(grading, "LUT_CACHE_DIR", str(tmp_path))
+    baked = grading._bake("identity", bits=BITS)
+    (path,) = tmp_path.glob("*.npy")
+    path.write_bytes(b"broken")
+    np.testing.assert_array_equal(grading._bake("identity", bits=BITS).table, baked.table)
+    assert np.load(path).shape == baked.table.shape
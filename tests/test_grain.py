@@ -0,0 +1,55 @@
+"""필름 그레인 텍스처 뱅크 블렌딩 테스트"""
+
+import numpy as np
+
+from services.grain import FilmGrain, GrainBank, generate_tiles
+
+
+def test_zero_opacity_is_identity():
+    frame = np.random.default_rng(0).integers(0, 256, (37, 300, 3), dtype=np.uint8)
+    out = FilmGrain(opacity=0.0, fps=24).apply(frame, 0.5)
+    np.testing.assert_array_equal(out, frame)
+
+
+def test_blend_stays_within_bounds_at_extremes():
+    opacity = 0.08
+    grain = FilmGrain(opacity=opacity, fps=24)
+    alpha = grain.bank.alpha / 256
+    # 타일(256)보다 크고 나누어떨어지지 않는 크기로 블록 경계까지 확인
+    for value in (0, 255):
+        frame = np.full((300, 517, 3), value, dtype=np.uint8)
+        out = grain.apply(frame, 1.25).astype(np.float64)
+        # 노이즈 0~255 범위에서의 블렌딩 결과를 벗어나지 않음 (uint16 누산 오버플로 없음)
+        assert out.min() >= value * (1 - alpha) - 1
+        assert out.max() <= value * (1 - alpha) + 255 * alpha + 1
+        # 그레인은 128 중심이라 평균 밝기가 크게 변하지 않는다
+        assert abs(out.mean() - (value * (1 - alpha) + 128 * alpha)) < 1.0
+
+
+def test_full_opacity_shows_noise_tiles():
+    grain = FilmGrain(opacity=1.0, fps=24)
+    out = grain.apply(np.zeros((64, 64, 3), np.uint8), 0.0)
+    # 채널마다 같은 노이즈 값
+    np.testing.assert_array_equal(out[..., 0], out[..., 2])
+    tiles = generate_tiles(grain.bank.tile, grain.bank.count, 20240917, 8.0)
+    k, oy, ox = (int(v) for v in grain.bank.schedule[0])
+    tile = np.tile(tiles[k], (2, 2))
+    np.testing.assert_array_equal(out[..., 0], tile[oy : oy + 64, ox : ox + 64])
+
+
+def test_grain_is_deterministic_per_frame():
+    frame = np.full((80, 80, 3), 100, dtype=np.uint8)
+    a = FilmGrain(opacity=0.2, fps=24).apply(frame, 1.0).copy()
+    b = FilmGrain(opacity=0.2, fps=24).apply(frame, 1.0).copy()
+    c = FilmGrain(opacity=0.2, fps=24).apply(frame, 1.5).copy()
+    d = FilmGrain(opacity=0.2, fps=24, frame_offset=3).apply(frame, 1.0).copy()
+    np.testing.assert_array_equal(a, b)
+    assert not np.array_equal(a, c)
+    assert not np.array_equal(a, d)
+
+
+def test_bank_weights_include_rounding_constant():
+    bank = GrainBank(0.5, tile=8, count=2)
+    assert bank.alpha == 128
+    assert bank.weighted.shape == (2, 16, 16)
+    assert bank.weighted.min() >= 128 and bank.weighted.max() <= 255 * 128 + 128
@@ -0,0 +1,60 @@
+"""라이트 리크 크롭 영역/블렌딩 테스트"""
+
+import numpy as np
+import pytest
+
+from services.light_leak import LEAK_SPEED, LightLeak, leak_layer
+
+SIZE = (64, 96)
+COLOR = (255, 180, 80)
+
+
+@pytest.mark.parametrize("dur", [0.5, 2.0, 10.0])
+def test_crop_box_covers_every_visible_region(dur):
+    leak = LightLeak(dur, SIZE, COLOR)
+    W, H = SIZE
+    x0, y0, x1, y1 = leak.layer.bbox
+    for t in np.linspace(0.0, dur, 11):
+        px, py = leak.position(float(t))
+        # 화면에 보이는 리크 좌표 영역 (2W x 2H 리크 안으로 제한)
+        vx0, vy0 = max(0, -px), max(0, -py)
+        vx1, vy1 = min(2 * W, W - px), min(2 * H, H - py)
+        assert x0 <= vx0 and y0 <= vy0 and vx1 <= x1 and vy1 <= y1
+
+
+def test_crop_box_is_smaller_than_full_leak():
+    W, H = SIZE
+    x0, y0, x1, y1 = LightLeak(1.0, SIZE, COLOR).layer.bbox
+    assert (x1 - x0) * (y1 - y0) < 4 * W * H
+    dx, dy = int(1.0 * LEAK_SPEED[0]), int(1.0 * LEAK_SPEED[1])
+    assert (x0, y0, x1, y1) == (W - dx, H - dy, 2 * W, 2 * H)
+
+
+def test_static_leak_box():
+    W, H = SIZE
+    assert LightLeak(3.0, SIZE, COLOR, move=False).layer.bbox == (W, H, 2 * W, 2 * H)
+
+
+def test_cropped_layer_matches_full_layer():
+    W, H = SIZE
+    dur = 2.0
+    leak = LightLeak(dur, SIZE, COLOR, opacity=0.5)
+    full = leak_layer(COLOR, SIZE, 0.5, (0, 0, 2 * W, 2 * H))
+    frame = np.random.default_rng(0).integers(0, 256, (H, W, 3), dtype=np.uint8)
+    base = frame.astype(np.int64)
+    for t in (0.0, 1.0, dur):
+        out = leak.apply(frame, t).astype(np.int64)
+
+        px, py = leak.position(t)
+        premul = full.premul[-py : H - py, -px : W - px].astype(np.int64)
+        inv = full.inv_alpha[-py : H - py, -px : W - px].astype(np.int64)
+        expected = premul + (2 * base * inv + 255) // 510
+        # 보이는 영역만 업샘플해도 전체 리크를 업샘플해서 잘라 쓴 결과와 같다
+        np.testing.assert_array_equal(out, expected)
+
+
+def test_apply_leaves_input_untouched():
+    frame = np.full((SIZE[1], SIZE[0], 3), 10, dtype=np.uint8)
+    out = LightLeak(1.0, SIZE, COLOR, opacity=1.0).apply(frame, 0.5)
+    assert frame.max() == 10
+    assert out.max() > 10
@@ -0,0 +1,70 @@
+"""motion 스펙 정규화 테스트"""
+
+import pytest
+
+from services.motion import PAN_ANCHORS, PAN_DEFAULT_ZOOM, has_motion, normalize_motion, parse_pan
+
+CENTER = PAN_ANCHORS["center"]
+
+
+def test_empty_motion_is_static():
+    spec = normalize_motion({}, 2.0)
+    assert spec == {
+        "zoom_from": 1.0,
+        "zoom_to": 1.0,
+        "pan_from": CENTER,
+        "pan_to": CENTER,
+        "ease": "linear",
+    }
+    assert not has_motion({})
+    assert not has_motion(None)
+
+
+def test_zoom_without_pan_zooms_in_from_one():
+    spec = normalize_motion({"zoom": 1.1, "ease": "cubic_in_out"}, 2.0)
+    assert (spec["zoom_from"], spec["zoom_to"]) == (1.0, 1.1)
+    assert spec["ease"] == "cubic_in_out"
+    assert has_motion({"zoom": 1.1})
+
+
+def test_pan_holds_zoom_and_moves_window():
+    spec = normalize_motion({"zoom": 1.08, "pan": "left_to_right"}, 2.0)
+    assert (spec["zoom_from"], spec["zoom_to"]) == (1.08, 1.08)
+    assert (spec["pan_from"], spec["pan_to"]) == (PAN_ANCHORS["left"], PAN_ANCHORS["right"])
+
+
+def test_pan_without_zoom_uses_default_zoom():
+    spec = normalize_motion({"pan": "top"}, 2.0)
+    assert spec["zoom_from"] == spec["zoom_to"] == PAN_DEFAULT_ZOOM
+    assert (spec["pan_from"], spec["pan_to"]) == (CENTER, PAN_ANCHORS["top"])
+
+
+@pytest.mark.parametrize(
+    ("motion", "expected"),
+    [
+        ({"type": "zoom-in-slow"}, (1.0, 1.1)),
+        ({"type": "zoom-out-slow"}, (1.2, 1.1)),
+    ],
+)
+def test_legacy_zoom_types(motion, expected):
+    spec = normalize_motion(motion, 2.0)
+    assert (spec["zoom_from"], spec["zoom_to"]) == pytest.approx(expected)
+    assert spec["ease"] == "linear"
+
+
+def test_legacy_pan_type():
+    spec = normalize_motion({"type": "pan", "intensity": 0.5}, 2.0)
+    assert spec["zoom_to"] == pytest.approx(1.05)
+    assert (spec["pan_from"], spec["pan_to"]) == (PAN_ANCHORS["left"], PAN_ANCHORS["right"])
+
+
+def test_unknown_values_fall_back():
+    spec = normalize_motion({"zoom": 1.05, "ease": "bounce", "pan": "diagonal"}, 1.0)
+    assert spec["ease"] == "linear"
+    assert spec["pan_from"] == spec["pan_to"] == CENTER
+
+
+def test_parse_pan_forms():
+    assert parse_pan("right_to_left") == (PAN_ANCHORS["right"], PAN_ANCHORS["left"])
+    assert parse_pan("bottom") == (CENTER, PAN_ANCHORS["bottom"])
+    assert parse_pan(None) == (CENTER, CENTER)
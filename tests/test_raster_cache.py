@@ -0,0 +1,77 @@
+"""래스터 LRU 캐시 테스트"""
+
+import numpy as np
+import pytest
+
+from services.raster_cache import RasterCache, file_key, style_hash
+
+
+def _array(nbytes: int, value: int = 0) -> np.ndarray:
+    return np.full(nbytes, value, dtype=np.uint8)
+
+
+def test_hit_does_not_rebuild():
+    cache = RasterCache(10_000)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return _array(100)
+
+    first = cache.get_or_create("k", build)
+    second = cache.get_or_create("k", build)
+    assert first is second and len(calls) == 1
+    assert cache.stats() == {"entries": 1, "bytes": 100, "hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RasterCache(3000)
+    for key in ("a", "b", "c"):
+        cache.get_or_create(key, lambda: _array(1000))
+    cache.get_or_create("a", lambda: pytest.fail("a should be cached"))
+
+    cache.get_or_create("d", lambda: _array(1000))
+    assert cache.stats()["entries"] == 3 and cache.bytes == 3000
+
+    rebuilt = []
+    cache.get_or_create("b", lambda: rebuilt.append("b") or _array(1000))
+    assert rebuilt == ["b"]
+    # b를 다시 넣으면서 그다음으로 오래된 c가 밀려난다
+    cache.get_or_create("a", lambda: pytest.fail("a should be cached"))
+    cache.get_or_create("d", lambda: pytest.fail("d should be cached"))
+    cache.get_or_create("c", lambda: rebuilt.append("c") or _array(1000))
+    assert rebuilt == ["b", "c"]
+
+
+def test_oversized_value_is_returned_but_not_stored():
+    cache = RasterCache(500)
+    value = cache.get_or_create("big", lambda: _array(1000))
+    assert value.nbytes == 1000
+    assert cache.stats()["entries"] == 0 and cache.bytes == 0
+
+
+def test_cached_arrays_are_read_only():
+    cache = RasterCache(10_000)
+    bg, fg = cache.get_or_create("pair", lambda: (_array(10), _array(20)))
+    assert not bg.flags.writeable and not fg.flags.writeable
+    assert cache.bytes == 30
+    with pytest.raises(ValueError):
+        bg[0] = 1
+
+
+def test_clear_resets_entries():
+    cache = RasterCache(10_000)
+    cache.get_or_create("k", lambda: _array(10))
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.bytes == 0
+
+
+def test_keys_follow_content(tmp_path):
+    path = tmp_path / "img.png"
+    path.write_bytes(b"1")
+    before = file_key(path)
+    path.write_bytes(b"22")
+    assert file_key(path) != before
+
+    assert style_hash({"a": 1, "b": [1, 2]}) == style_hash({"b": [1, 2], "a": 1})
+    assert style_hash({"a": 1}) != style_hash({"a": 2})
@@ -0,0 +1,38 @@
+"""렌더 프로파일러 집계 테스트"""
+
+from moviepy.editor import ColorClip
+
+from services.render_profile import RenderProfiler, eta_seconds
+
+
+def test_timed_clip_counts_only_evaluated_frames():
+    profiler = RenderProfiler()
+    clip = ColorClip((8, 4), color=(10, 20, 30), duration=1.0)
+    timed = profiler.timed_clip(clip)
+    # 감쌀 때 t=0 프레임을 미리 평가하지 않는다
+    assert profiler.frame_count == 0
+    assert timed.size == clip.size and timed.duration == clip.duration
+
+    for i in range(5):
+        assert timed.get_frame(i / 5)[0, 0].tolist() == [10, 20, 30]
+    assert profiler.frame_count == 5
+    assert sum(profiler.frame_hist) == 5
+
+
+def test_merge_adds_worker_snapshot():
+    main, worker = RenderProfiler(), RenderProfiler()
+    main.record_frame(0.001)
+    worker.record_frame(0.03)
+    worker.record_encode(10, 2.0)
+    main.merge(worker.snapshot())
+
+    report = main.report()
+    assert report["frames"]["count"] == 2
+    assert report["frames"]["max_ms"] == 30.0
+    assert report["encode"] == {"frames": 10, "wall_s": 2.0, "fps": 5.0}
+
+
+def test_eta_seconds():
+    assert eta_seconds(10.0, 0.0) is None
+    assert eta_seconds(10.0, 0.5) == 10.0
+    assert eta_seconds(10.0, 1.0) == 0.0
@@ -0,0 +1,77 @@
+"""세그먼트 캐시 키/저장소 테스트"""
+
+import os
+
+from services.segment_cache import SegmentCache, segment_key
+
+SHOT = {"idx": 0, "t": [0, 2], "layers": [{"type": "video", "ref": "product"}]}
+SETTINGS = {"fps": 30, "codec": "libx264", "bitrate": "6M"}
+
+
+def test_segment_key_is_stable_and_order_independent(tmp_path):
+    asset = tmp_path / "a.mp4"
+    asset.write_bytes(b"x" * 10)
+    key = segment_key(SHOT, [str(asset)], SETTINGS, {"safe_mode": False, "fade_in": True})
+    reordered = dict(reversed(list(SETTINGS.items())))
+    assert key == segment_key(SHOT, [str(asset)], reordered, {"fade_in": True, "safe_mode": False})
+
+
+def test_segment_key_changes_with_inputs(tmp_path):
+    asset = tmp_path / "a.mp4"
+    asset.write_bytes(b"x" * 10)
+    base = segment_key(SHOT, [str(asset)], SETTINGS, {"fade_in": True})
+
+    assert base != segment_key({**SHOT, "t": [0, 3]}, [str(asset)], SETTINGS, {"fade_in": True})
+    assert base != segment_key(SHOT, [str(asset)], {**SETTINGS, "fps": 24}, {"fade_in": True})
+    assert base != segment_key(SHOT, [str(asset)], SETTINGS, {"fade_in": False})
+
+    # 자산 파일이 바뀌면 (mtime/크기) 키도 바뀐다
+    st = asset.stat()
+    os.utime(asset, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert base != segment_key(SHOT, [str(asset)], SETTINGS, {"fade_in": True})
+
+
+def test_segment_key_marks_missing_assets(tmp_path):
+    missing = str(tmp_path / "missing.mp4")
+    assert segment_key(SHOT, [missing], SETTINGS) != segment_key(SHOT, [None], SETTINGS)
+
+
+def test_segment_cache_hit_and_miss(tmp_path):
+    cache = SegmentCache(tmp_path / "cache")
+    key = segment_key(SHOT, [], SETTINGS)
+
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    temp = cache.temp_path_for(key)
+    temp.write_bytes(b"segment")
+    committed = cache.commit(key, temp, {"duration": 2.0})
+    assert committed["path"] == str(cache.path_for(key))
+    assert not temp.exists()
+
+    meta = cache.get(key)
+    assert meta == {"duration": 2.0, "path": str(cache.path_for(key))}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_segment_cache_ignores_empty_segment(tmp_path):
+    cache = SegmentCache(tmp_path)
+    key = "k"
+    temp = cache.temp_path_for(key)
+    temp.write_bytes(b"")
+    cache.commit(key, temp, {"duration": 1.0})
+    assert cache.get(key) is None
+
+
+def test_segment_cache_prune_keeps_recent_and_pinned(tmp_path):
+    cache = SegmentCache(tmp_path, max_entries=2)
+    for i, key in enumerate(["a", "b", "c", "d"]):
+        temp = cache.temp_path_for(key)
+        temp.write_bytes(b"s")
+        cache.commit(key, temp, {})
+        os.utime(cache.path_for(key), (i, i))
+
+    assert cache.prune(keep={"a"}) == 1
+    remaining = sorted(p.stem for p in tmp_path.glob("*.mp4"))
+    assert remaining == ["a", "c", "d"]
+    assert not (tmp_path / "b.json").exists()
@@ -0,0 +1,84 @@
+"""텍스트 레이아웃 엔진 테스트 (기존 글자 단위 _wrap_text와 비교)"""
+
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+
+from utils.text_layout import layout_text
+
+
+@pytest.fixture(scope="module")
+def font():
+    return ImageFont.load_default(size=32)
+
+
+def _text_width(text: str, font) -> int:
+    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    return int(draw.textlength(text, font=font))
+
+
+def _old_wrap_text(text: str, font, max_width: int) -> str:
+    """user-023 이전 renderer._wrap_text (글자를 붙일 때마다 줄 전체를 다시 측정)"""
+    lines, cur = [], ""
+    for ch in text:
+        if _text_width(cur + ch, font) <= max_width:
+            cur += ch
+        else:
+            if cur:
+                lines.append(cur)
+            cur = ch
+    if cur:
+        lines.append(cur)
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("width", [60, 150, 400])
+def test_hangul_wraps_like_old_wrap_text(font, width):
+    text = "오늘만특별할인신메뉴출시기념이벤트진행중입니다"
+    assert layout_text(text, font, width).text == _old_wrap_text(text, font, width)
+
+
+def test_latin_words_are_not_split(font):
+    text = "limited edition summer collection"
+    layout = layout_text(text, font, 260)
+    assert len(layout.lines) > 1
+    assert " ".join(layout.lines) == text
+    for line in layout.lines:
+        assert _text_width(line, font) <= 260
+    # 기존 방식은 단어 중간에서 끊는다
+    old = _old_wrap_text(text, font, 260).split("\n")
+    assert any(a[-1].isalpha() and b[0].isalpha() for a, b in zip(old, old[1:], strict=False))
+
+
+def test_overlong_word_breaks_by_character(font):
+    layout = layout_text("supercalifragilistic", font, 90)
+    assert "".join(layout.lines) == "supercalifragilistic"
+    for line in layout.lines:
+        assert _text_width(line, font) <= 90
+
+
+def test_closing_punctuation_stays_with_previous_line(font):
+    text = "가나다라마바사아자차카타파하!"
+    width = _text_width(text[:-1], font)
+    layout = layout_text(text, font, width)
+    assert all(not line.startswith("!") for line in layout.lines)
+    assert "".join(layout.lines) == text
+
+
+def test_explicit_newlines_are_kept(font):
+    layout = layout_text("첫 줄\n둘째 줄", font, 1000)
+    assert layout.lines == ["첫 줄", "둘째 줄"]
+
+
+def test_bbox_matches_pil_multiline(font):
+    layout = layout_text("Hello world\n안녕하세요 반갑습니다", font, 200, align="center")
+    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    expected = draw.multiline_textbbox(
+        (0, 0), layout.text, font=font, spacing=layout.spacing, align="center"
+    )
+    assert layout.bbox == tuple(int(v) for v in expected)
+    assert layout.widths == [int(font.getlength(line)) for line in layout.lines]
+
+
+def test_measure_only_without_max_width(font):
+    layout = layout_text("no wrapping here at all", font)
+    assert layout.lines == ["no wrapping here at all"]
@@ -0,0 +1,40 @@
+"""플랫 타임라인 배치/전환 테스트"""
+
+import numpy as np
+import pytest
+from moviepy.editor import ColorClip
+
+from services.timeline import TimelineClip
+
+
+def _clips(colors, duration=1.0):
+    return [ColorClip((8, 4), color=c, duration=duration) for c in colors]
+
+
+@pytest.mark.parametrize("kind", ["fade", "cut", "cross", "slide"])
+def test_shot_starts_do_not_depend_on_transition(kind):
+    timeline = TimelineClip(_clips([(255, 0, 0)] * 3), [kind, kind], [0.5, 0.5])
+    # 세그먼트 렌더/SRT/필름스트립과 같은 계획 시각
+    assert timeline.starts == [0.0, 1.0, 2.0]
+    assert timeline.duration == 3.0
+
+
+def test_cross_blends_inside_incoming_shot():
+    timeline = TimelineClip(_clips([(200, 0, 0), (0, 200, 0)]), ["cross"], [0.5])
+
+    assert timeline.active_indices(0.9) == [0]
+    assert timeline.active_indices(1.1) == [0, 1]
+    assert timeline.active_indices(1.6) == [1]
+
+    # 이전 샷 마지막 프레임 → 들어오는 샷으로 선형 크로스페이드
+    mid = timeline.get_frame(1.25)[0, 0]
+    np.testing.assert_allclose(mid, [100, 100, 0], atol=1)
+    np.testing.assert_array_equal(timeline.get_frame(0.99)[0, 0], [200, 0, 0])
+    np.testing.assert_array_equal(timeline.get_frame(1.5)[0, 0], [0, 200, 0])
+
+
+def test_overlap_is_limited_by_shot_length():
+    clips = _clips([(255, 255, 255)]) + _clips([(0, 0, 0)], duration=0.3)
+    timeline = TimelineClip(clips, ["slide"], [0.5])
+    assert timeline.duration == pytest.approx(1.3)
+    assert timeline.active_indices(1.29) == [0, 1]
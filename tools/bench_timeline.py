@@ -0,0 +1,75 @@
+# tools/bench_timeline.py
+"""
+타임라인 합성 벤치마크: 기존 create_transition_effect 중첩 방식 vs 플랫 TimelineClip
+샷 수가 늘어날 때 프레임당 get_frame 비용을 비교한다 (플랫 방식은 샷 수와 무관하게 일정해야 함)
+
+사용법: python tools/bench_timeline.py --shots 2 4 8 12 24 --frames 60
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from moviepy.editor import ColorClip  # noqa: E402
+
+from services.render_engine import create_transition_effect  # noqa: E402
+from services.timeline import compose_timeline  # noqa: E402
+
+
+def make_shots(n: int, size: tuple[int, int], dur: float) -> list:
+    rng = np.random.default_rng(0)
+    return [
+        ColorClip(size, color=tuple(int(c) for c in rng.integers(0, 255, 3)), duration=dur)
+        for _ in range(n)
+    ]
+
+
+def chained(clips: list):
+    final = clips[0]
+    for clip in clips[1:]:
+        final = create_transition_effect(final, clip, "fade")
+    return final
+
+
+def flat(clips: list):
+    return compose_timeline(clips, ["fade"] * (len(clips) - 1), [0.5] * (len(clips) - 1))
+
+
+def per_frame_ms(clip, frames: int) -> float:
+    # 타임라인 전체에 고르게 분포한 시점에서 프레임 평가
+    times = np.linspace(0, clip.duration - 1e-3, frames)
+    t0 = time.perf_counter()
+    for t in times:
+        clip.get_frame(float(t))
+    return (time.perf_counter() - t0) * 1000 / frames
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--shots", type=int, nargs="+", default=[2, 4, 8, 12, 24])
+    ap.add_argument("--frames", type=int, default=60, help="측정할 프레임 수")
+    ap.add_argument("--width", type=int, default=540)
+    ap.add_argument("--height", type=int, default=960)
+    ap.add_argument("--dur", type=float, default=1.5, help="샷 길이(초)")
+    args = ap.parse_args()
+
+    size = (args.width, args.height)
+    print(f"canvas={size[0]}x{size[1]} shot_dur={args.dur}s frames={args.frames}")
+    print(f"{'shots':>6} | {'chained ms/frame':>17} | {'flat ms/frame':>14}")
+    print("-" * 45)
+    for n in args.shots:
+        chained_ms = per_frame_ms(chained(make_shots(n, size, args.dur)), args.frames)
+        flat_ms = per_frame_ms(flat(make_shots(n, size, args.dur)), args.frames)
+        print(f"{n:>6} | {chained_ms:>17.2f} | {flat_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,9 @@ S5. 프리뷰/검수/출고 UI
 import os
 
 import streamlit as st
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+
+from utils.fonts import get_font
 
 
 def draw_safezones(image_path: str, safezone_height: int = 250) -> Image.Image:
@@ -29,13 +31,9 @@ def draw_safezones(image_path: str, safezone_height: int = 250) -> Image.Image:
             [(0, H - safezone_height), (W, H - safezone_height)], fill=(255, 255, 255, 150), width=2
         )
 
-        # 텍스트 라벨 추가
-        try:
-            # 폰트 크기 조정
-            font_size = min(W, H) // 30
-            font = ImageFont.truetype("arial.ttf", font_size)
-        except:
-            font = ImageFont.load_default()
+        # 텍스트 라벨 추가 (폰트 크기 조정, 공용 폰트 캐시 사용)
+        font_size = min(W, H) // 30
+        font = get_font("arial.ttf", font_size)
 
         # 상단 라벨
         draw.text((10, 10), "SAFE ZONE", fill=(255, 255, 255, 200), font=font)
@@ -182,7 +180,36 @@ def create_download_links(video_path: str, recipe_path: str, srt_path: str = Non
 
 
 def generate_qa_checklist(video_path: str, recipe_path: str) -> dict:
-    """QA 체크리스트 생성"""
+    """QA 체크리스트 생성 (렌더 중 스트리밍 QA로 측정한 <영상>.qa.json 값 사용)"""
+    from services.qa_stream import SAFE_ZONE_PX, load_qa_report
+
+    qa = load_qa_report(video_path)
+    unmeasured = "측정값 없음"
+
+    if qa:
+        checks = qa.get("checks", {})
+        video_quality = {
+            "해상도": qa.get("resolution", unmeasured),
+            "프레임레이트": f"{qa['fps']:g} FPS",
+            "비트레이트": f"{qa.get('bitrate_mbps', 0):.1f} Mbps",
+            "평균 밝기": f"{qa['luma_mean']:.0f} / 255 "
+            f"(최소 {qa['luma_min']:.0f}, 최대 {qa['luma_max']:.0f})",
+        }
+        content = {
+            "세이프존 준수": checks.get("safe_zone_clear", False),
+            f"세이프존(상/하 {SAFE_ZONE_PX}px) 텍스트 침범 프레임": qa["safe_zone_text_frames"],
+            "블랙 구간 없음": checks.get("no_black_gap", False),
+            "블랙 프레임": f"{qa['black_frames']}개 (최장 {qa['longest_black_s']:.2f}초)",
+            "긴 정지 구간 없음": checks.get("no_long_freeze", False),
+            "정지 프레임": f"{qa['frozen_frames']}개 (최장 {qa['longest_frozen_s']:.2f}초)",
+            "분석 프레임 수": qa["frames"],
+        }
+        technical = {"인코딩": str(qa.get("codec", unmeasured)).replace("libx264", "H.264")}
+    else:
+        video_quality = {"해상도": unmeasured, "프레임레이트": unmeasured, "비트레이트": unmeasured}
+        content = {"세이프존 준수": unmeasured, "블랙/정지 프레임": unmeasured}
+        technical = {"인코딩": unmeasured}
+
     checklist = {
         "기본 정보": {
             "파일 존재": os.path.exists(video_path),
@@ -190,19 +217,11 @@ def generate_qa_checklist(video_path: str, recipe_path: str) -> dict:
             if os.path.exists(video_path)
             else "N/A",
             "레시피 존재": os.path.exists(recipe_path),
+            "QA 측정": qa is not None,
         },
-        "비디오 품질": {
-            "해상도": "1080x1920 (9:16)",
-            "프레임레이트": "30 FPS",
-            "비트레이트": "6 Mbps",
-        },
-        "콘텐츠": {
-            "세이프존 준수": True,
-            "텍스트 가독성": True,
-            "색상 대비": True,
-            "모션 부드러움": True,
-        },
-        "기술적": {"인코딩": "H.264", "오디오": "AAC", "컨테이너": "MP4"},
+        "비디오 품질": video_quality,
+        "콘텐츠": content,
+        "기술적": {**technical, "컨테이너": "MP4"},
     }
 
     return checklist
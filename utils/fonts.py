@@ -0,0 +1,56 @@
+# utils/fonts.py
+"""
+프로세스 공용 폰트 레지스트리
+- 폰트 패밀리 → 파일 경로 해석은 1회만 (후보 경로 Path.exists 반복 방지)
+- 로드된 FreeTypeFont는 (경로, 크기) 키로 LRU 캐시 (ImageFont.truetype 반복 방지)
+"""
+from __future__ import annotations
+
+from functools import cache, lru_cache
+from pathlib import Path
+
+from PIL import ImageFont
+
+# Windows / macOS / Linux 후보 경로 (한글 가독용 맑은고딕/나눔/애플/Noto/Arial)
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "C:/Windows/Fonts/malgunsl.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/Library/Fonts/Arial.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+]
+
+FONT_CACHE_SIZE = 64
+
+
+@cache
+def find_font_path(family: str | None = None) -> str | None:
+    """폰트 패밀리에 맞는 파일 경로
+
+    family가 실제 파일 경로면 그대로, 아니면 한글 지원 후보 중 첫 번째
+    """
+    if family and Path(family).is_file():
+        return family
+    for p in FONT_CANDIDATES:
+        if Path(p).exists():
+            return p
+    return None
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(path: str | None, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """(경로, 크기)별 폰트 로드. 경로가 없거나 로드 실패 시 PIL 기본 폰트"""
+    if not path:
+        return ImageFont.load_default()
+    try:
+        return ImageFont.truetype(path, int(size))
+    except Exception:
+        return ImageFont.load_default()
+
+
+def clear_font_cache() -> None:
+    """폰트 설치/교체 후 레지스트리 초기화"""
+    find_font_path.cache_clear()
+    get_font.cache_clear()
@@ -0,0 +1,158 @@
+# utils/text_layout.py
+"""
+텍스트 레이아웃 엔진
+- 폰트별 글리프 advance 캐시 (글자를 붙일 때마다 Image/ImageDraw를 만들어 줄 전체를 다시 재지 않음)
+- 줄바꿈: 한글/CJK는 음절 단위, 라틴 문자는 단어 단위 (한 줄보다 긴 단어만 글자 단위),
+  닫는 문장부호는 앞 글자에 붙임
+- 결과: 줄 목록 + 줄별 폭 + PIL multiline_textbbox와 같은 기준의 박스를 한 번에 반환
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from PIL import ImageFont
+
+from utils.fonts import FONT_CACHE_SIZE
+
+# 레이아웃 결과가 바뀌면 올려서 렌더 캐시 무효화
+TEXT_LAYOUT_VERSION = 1
+
+# PIL multiline 텍스트 기본 줄 간격
+DEFAULT_SPACING = 4
+
+# 음절/글자 단위로 끊을 수 있는 문자 (한글 자모/음절, CJK 한자, 가나, 전각 기호)
+_SYLLABLE = (
+    "\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf"
+    "\u4e00-\u9fff\uac00-\ud7a3\uff00-\uffef"
+)
+_TOKEN_RE = re.compile(rf"\s+|[{_SYLLABLE}]|[^\s{_SYLLABLE}]+")
+# 줄 맨 앞에 오면 안 되는 닫는 문장부호 (앞 토큰에 붙임)
+_CLOSING = set(".,!?;:%)]}…~·」』〉》）。、，！？")
+
+Font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+
+class GlyphAdvances:
+    """폰트 1개의 글자별 advance 캐시 (커닝 제외, 줄 나누기 판단용)"""
+
+    def __init__(self, font: Font):
+        self.font = font
+        self._advance: dict[str, float] = {}
+
+    def advance(self, ch: str) -> float:
+        adv = self._advance.get(ch)
+        if adv is None:
+            adv = self._advance[ch] = float(self.font.getlength(ch))
+        return adv
+
+    def width(self, text: str) -> float:
+        return sum(self.advance(ch) for ch in text)
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def glyph_advances(font: Font) -> GlyphAdvances:
+    """폰트별 advance 캐시 (get_font가 같은 폰트 객체를 재사용하므로 폰트 객체가 키)"""
+    return GlyphAdvances(font)
+
+
+@dataclass
+class TextLayout:
+    lines: list[str]
+    widths: list[int]  # 줄별 폭 (textlength)
+    bbox: tuple[int, int, int, int]  # (0, 0) 기준 multiline_textbbox
+    spacing: int
+    align: str
+
+    @property
+    def text(self) -> str:
+        """multiline_text에 그대로 넘길 수 있는 줄바꿈된 문자열"""
+        return "\n".join(self.lines)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.bbox[2] - self.bbox[0], self.bbox[3] - self.bbox[1]
+
+
+def _tokens(paragraph: str) -> list[str]:
+    """공백 / 음절 1자 / 라틴 단어 토큰 (닫는 문장부호는 앞 토큰에 붙임)"""
+    tokens: list[str] = []
+    for tok in _TOKEN_RE.findall(paragraph):
+        if tokens and not tokens[-1].isspace() and tok[0] in _CLOSING:
+            head = len(tok) - len(tok.lstrip("".join(_CLOSING)))
+            tokens[-1] += tok[:head]
+            tok = tok[head:]
+            if not tok:
+                continue
+        tokens.append(tok)
+    return tokens
+
+
+def _wrap_paragraph(paragraph: str, adv: GlyphAdvances, max_width: float) -> list[str]:
+    lines: list[str] = []
+    cur, cur_w, space = "", 0.0, ""
+    for tok in _tokens(paragraph):
+        if tok.isspace():
+            space = tok if cur else ""
+            continue
+        tok_w = adv.width(tok)
+        space_w = adv.width(space)
+        if cur and cur_w + space_w + tok_w <= max_width:
+            cur, cur_w, space = cur + space + tok, cur_w + space_w + tok_w, ""
+            continue
+        if cur:
+            lines.append(cur)
+        cur, cur_w, space = "", 0.0, ""
+        if tok_w <= max_width:
+            cur, cur_w = tok, tok_w
+            continue
+        # 한 줄보다 긴 단어는 글자 단위로 (닫는 문장부호는 넘치더라도 앞 줄에)
+        for ch in tok:
+            ch_w = adv.advance(ch)
+            if cur and cur_w + ch_w > max_width and ch not in _CLOSING:
+                lines.append(cur)
+                cur, cur_w = "", 0.0
+            cur, cur_w = cur + ch, cur_w + ch_w
+    lines.append(cur)
+    return lines
+
+
+def layout_text(
+    text: str,
+    font: Font,
+    max_width: float | None = None,
+    spacing: int = DEFAULT_SPACING,
+    align: str = "left",
+    stroke_width: int = 0,
+) -> TextLayout:
+    """text를 max_width 안에서 줄바꿈하고 줄별 폭과 박스를 계산 (명시적 \\n은 그대로 줄바꿈)
+
+    max_width가 None이면 줄바꿈 없이 측정만 한다. stroke_width는 multiline_text 외곽선과 같은 값
+    """
+    if max_width is None:
+        lines = text.split("\n")
+    else:
+        adv = glyph_advances(font)
+        lines = [ln for p in text.split("\n") for ln in _wrap_paragraph(p, adv, max_width)]
+
+    widths = [int(font.getlength(ln)) for ln in lines]
+    max_w = max(widths, default=0)
+    stroke = {"stroke_width": stroke_width} if stroke_width else {}
+    line_spacing = font.getbbox("A", **stroke)[3] + stroke_width + spacing
+    left = top = right = bottom = None
+    for i, (ln, w) in enumerate(zip(lines, widths, strict=True)):
+        if align == "center":
+            dx = (max_w - w) / 2
+        elif align == "right":
+            dx = max_w - w
+        else:
+            dx = 0
+        x0, y0, x1, y1 = font.getbbox(ln, **stroke)
+        dy = i * line_spacing
+        left = x0 + dx if left is None else min(left, x0 + dx)
+        top = y0 + dy if top is None else min(top, y0 + dy)
+        right = x1 + dx if right is None else max(right, x1 + dx)
+        bottom = y1 + dy if bottom is None else max(bottom, y1 + dy)
+    bbox = (int(left or 0), int(top or 0), int(right or 0), int(bottom or 0))
+    return TextLayout(lines, widths, bbox, spacing, align)